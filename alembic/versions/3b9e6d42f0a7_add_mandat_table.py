@@ -0,0 +1,67 @@
+"""add mandat table
+
+Revision ID: 3b9e6d42f0a7
+Revises: e84a2f1c9b30
+Create Date: 2026-10-18 20:03:52.718340
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9e6d42f0a7'
+down_revision: Union[str, None] = 'e84a2f1c9b30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('mandat',
+    sa.Column('uid', sa.String(), nullable=False),
+    sa.Column('acteur_uid', sa.String(), nullable=False),
+    sa.Column('type_organe', sa.String(), nullable=True),
+    sa.Column('legislature', sa.String(), nullable=True),
+    sa.Column('organe_ref', sa.String(), nullable=True),
+    sa.Column('date_debut', sa.Date(), nullable=True),
+    sa.Column('date_fin', sa.Date(), nullable=True),
+    sa.Column('acteur_updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('uid')
+    )
+
+    # Extraction des mandats des acteurs déjà en base, comme à chaque mise à jour des acteurs :
+    # sans elle, les mandats n'apparaîtraient qu'au prochain changement de l'archive
+    op.execute(r"""
+        INSERT INTO mandat (uid, acteur_uid, type_organe, legislature, organe_ref, date_debut, date_fin, acteur_updated_at)
+        SELECT DISTINCT ON (m ->> 'uid')
+            m ->> 'uid',
+            acteur.uid,
+            CASE WHEN jsonb_typeof(m -> 'typeOrgane') = 'string' THEN m ->> 'typeOrgane' END,
+            CASE WHEN jsonb_typeof(m -> 'legislature') = 'string' THEN m ->> 'legislature' END,
+            CASE WHEN jsonb_typeof(m -> 'organes' -> 'organeRef') = 'string' THEN m -> 'organes' ->> 'organeRef' END,
+            CASE WHEN m ->> 'dateDebut' ~ '^\d{4}-\d{2}-\d{2}' THEN left(m ->> 'dateDebut', 10)::date END,
+            CASE WHEN m ->> 'dateFin' ~ '^\d{4}-\d{2}-\d{2}' THEN left(m ->> 'dateFin', 10)::date END,
+            acteur.updated_at
+        FROM acteur
+        CROSS JOIN LATERAL jsonb_array_elements(
+            CASE jsonb_typeof(acteur.payload -> 'mandats' -> 'mandat')
+                WHEN 'array' THEN acteur.payload -> 'mandats' -> 'mandat'
+                WHEN 'object' THEN jsonb_build_array(acteur.payload -> 'mandats' -> 'mandat')
+                ELSE '[]'::jsonb
+            END
+        ) AS m
+        WHERE jsonb_typeof(m -> 'uid') = 'string'
+        ORDER BY m ->> 'uid', acteur.updated_at DESC
+    """)
+
+    op.create_index('ix_mandat_acteur_type_organe_legislature', 'mandat', ['acteur_uid', 'type_organe', 'legislature'], unique=False)
+    op.create_index('ix_mandat_organe_type_organe', 'mandat', ['organe_ref', 'type_organe'], unique=False)
+    op.execute("ANALYZE mandat")
+
+
+def downgrade() -> None:
+    op.drop_index('ix_mandat_organe_type_organe', table_name='mandat')
+    op.drop_index('ix_mandat_acteur_type_organe_legislature', table_name='mandat')
+    op.drop_table('mandat')
@@ -0,0 +1,45 @@
+"""drop generic payload GIN indexes
+
+Revision ID: 5d2b8e9c1f46
+Revises: 8f1c5a7e3d64
+Create Date: 2026-10-18 21:26:40.118503
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2b8e9c1f46'
+down_revision: Union[str, None] = '8f1c5a7e3d64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Index GIN (jsonb_ops) sur la totalité du payload : aucune recherche ne filtre plus sur le payload,
+# les chemins interrogés ont leurs propres colonnes et tables indexées (date_effective, mandat, document_auteur)
+INDEX_PAYLOAD_GIN = {
+    'acteur': 'ix_acteur_payload_gin',
+    'organe': 'ix_organe_payload_gin',
+    'document': 'ix_document_payload_gin',
+}
+
+
+def upgrade() -> None:
+    for table, index in INDEX_PAYLOAD_GIN.items():
+        op.drop_index(index, table_name=table, postgresql_using='gin')
+
+    # Références d'organes de l'acteur, remplacées par mandat.organe_ref : la colonne générée parcourait
+    # tout le payload ('$.**') à chaque écriture
+    op.drop_index('ix_acteur_organe_refs_gin', table_name='acteur', postgresql_using='gin')
+    op.drop_column('acteur', 'organe_refs_jsonb')
+
+
+def downgrade() -> None:
+    op.add_column('acteur', sa.Column('organe_refs_jsonb', postgresql.JSONB(astext_type=sa.Text()), sa.Computed("jsonb_path_query_array(payload, '$.**.organeRef')", persisted=True), nullable=False))
+    op.create_index('ix_acteur_organe_refs_gin', 'acteur', ['organe_refs_jsonb'], unique=False, postgresql_using='gin')
+
+    for table, index in INDEX_PAYLOAD_GIN.items():
+        op.create_index(index, table, ['payload'], unique=False, postgresql_using='gin')
@@ -0,0 +1,52 @@
+"""ingest_job lock_key
+
+Revision ID: 6e0b3c9d2f71
+Revises: c2e8f4a61d93
+Create Date: 2026-10-19 09:12:27.504118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e0b3c9d2f71'
+down_revision: Union[str, None] = 'c2e8f4a61d93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Clé des tables écrites par une tâche, comme calculée par 'clé_des_tables' : les jeux de données acteur,
+# organe et amo écrivent les mêmes tables, non partitionnées, et partagent leur clé quelle que soit la législature
+CLÉ_DES_TABLES = """
+    CASE WHEN dataset IN ('acteur', 'organe', 'amo') THEN 'amo' ELSE dataset || ':' || legislature END
+"""
+
+
+def upgrade() -> None:
+    op.add_column('ingest_job', sa.Column('lock_key', sa.String(), nullable=True))
+    op.execute(f"UPDATE ingest_job SET lock_key = {CLÉ_DES_TABLES}")
+    op.alter_column('ingest_job', 'lock_key', nullable=False)
+
+    # Deux tâches actives de jeux de données différents peuvent désormais avoir la même clé : seule la plus ancienne est conservée
+    op.execute("""
+        UPDATE ingest_job
+        SET state = 'failed', error = 'Tâche abandonnée (tâche concurrente sur les mêmes tables)', finished_at = now(), updated_at = now()
+        WHERE state IN ('pending', 'running')
+          AND EXISTS (
+            SELECT 1 FROM ingest_job AS plus_ancienne
+            WHERE plus_ancienne.lock_key = ingest_job.lock_key
+              AND plus_ancienne.state IN ('pending', 'running')
+              AND (plus_ancienne.created_at, plus_ancienne.id) < (ingest_job.created_at, ingest_job.id)
+          )
+    """)
+
+    op.drop_index('ux_ingest_job_dataset_active', table_name='ingest_job', postgresql_where=sa.text("state IN ('pending', 'running')"))
+    op.create_index('ux_ingest_job_lock_key_active', 'ingest_job', ['lock_key'], unique=True, postgresql_where=sa.text("state IN ('pending', 'running')"))
+
+
+def downgrade() -> None:
+    op.drop_index('ux_ingest_job_lock_key_active', table_name='ingest_job', postgresql_where=sa.text("state IN ('pending', 'running')"))
+    op.create_index('ux_ingest_job_dataset_active', 'ingest_job', ['dataset', 'legislature'], unique=True, postgresql_where=sa.text("state IN ('pending', 'running')"))
+    op.drop_column('ingest_job', 'lock_key')
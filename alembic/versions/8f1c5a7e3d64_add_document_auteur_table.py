@@ -0,0 +1,61 @@
+"""add document_auteur table
+
+Revision ID: 8f1c5a7e3d64
+Revises: 3b9e6d42f0a7
+Create Date: 2026-10-18 20:48:15.390227
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f1c5a7e3d64'
+down_revision: Union[str, None] = '3b9e6d42f0a7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('document_auteur',
+    sa.Column('document_uid', sa.String(), nullable=False),
+    sa.Column('legislature', sa.Integer(), nullable=False),
+    sa.Column('acteur_ref', sa.String(), nullable=False),
+    sa.Column('qualite', sa.String(), nullable=True),
+    sa.Column('date_effective', sa.Date(), nullable=True),
+    sa.Column('document_updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('document_uid', 'legislature', 'acteur_ref')
+    )
+
+    # Extraction des auteurs des documents déjà en base, comme à chaque mise à jour des documents :
+    # sans elle, les auteurs n'apparaîtraient qu'au prochain changement de l'archive
+    op.execute("""
+        INSERT INTO document_auteur (document_uid, legislature, acteur_ref, qualite, date_effective, document_updated_at)
+        SELECT DISTINCT ON (document.uid, document.legislature, a -> 'acteur' ->> 'acteurRef')
+            document.uid,
+            document.legislature,
+            a -> 'acteur' ->> 'acteurRef',
+            CASE WHEN jsonb_typeof(a -> 'acteur' -> 'qualite') = 'string' THEN a -> 'acteur' ->> 'qualite' END,
+            document.date_effective,
+            document.updated_at
+        FROM document
+        CROSS JOIN LATERAL jsonb_array_elements(
+            CASE jsonb_typeof(document.payload -> 'auteurs' -> 'auteur')
+                WHEN 'array' THEN document.payload -> 'auteurs' -> 'auteur'
+                WHEN 'object' THEN jsonb_build_array(document.payload -> 'auteurs' -> 'auteur')
+                ELSE '[]'::jsonb
+            END
+        ) AS a
+        WHERE jsonb_typeof(a -> 'acteur' -> 'acteurRef') = 'string'
+        ORDER BY document.uid, document.legislature, a -> 'acteur' ->> 'acteurRef'
+    """)
+
+    op.create_index('ix_document_auteur_acteur_date', 'document_auteur', ['acteur_ref', 'date_effective', 'document_uid', 'legislature'], unique=False)
+    op.execute("ANALYZE document_auteur")
+
+
+def downgrade() -> None:
+    op.drop_index('ix_document_auteur_acteur_date', table_name='document_auteur')
+    op.drop_table('document_auteur')
@@ -0,0 +1,34 @@
+"""add flux_documents_semaine table
+
+Revision ID: a7c3e1f95b28
+Revises: 5d2b8e9c1f46
+Create Date: 2026-10-18 22:05:41.662014
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e1f95b28'
+down_revision: Union[str, None] = '5d2b8e9c1f46'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Pas de calcul initial : le flux d'une législature est calculé à sa première lecture
+    op.create_table('flux_documents_semaine',
+    sa.Column('legislature', sa.Integer(), nullable=False),
+    sa.Column('jour', sa.Date(), nullable=False),
+    sa.Column('documents', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('legislature')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('flux_documents_semaine')
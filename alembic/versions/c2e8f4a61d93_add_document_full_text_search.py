@@ -0,0 +1,39 @@
+"""add document full text search
+
+Revision ID: c2e8f4a61d93
+Revises: a7c3e1f95b28
+Create Date: 2026-10-18 22:41:09.281547
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2e8f4a61d93'
+down_revision: Union[str, None] = 'a7c3e1f95b28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Titre (A), titre court (B) et formule de la notice (C), en configuration française.
+# Seules les chaînes sont indexées : les valeurs nulles de l'archive sont des objets ({"@xsi:nil": "true"})
+RECHERCHE_DOCUMENT = (
+    "setweight(to_tsvector('french', CASE WHEN jsonb_typeof(payload #> '{titres,titrePrincipal}') = 'string' THEN payload #>> '{titres,titrePrincipal}' ELSE '' END), 'A')"
+    " || setweight(to_tsvector('french', CASE WHEN jsonb_typeof(payload #> '{titres,titrePrincipalCourt}') = 'string' THEN payload #>> '{titres,titrePrincipalCourt}' ELSE '' END), 'B')"
+    " || setweight(to_tsvector('french', CASE WHEN jsonb_typeof(payload #> '{notice,formule}') = 'string' THEN payload #>> '{notice,formule}' ELSE '' END), 'C')"
+)
+
+
+def upgrade() -> None:
+    # Colonne générée : réécrit toutes les partitions de document, puis calculée par PostgreSQL à chaque écriture
+    op.add_column('document', sa.Column('recherche', postgresql.TSVECTOR(), sa.Computed(RECHERCHE_DOCUMENT, persisted=True), nullable=False))
+    op.create_index('ix_document_recherche', 'document', ['recherche'], unique=False, postgresql_using='gin')
+    op.execute("ANALYZE document")
+
+
+def downgrade() -> None:
+    op.drop_index('ix_document_recherche', table_name='document', postgresql_using='gin')
+    op.drop_column('document', 'recherche')
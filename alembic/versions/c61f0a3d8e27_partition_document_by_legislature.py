@@ -0,0 +1,95 @@
+"""partition document by legislature
+
+Revision ID: c61f0a3d8e27
+Revises: 9d4e1b7c2a58
+Create Date: 2026-10-18 18:05:41.552317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c61f0a3d8e27'
+down_revision: Union[str, None] = '9d4e1b7c2a58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Les données déjà en base proviennent toutes des archives de la 17e législature
+LEGISLATURE_EXISTANTE = 17
+# Partitions créées d'emblée : les suivantes sont créées par les chargeurs à la première mise à jour
+LEGISLATURES_INITIALES = (15, 16, 17)
+
+
+def upgrade() -> None:
+    # --- ingest_state / ingest_job : un état et une tâche active par jeu de données et législature
+    op.add_column('ingest_state', sa.Column('legislature', sa.Integer(), server_default=sa.text(str(LEGISLATURE_EXISTANTE)), nullable=False))
+    op.alter_column('ingest_state', 'legislature', server_default=None)
+    op.drop_constraint('ingest_state_pkey', 'ingest_state', type_='primary')
+    op.create_primary_key('ingest_state_pkey', 'ingest_state', ['dataset', 'legislature'])
+
+    op.add_column('ingest_job', sa.Column('legislature', sa.Integer(), server_default=sa.text(str(LEGISLATURE_EXISTANTE)), nullable=False))
+    op.alter_column('ingest_job', 'legislature', server_default=None)
+    op.drop_index('ux_ingest_job_dataset_active', table_name='ingest_job', postgresql_where=sa.text("state IN ('pending', 'running')"))
+    op.create_index('ux_ingest_job_dataset_active', 'ingest_job', ['dataset', 'legislature'], unique=True, postgresql_where=sa.text("state IN ('pending', 'running')"))
+
+    # --- document : une table ne peut pas être partitionnée en place, elle est recréée puis remplie
+    op.execute("ALTER TABLE document RENAME TO document_avant_partition")
+    op.execute("ALTER TABLE document_avant_partition RENAME CONSTRAINT document_pkey TO document_avant_partition_pkey")
+    op.execute("ALTER INDEX ix_document_payload_gin RENAME TO ix_document_avant_partition_payload_gin")
+
+    op.create_table('document',
+    sa.Column('uid', sa.String(), nullable=False),
+    sa.Column('legislature', sa.Integer(), nullable=False),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('payload_hash', sa.String(length=64), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('uid', 'legislature'),
+    postgresql_partition_by='LIST (legislature)',
+    )
+    for legislature in LEGISLATURES_INITIALES:
+        op.execute(f"CREATE TABLE document_l{legislature} PARTITION OF document FOR VALUES IN ({legislature})")
+    op.create_index('ix_document_payload_gin', 'document', ['payload'], unique=False, postgresql_using='gin')
+
+    op.execute(f"""
+        INSERT INTO document (uid, legislature, payload, payload_hash, updated_at)
+        SELECT uid, {LEGISLATURE_EXISTANTE}, payload, payload_hash, updated_at
+        FROM document_avant_partition
+    """)
+    op.drop_table('document_avant_partition')
+    op.execute("ANALYZE document")
+
+
+def downgrade() -> None:
+    # Un document présent dans plusieurs législatures n'est conservé qu'une fois : la plus récente l'emporte
+    op.execute("ALTER TABLE document RENAME TO document_partitionnee")
+    op.execute("ALTER TABLE document_partitionnee RENAME CONSTRAINT document_pkey TO document_partitionnee_pkey")
+    op.execute("ALTER INDEX ix_document_payload_gin RENAME TO ix_document_partitionnee_payload_gin")
+    op.create_table('document',
+    sa.Column('uid', sa.String(), nullable=False),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('payload_hash', sa.String(length=64), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('uid'),
+    )
+    op.execute("""
+        INSERT INTO document (uid, payload, payload_hash, updated_at)
+        SELECT DISTINCT ON (uid) uid, payload, payload_hash, updated_at
+        FROM document_partitionnee
+        ORDER BY uid, legislature DESC
+    """)
+    op.execute("DROP TABLE document_partitionnee")
+    op.create_index('ix_document_payload_gin', 'document', ['payload'], unique=False, postgresql_using='gin')
+
+    op.drop_index('ux_ingest_job_dataset_active', table_name='ingest_job', postgresql_where=sa.text("state IN ('pending', 'running')"))
+    op.execute(f"DELETE FROM ingest_job WHERE legislature <> {LEGISLATURE_EXISTANTE}")
+    op.create_index('ux_ingest_job_dataset_active', 'ingest_job', ['dataset'], unique=True, postgresql_where=sa.text("state IN ('pending', 'running')"))
+    op.drop_column('ingest_job', 'legislature')
+
+    op.drop_constraint('ingest_state_pkey', 'ingest_state', type_='primary')
+    op.execute(f"DELETE FROM ingest_state WHERE legislature <> {LEGISLATURE_EXISTANTE}")
+    op.create_primary_key('ingest_state_pkey', 'ingest_state', ['dataset'])
+    op.drop_column('ingest_state', 'legislature')
@@ -0,0 +1,73 @@
+"""document chrono date columns
+
+Revision ID: e84a2f1c9b30
+Revises: c61f0a3d8e27
+Create Date: 2026-10-18 19:12:08.204611
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e84a2f1c9b30'
+down_revision: Union[str, None] = 'c61f0a3d8e27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Champ de 'cycleDeVie.chrono' -> colonne, par ordre de priorité pour la date effective
+COLONNES_PAR_DATE_CHRONO = {
+    "dateCreation": "date_creation",
+    "dateDepot": "date_depot",
+    "datePublication": "date_publication",
+    "datePublicationWeb": "date_publication_web",
+}
+
+
+def upgrade() -> None:
+    # Colonnes renseignées à l'enregistrement : une colonne générée ne peut pas convertir du texte en timestamptz
+    # (conversion dépendante du fuseau de la session, donc non immuable)
+    for colonne in COLONNES_PAR_DATE_CHRONO.values():
+        op.add_column('document', sa.Column(colonne, sa.DateTime(timezone=True), nullable=True))
+    op.add_column('document', sa.Column('date_effective', sa.Date(), nullable=True))
+
+    # Reprise des documents existants, avec les règles des chargeurs : une date sans fuseau est une date de Paris,
+    # une date illisible (format ou valeur, ex : '2024-13-45') est ignorée au lieu d'interrompre la migration
+    op.execute(r"""
+        CREATE FUNCTION pg_temp.lire_date_chrono(valeur text) RETURNS timestamptz
+        LANGUAGE plpgsql STABLE AS $$
+        BEGIN
+            IF valeur !~ '^\d{4}-\d{2}-\d{2}' THEN
+                RETURN NULL;
+            END IF;
+            RETURN valeur::timestamptz;
+        EXCEPTION WHEN data_exception THEN
+            RETURN NULL;
+        END
+        $$
+    """)
+    expressions = {
+        colonne: f"pg_temp.lire_date_chrono(payload -> 'cycleDeVie' -> 'chrono' ->> '{champ}')"
+        for champ, colonne in COLONNES_PAR_DATE_CHRONO.items()
+    }
+    affectations = ",\n            ".join(f"{colonne} = {expression}" for colonne, expression in expressions.items())
+    op.execute("SET LOCAL timezone = 'Europe/Paris'")
+    op.execute(f"""
+        UPDATE document SET
+            {affectations},
+            date_effective = (coalesce({", ".join(expressions.values())}) AT TIME ZONE 'Europe/Paris')::date
+    """)
+    op.execute("RESET timezone")
+    op.execute("DROP FUNCTION pg_temp.lire_date_chrono(text)")
+
+    op.create_index('ix_document_date_effective', 'document', ['date_effective'], unique=False)
+    op.execute("ANALYZE document")
+
+
+def downgrade() -> None:
+    op.drop_index('ix_document_date_effective', table_name='document')
+    op.drop_column('document', 'date_effective')
+    for colonne in reversed(COLONNES_PAR_DATE_CHRONO.values()):
+        op.drop_column('document', colonne)
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import random
+import zipfile
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DOSSIER_EXEMPLES = Path(__file__).resolve().parent.parent / "docs-exemple"
+
+MODÈLE_ACTEUR = "PA722190.json"
+MODÈLE_ORGANE = "PO833673.json"
+MODÈLE_DOCUMENT = "ACINANR5L16B2159.json"
+
+# Types d'organes tirés au hasard : les groupes politiques ('GP') sont ceux que l'API affiche pour un acteur
+_TYPES_ORGANE = ("GP", "COMPER", "ASSEMBLEE", "DELEG", "CMP", "GOUVERNEMENT")
+_THÈMES = (
+    "la protection de l'environnement", "l'accès aux soins", "la sécurité routière", "l'énergie nucléaire",
+    "l'enseignement supérieur", "la fiscalité locale", "l'agriculture biologique", "la défense nationale",
+)
+_CHAMPS_CHRONO = ("dateCreation", "dateDepot", "datePublication", "datePublicationWeb")
+
+
+def generer_archive_amo(
+    chemin: Path,
+    nombre_acteurs: int,
+    nombre_organes: int,
+    graine: int = 0,
+) -> tuple[list[str], list[str]]:
+    """
+    Écrit une archive au format AMO ('json/acteur/PA*.json', 'json/organe/PO*.json') dont les fichiers
+    reprennent la structure des exemples de 'docs-exemple'. Chaque acteur conserve autant de mandats que
+    le modèle, rattachés à des organes tirés au hasard dans l'archive.
+    Retourne les uids des acteurs et des organes générés
+    """
+    aléa = random.Random(graine)
+    modèle_acteur = _charger_modèle(MODÈLE_ACTEUR)
+    modèle_organe = _charger_modèle(MODÈLE_ORGANE)
+
+    uids_organes = [f"PO{900000 + numéro}" for numéro in range(nombre_organes)]
+    types_organes = {uid: aléa.choice(_TYPES_ORGANE) for uid in uids_organes}
+    uids_acteurs = [f"PA{900000 + numéro}" for numéro in range(nombre_acteurs)]
+
+    with zipfile.ZipFile(chemin, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for numéro, uid in enumerate(uids_acteurs):
+            acteur = _générer_acteur(modèle_acteur, uid, numéro, uids_organes, types_organes, aléa)
+            archive.writestr(f"json/acteur/{uid}.json", json.dumps({"acteur": acteur}, ensure_ascii=False))
+
+        for numéro, uid in enumerate(uids_organes):
+            organe = _générer_organe(modèle_organe, uid, numéro, types_organes[uid])
+            archive.writestr(f"json/organe/{uid}.json", json.dumps({"organe": organe}, ensure_ascii=False))
+
+    logger.info("Archive AMO générée : %s (%s acteurs, %s organes, %s octets)", chemin, nombre_acteurs, nombre_organes, chemin.stat().st_size)
+    return uids_acteurs, uids_organes
+
+
+def generer_archive_documents(
+    chemin: Path,
+    nombre_documents: int,
+    uids_acteurs: list[str],
+    uids_organes: list[str],
+    étalement_jours: int = 365,
+    graine: int = 0,
+) -> list[str]:
+    """
+    Écrit une archive au format Dossiers_Legislatifs ('json/document/*.json'). Les auteurs référencent
+    les acteurs et organes de l'archive AMO générée, et les dates de la chronologie sont réparties sur
+    les 'étalement_jours' derniers jours (une partie des documents tombe donc dans la semaine courante).
+    Retourne les uids des documents générés
+    """
+    if not uids_acteurs:
+        raise ValueError("Au moins un acteur est nécessaire pour générer les auteurs des documents")
+
+    aléa = random.Random(graine + 1)
+    modèle_document = _charger_modèle(MODÈLE_DOCUMENT)
+    maintenant = datetime.now(timezone.utc)
+
+    uids_documents = [f"DOCBENCHANR5L17B{numéro:06d}" for numéro in range(nombre_documents)]
+
+    with zipfile.ZipFile(chemin, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for numéro, uid in enumerate(uids_documents):
+            document = _générer_document(
+                modèle_document, uid, numéro, uids_acteurs, uids_organes,
+                maintenant - timedelta(days=aléa.uniform(0, étalement_jours)), aléa,
+            )
+            archive.writestr(f"json/document/{uid}.json", json.dumps({"document": document}, ensure_ascii=False))
+
+    logger.info("Archive documents générée : %s (%s documents, %s octets)", chemin, nombre_documents, chemin.stat().st_size)
+    return uids_documents
+
+
+# --- Private functions
+
+def _charger_modèle(nom_fichier: str) -> dict[str, Any]:
+    with (DOSSIER_EXEMPLES / nom_fichier).open(encoding="utf-8") as fichier:
+        return json.load(fichier)
+
+
+def _générer_acteur(
+    modèle: dict[str, Any],
+    uid: str,
+    numéro: int,
+    uids_organes: list[str],
+    types_organes: dict[str, str],
+    aléa: random.Random,
+) -> dict[str, Any]:
+    acteur = copy.deepcopy(modèle)
+    acteur["uid"]["#text"] = uid
+
+    ident = acteur.get("etatCivil", {}).get("ident", {})
+    ident["nom"] = ident["alpha"] = f"Nom{numéro}"
+    ident["prenom"] = f"Prénom{numéro}"
+
+    mandats = acteur.get("mandats", {}).get("mandat", [])
+    if isinstance(mandats, dict):
+        mandats = [mandats]
+    for rang, mandat in enumerate(mandats):
+        uid_organe = aléa.choice(uids_organes) if uids_organes else None
+        mandat["uid"] = f"PM{uid[2:]}{rang:03d}"
+        mandat["acteurRef"] = uid
+        mandat["organes"] = {"organeRef": uid_organe}
+        if uid_organe is not None:
+            mandat["typeOrgane"] = types_organes[uid_organe]
+
+    return acteur
+
+
+def _générer_organe(modèle: dict[str, Any], uid: str, numéro: int, code_type: str) -> dict[str, Any]:
+    organe = copy.deepcopy(modèle)
+    organe["uid"] = uid
+    organe["codeType"] = code_type
+    organe["libelle"] = f"Organe {numéro} ({code_type})"
+    organe["libelleAbrev"] = f"O{numéro}"
+    return organe
+
+
+def _générer_document(
+    modèle: dict[str, Any],
+    uid: str,
+    numéro: int,
+    uids_acteurs: list[str],
+    uids_organes: list[str],
+    date_dépôt: datetime,
+    aléa: random.Random,
+) -> dict[str, Any]:
+    document = copy.deepcopy(modèle)
+    document["uid"] = uid
+    document["legislature"] = "17"
+
+    titres = document.get("titres")
+    if isinstance(titres, dict):
+        thème = aléa.choice(_THÈMES)
+        titres["titrePrincipal"] = f"Proposition de loi n° {numéro} relative à {thème}"
+        titres["titrePrincipalCourt"] = thème
+
+    document["auteurs"] = {
+        "auteur": [
+            {"acteur": {"qualite": "auteur" if rang == 0 else "cosignataire", "acteurRef": uid_acteur}}
+            for rang, uid_acteur in enumerate(aléa.sample(uids_acteurs, k=min(len(uids_acteurs), aléa.randint(1, 3))))
+        ]
+    }
+    if uids_organes and aléa.random() < 0.1:
+        # Une partie des documents a aussi un organe pour auteur (commission, gouvernement)
+        document["auteurs"]["auteur"].append({"organe": {"organeRef": aléa.choice(uids_organes)}})
+
+    # Les dates de la chronologie se suivent de quelques jours au plus
+    date = date_dépôt
+    chrono = {}
+    for champ in _CHAMPS_CHRONO:
+        chrono[champ] = date.isoformat(timespec="milliseconds")
+        date = date + timedelta(hours=aléa.randint(0, 48))
+    document["cycleDeVie"] = {"chrono": chrono}
+
+    return document
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+import shutil
+import threading
+
+from dataclasses import dataclass
+from email.utils import formatdate
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Mapping
+
+logger = logging.getLogger(__name__)
+
+_RANGE = re.compile(r"bytes=(\d+)-$")
+
+
+class ServeurAmont:
+    """
+    Serveur HTTP local remplaçant data.assemblee-nationale.fr le temps d'un benchmark.
+    Sert des archives avec un ETag fort et un Last-Modified, répond 304 aux requêtes conditionnelles
+    et 206 aux reprises (Range + If-Range), comme le serveur d'origine.
+    S'utilise comme gestionnaire de contexte : le serveur écoute sur un port libre de 127.0.0.1
+    """
+    def __init__(self, archives: Mapping[str, Path]) -> None:
+        # Chemin de l'URL (ex: '/amo.zip') -> archive servie
+        self._archives = {chemin: _ArchiveServie.depuis_fichier(fichier) for chemin, fichier in archives.items()}
+        self._serveur: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> ServeurAmont:
+        archives = self._archives
+
+        class _Gestionnaire(_GestionnaireAmont):
+            archives_servies = archives
+
+        self._serveur = ThreadingHTTPServer(("127.0.0.1", 0), _Gestionnaire)
+        self._thread = threading.Thread(target=self._serveur.serve_forever, name="serveur-amont", daemon=True)
+        self._thread.start()
+        logger.info("Serveur amont local démarré sur %s", self.url(""))
+        return self
+
+    def __exit__(self, type_exception, exception, trace) -> None:
+        if self._serveur is not None:
+            self._serveur.shutdown()
+            self._serveur.server_close()
+            self._serveur = None
+
+    def url(self, chemin: str) -> str:
+        if self._serveur is None:
+            raise RuntimeError("Le serveur amont n'est pas démarré")
+        hôte, port = self._serveur.server_address[:2]
+        return f"http://{hôte}:{port}{chemin}"
+
+
+@dataclass(frozen=True)
+class _ArchiveServie:
+    chemin: Path
+    etag: str
+    last_modified: str
+    taille: int
+
+    @classmethod
+    def depuis_fichier(cls, chemin: Path) -> _ArchiveServie:
+        empreinte = hashlib.sha256()
+        with chemin.open("rb") as fichier:
+            while chunk := fichier.read(1024 * 1024):
+                empreinte.update(chunk)
+        statistiques = chemin.stat()
+        return cls(
+            chemin=chemin,
+            etag=f'"{empreinte.hexdigest()[:32]}"',
+            last_modified=formatdate(statistiques.st_mtime, usegmt=True),
+            taille=statistiques.st_size,
+        )
+
+
+class _GestionnaireAmont(BaseHTTPRequestHandler):
+    archives_servies: Mapping[str, _ArchiveServie] = {}
+    protocol_version = "HTTP/1.1"
+
+    def do_HEAD(self) -> None:
+        self._répondre(avec_corps=False)
+
+    def do_GET(self) -> None:
+        self._répondre(avec_corps=True)
+
+    def log_message(self, format: str, *args) -> None:
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    # --- Private functions
+
+    def _répondre(self, avec_corps: bool) -> None:
+        archive = self.archives_servies.get(self.path.split("?", 1)[0])
+        if archive is None:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+
+        if self.headers.get("If-None-Match") == archive.etag or (
+            "If-None-Match" not in self.headers and self.headers.get("If-Modified-Since") == archive.last_modified
+        ):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self._envoyer_validateurs(archive)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        début = self._début_de_la_plage(archive)
+        if début is not None:
+            self.send_response(HTTPStatus.PARTIAL_CONTENT)
+            self.send_header("Content-Range", f"bytes {début}-{archive.taille - 1}/{archive.taille}")
+        else:
+            début = 0
+            self.send_response(HTTPStatus.OK)
+        self._envoyer_validateurs(archive)
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Content-Type", "application/zip")
+        self.send_header("Content-Length", str(archive.taille - début))
+        self.end_headers()
+
+        if not avec_corps:
+            return
+        with archive.chemin.open("rb") as fichier:
+            fichier.seek(début)
+            shutil.copyfileobj(fichier, self.wfile)
+
+    def _début_de_la_plage(self, archive: _ArchiveServie) -> int | None:
+        """
+        Début de la plage demandée, ou None si l'archive complète doit être renvoyée
+        (pas de Range, validateur If-Range périmé ou plage non satisfaisable)
+        """
+        correspondance = _RANGE.fullmatch(self.headers.get("Range", "").strip())
+        if correspondance is None:
+            return None
+        if_range = self.headers.get("If-Range")
+        if if_range is not None and if_range not in (archive.etag, archive.last_modified):
+            return None
+
+        début = int(correspondance.group(1))
+        return début if début < archive.taille else None
+
+    def _envoyer_validateurs(self, archive: _ArchiveServie) -> None:
+        self.send_header("ETag", archive.etag)
+        self.send_header("Last-Modified", archive.last_modified)
@@ -1,13 +1,78 @@
 from __future__ import annotations
 
+import argparse
+import logging
 import os
+import sys
+import time
 
-import uvicorn
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Sequence
 
 from src.settings import settings
 
+logger = logging.getLogger("src.cli")
+
+# Nom de la commande -> jeu de données ('amo' charge les acteurs et les organes en un seul parcours de l'archive)
+DATASETS_PAR_COMMANDE = {
+    "acteurs": ["acteur"],
+    "organes": ["organe"],
+    "documents": ["document"],
+    "amo": ["amo"],
+    "all": ["amo", "document"],
+}
+
+
+def main(arguments: Sequence[str] | None = None) -> int:
+    options = _construire_parseur().parse_args(arguments)
+
+    if options.commande == "ingest":
+        return _ingerer(options)
+
+    _servir()
+    return 0
+
+
+def _construire_parseur() -> argparse.ArgumentParser:
+    parseur = argparse.ArgumentParser(prog="python -m src", description="API bourbontracker et mises à jour des données")
+    commandes = parseur.add_subparsers(dest="commande")
+
+    commandes.add_parser("serve", help="Démarre l'API (commande par défaut)")
+
+    ingestion = commandes.add_parser("ingest", help="Met à jour des jeux de données sans démarrer l'API")
+    ingestion.add_argument("cible", choices=sorted(DATASETS_PAR_COMMANDE), help="Jeu de données à mettre à jour ('all' : tous)")
+    ingestion.add_argument(
+        "--from-file",
+        dest="fichier_local",
+        type=Path,
+        metavar="ARCHIVE",
+        help="Archive '.zip' locale à enregistrer à la place du téléchargement (un seul jeu de données)",
+    )
+    ingestion.add_argument(
+        "--concurrency",
+        dest="concurrence",
+        type=int,
+        default=2,
+        metavar="N",
+        help="Nombre de jeux de données mis à jour simultanément (défaut : 2)",
+    )
+    ingestion.add_argument(
+        "--legislature",
+        dest="legislatures",
+        type=int,
+        nargs="+",
+        metavar="N",
+        help="Législature(s) à mettre à jour, ex : '--legislature 15 16 17' (défaut : la législature courante)",
+    )
+    ingestion.add_argument("--force", dest="forcer", action="store_true", help="Retraite l'archive même si elle est inchangée")
+
+    return parseur
+
+
+def _servir() -> None:
+    import uvicorn
 
-def main() -> None:
     port = int(os.getenv("PORT", "8000"))
 
     uvicorn.run(
@@ -18,5 +83,89 @@ def main() -> None:
     )
 
 
+def _ingerer(options: argparse.Namespace) -> int:
+    # Import local : la commande de service n'a pas besoin de la couche d'ingestion (et inversement)
+    from src.infra._baseConnexionBdd import fermer_connexion_partagée, ouvrir_connexion_partagée
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
+
+    legislatures = options.legislatures or [settings.legislature_courante]
+    # Chaque couple (jeu de données, législature) est une mise à jour indépendante, exécutée en parallèle des autres
+    # sauf si elles écrivent les mêmes tables (voir _grouper_par_tables)
+    mises_à_jour = [
+        (dataset, legislature)
+        for legislature in dict.fromkeys(legislatures)
+        for dataset in DATASETS_PAR_COMMANDE[options.cible]
+    ]
+    if options.fichier_local is not None and len(mises_à_jour) > 1:
+        logger.error("--from-file ne peut être utilisé qu'avec un seul jeu de données et une seule législature")
+        return 2
+    if options.concurrence < 1:
+        logger.error("--concurrency doit être supérieur ou égal à 1")
+        return 2
+    if any(legislature < 1 for legislature in legislatures):
+        logger.error("--legislature doit être un numéro de législature positif")
+        return 2
+
+    # Un seul pool de connexions partagé par toutes les mises à jour
+    ouvrir_connexion_partagée()
+    try:
+        with ThreadPoolExecutor(max_workers=options.concurrence, thread_name_prefix="ingestion") as executeur:
+            résultats = [
+                résultat
+                for résultats_du_groupe in executeur.map(
+                    lambda groupe: [_ingerer_dataset(*mise_à_jour, options.forcer, options.fichier_local) for mise_à_jour in groupe],
+                    _grouper_par_tables(mises_à_jour),
+                )
+                for résultat in résultats_du_groupe
+            ]
+    finally:
+        fermer_connexion_partagée()
+
+    _afficher_résultats(résultats)
+    return 0 if all(état == "succeeded" for _, _, état, _, _ in résultats) else 1
+
+
+def _grouper_par_tables(mises_à_jour: Sequence[tuple[str, int]]) -> list[list[tuple[str, int]]]:
+    """
+    Les mises à jour écrivant les mêmes tables (acteurs et organes de plusieurs législatures) s'exécutent l'une après
+    l'autre : en parallèle, toutes sauf une seraient ignorées
+    """
+    from src.metier.ingestion.lancerIngestion import clé_des_tables
+
+    groupes: dict[str, list[tuple[str, int]]] = {}
+    for dataset, legislature in mises_à_jour:
+        groupes.setdefault(clé_des_tables(dataset, legislature), []).append((dataset, legislature))
+    return list(groupes.values())
+
+
+def _ingerer_dataset(dataset: str, legislature: int, forcer: bool, fichier_local: Path | None) -> tuple[str, int, str, float, str]:
+    from src.metier.ingestion.lancerIngestion import executer_ingestion
+
+    début = time.perf_counter()
+    try:
+        ingestion = executer_ingestion(dataset, forcer=forcer, fichier_local=fichier_local, legislature=legislature)
+    except Exception as e:
+        logger.exception("Échec de la mise à jour '%s' de la législature %s", dataset, legislature)
+        return dataset, legislature, "failed", time.perf_counter() - début, str(e)
+    durée = time.perf_counter() - début
+
+    if ingestion is None:
+        return dataset, legislature, "skipped", durée, "une ingestion est déjà en cours"
+    if ingestion.state != "succeeded":
+        return dataset, legislature, ingestion.state, durée, ingestion.error or ""
+
+    détail = ", ".join(
+        f"{nom_dossier}: {compteurs.get('insérés', 0)} créé(s) / {compteurs.get('mis_à_jour', 0)} mis à jour / {compteurs.get('inchangés', 0)} inchangé(s)"
+        for nom_dossier, compteurs in (ingestion.counts or {}).items()
+    )
+    return dataset, legislature, ingestion.state, durée, détail
+
+
+def _afficher_résultats(résultats: Sequence[tuple[str, int, str, float, str]]) -> None:
+    for dataset, legislature, état, durée, détail in résultats:
+        print(f"{dataset:<10} {legislature:>3} {état:<10} {durée:>8.1f}s  {détail}", file=sys.stdout)
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -4,7 +4,7 @@ from typing import Type
 from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 
-from src.metier.applicationExceptions import ActeurIntrouvableException, DocumentIntrouvableException, OrganeIntrouvableException
+from src.metier.applicationExceptions import ActeurIntrouvableException, DocumentIntrouvableException, IngestionIntrouvableException, OrganeIntrouvableException, ParametreInvalideException
 from src.infra.infrastructureException import LectureException, MiseAJourStockException
 
 _ExceptionsReponse = Callable[[Request, Exception], JSONResponse]
@@ -26,6 +26,8 @@ _TYPE_EXCEPTIONS_ET_LEUR_CODES_REPONSES: dict[Type[Exception], HTTPStatus] = {
     DocumentIntrouvableException: HTTPStatus.NOT_FOUND,
     ActeurIntrouvableException: HTTPStatus.NOT_FOUND,
     OrganeIntrouvableException: HTTPStatus.NOT_FOUND,
+    IngestionIntrouvableException: HTTPStatus.NOT_FOUND,
+    ParametreInvalideException: HTTPStatus.BAD_REQUEST,
     MiseAJourStockException: HTTPStatus.INTERNAL_SERVER_ERROR,
     LectureException: HTTPStatus.INTERNAL_SERVER_ERROR,
 }
@@ -91,3 +91,8 @@ class DocumentReponse(BaseModel):
     #coSignataires: Optional[CoSignatairesReponse] = None
     #depotAmendements: Optional[DepotAmendementsReponse] = None
     organesReferents: Optional[OrganesReferentsReponse] = None
+
+class PageDocumentsReponse(BaseModel):
+    documents: List[DocumentReponse] = []
+    suivant: Optional[str] = None
+
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+from pydantic import BaseModel, ConfigDict
+
+class IngestionReponse(BaseModel):
+    model_config = ConfigDict(populate_by_name=True, extra="ignore")
+
+    id: str
+    dataset: str
+    legislature: Optional[int] = None
+    state: str
+    force: bool = False
+    rows_processed: int = 0
+    counts: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class EtatDatasetReponse(BaseModel):
+    model_config = ConfigDict(populate_by_name=True, extra="ignore")
+
+    dataset: str
+    legislature: Optional[int] = None
+    url: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_length: Optional[int] = None
+    sha256: Optional[str] = None
+    checkpoint_member: Optional[str] = None
+    metrics: Optional[Dict[str, Any]] = None
+    updated_at: Optional[datetime] = None
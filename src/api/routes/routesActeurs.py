@@ -1,9 +1,15 @@
-from fastapi import APIRouter, Query, status
+from datetime import date
+
+from fastapi import APIRouter, Query, Response, status
 
 from src.api.routes.acteurReponse import ActeurReponse
+from src.api.routes.documentReponse import PageDocumentsReponse
 from src.metier.acteur.acteur import Acteur
-from src.metier.acteur.enregistrerActeurs import mettre_a_jour_acteurs
 from src.metier.acteur.recupererActeur import recuperer_acteur
+from src.metier.document.document import PageDocuments
+from src.metier.document.recupererDocuments import recuperer_documents_acteur
+from src.api.routes.ingestionReponse import IngestionReponse
+from src.api.routes.routesIngestions import soumettre_ingestion
 
 router = APIRouter(prefix="/v1/acteurs", tags=["acteurs"])
 
@@ -27,6 +33,65 @@ def retourne_acteur(
     )
 
 
-@router.post("", status_code=status.HTTP_201_CREATED)
-def met_a_jour_acteurs():
-    return mettre_a_jour_acteurs()
\ No newline at end of file
+@router.get(
+    "/{uid}/documents",
+    response_model=PageDocumentsReponse,
+    response_model_exclude_none=True,
+    status_code=status.HTTP_200_OK,
+)
+def retourne_documents_acteur(
+    uid: str,
+    depuis: date | None = Query(
+        default=None,
+        description="Date effective minimale des documents (incluse, ex: '2024-07-18').",
+    ),
+    jusqu_au: date | None = Query(
+        default=None,
+        description="Date effective maximale des documents (incluse).",
+    ),
+    legislature: int | None = Query(
+        default=None,
+        ge=1,
+        description="Législature des documents (par défaut : toutes).",
+    ),
+    curseur: str | None = Query(
+        default=None,
+        description="Valeur 'suivant' de la page précédente.",
+    ),
+    limite: int = Query(
+        default=50,
+        ge=1,
+        le=200,
+        description="Nombre maximal de documents par page.",
+    ),
+) -> PageDocumentsReponse:
+    page: PageDocuments = recuperer_documents_acteur(
+        uid,
+        limite,
+        depuis=depuis,
+        jusqu_au=jusqu_au,
+        legislature=legislature,
+        curseur=curseur,
+    )
+    return PageDocumentsReponse.model_validate(page.model_dump(mode="python", by_alias=True))
+
+
+@router.post(
+    "",
+    response_model=IngestionReponse,
+    response_model_exclude_none=True,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def met_a_jour_acteurs(
+    response: Response,
+    forcer: bool = Query(
+        default=False,
+        description="Retraite l'archive même si elle n'a pas changé depuis la dernière mise à jour.",
+    ),
+    legislature: int | None = Query(
+        default=None,
+        ge=1,
+        description="Législature de l'archive à enregistrer (par défaut : la législature courante).",
+    ),
+) -> IngestionReponse:
+    return soumettre_ingestion("acteur", forcer, response, legislature)
\ No newline at end of file
@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Query, Response, status
+
+from src.api.routes.ingestionReponse import IngestionReponse
+from src.api.routes.routesIngestions import soumettre_ingestion
+
+router = APIRouter(prefix="/v1/amo", tags=["amo"])
+
+
+@router.post(
+    "",
+    response_model=IngestionReponse,
+    response_model_exclude_none=True,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def met_a_jour_acteurs_et_organes(
+    response: Response,
+    forcer: bool = Query(
+        default=False,
+        description="Retraite l'archive même si elle n'a pas changé depuis la dernière mise à jour.",
+    ),
+    legislature: int | None = Query(
+        default=None,
+        ge=1,
+        description="Législature de l'archive à enregistrer (par défaut : la législature courante).",
+    ),
+) -> IngestionReponse:
+    return soumettre_ingestion("amo", forcer, response, legislature)
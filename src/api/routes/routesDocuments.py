@@ -1,9 +1,12 @@
-from fastapi import APIRouter, status
+from datetime import date
 
-from src.api.routes.documentReponse import DocumentReponse
-from src.metier.document.document import Document
-from src.metier.document.enregistrerDocuments import mettre_a_jour_documents
-from src.metier.document.recupererDocuments import recuperer_documents_semaine_courante
+from fastapi import APIRouter, Query, Response, status
+
+from src.api.routes.documentReponse import DocumentReponse, PageDocumentsReponse
+from src.metier.document.document import PageDocuments
+from src.metier.document.recupererDocuments import recuperer_documents_semaine_courante, rechercher_documents
+from src.api.routes.ingestionReponse import IngestionReponse
+from src.api.routes.routesIngestions import soumettre_ingestion
 
 router = APIRouter(prefix="/v1/documents", tags=["documents"])
 
@@ -14,14 +17,81 @@ router = APIRouter(prefix="/v1/documents", tags=["documents"])
     response_model_exclude_none=True,
     status_code=status.HTTP_200_OK,
 )
-def retourne_documents() -> list[DocumentReponse]:
-    documents: list[Document] = recuperer_documents_semaine_courante()
-    return [
-        DocumentReponse.model_validate(document.model_dump(mode="python", by_alias=True))
-        for document in documents
-    ]
+def retourne_documents(
+    legislature: int | None = Query(
+        default=None,
+        ge=1,
+        description="Législature des documents (par défaut : la législature courante).",
+    ),
+) -> list[DocumentReponse]:
+    # Documents déjà enrichis et sérialisés par le flux précalculé
+    documents: list[dict] = recuperer_documents_semaine_courante(legislature)
+    return [DocumentReponse.model_validate(document) for document in documents]
+
+
+@router.get(
+    "/search",
+    response_model=PageDocumentsReponse,
+    response_model_exclude_none=True,
+    status_code=status.HTTP_200_OK,
+)
+def recherche_documents(
+    q: str = Query(
+        min_length=1,
+        max_length=500,
+        description="Texte recherché dans les titres et la notice (ex: 'climat \"énergie renouvelable\" -nucléaire').",
+    ),
+    depuis: date | None = Query(
+        default=None,
+        description="Date effective minimale des documents (incluse, ex: '2024-07-18').",
+    ),
+    jusqu_au: date | None = Query(
+        default=None,
+        description="Date effective maximale des documents (incluse).",
+    ),
+    legislature: int | None = Query(
+        default=None,
+        ge=1,
+        description="Législature des documents (par défaut : toutes).",
+    ),
+    curseur: str | None = Query(
+        default=None,
+        description="Valeur 'suivant' de la page précédente.",
+    ),
+    limite: int = Query(
+        default=50,
+        ge=1,
+        le=200,
+        description="Nombre maximal de documents par page.",
+    ),
+) -> PageDocumentsReponse:
+    page: PageDocuments = rechercher_documents(
+        q,
+        limite,
+        depuis=depuis,
+        jusqu_au=jusqu_au,
+        legislature=legislature,
+        curseur=curseur,
+    )
+    return PageDocumentsReponse.model_validate(page.model_dump(mode="python", by_alias=True))
 
 
-@router.post("", status_code=status.HTTP_201_CREATED)
-def met_a_jour_documents():
-    return mettre_a_jour_documents()
\ No newline at end of file
+@router.post(
+    "",
+    response_model=IngestionReponse,
+    response_model_exclude_none=True,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def met_a_jour_documents(
+    response: Response,
+    forcer: bool = Query(
+        default=False,
+        description="Retraite l'archive même si elle n'a pas changé depuis la dernière mise à jour.",
+    ),
+    legislature: int | None = Query(
+        default=None,
+        ge=1,
+        description="Législature de l'archive à enregistrer (par défaut : la législature courante).",
+    ),
+) -> IngestionReponse:
+    return soumettre_ingestion("document", forcer, response, legislature)
\ No newline at end of file
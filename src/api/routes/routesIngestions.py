@@ -0,0 +1,41 @@
+from typing import List
+
+from fastapi import APIRouter, Response, status
+
+from src.api.routes.ingestionReponse import EtatDatasetReponse, IngestionReponse
+from src.metier.ingestion.ingestion import Ingestion
+from src.metier.ingestion.lancerIngestion import lancer_ingestion
+from src.metier.ingestion.recupererIngestion import recuperer_etats_datasets, recuperer_ingestion
+
+router = APIRouter(prefix="/v1/ingestions", tags=["ingestions"])
+
+
+# Déclarée avant "/{id_ingestion}" pour ne pas être interprétée comme un identifiant d'ingestion
+@router.get(
+    "/etats",
+    response_model=List[EtatDatasetReponse],
+    response_model_exclude_none=True,
+    status_code=status.HTTP_200_OK,
+)
+def retourne_etats_datasets() -> List[EtatDatasetReponse]:
+    return [EtatDatasetReponse.model_validate(état.model_dump(mode="python")) for état in recuperer_etats_datasets()]
+
+
+@router.get(
+    "/{id_ingestion}",
+    response_model=IngestionReponse,
+    response_model_exclude_none=True,
+    status_code=status.HTTP_200_OK,
+)
+def retourne_ingestion(id_ingestion: str) -> IngestionReponse:
+    ingestion: Ingestion = recuperer_ingestion(id_ingestion)
+    return IngestionReponse.model_validate(ingestion.model_dump(mode="python"))
+
+
+def soumettre_ingestion(dataset: str, forcer: bool, response: Response, legislature: int | None = None) -> IngestionReponse:
+    """
+    Lance (ou rejoint) l'ingestion de 'dataset' en arrière-plan : la réponse 202 indique où suivre sa progression
+    """
+    ingestion: Ingestion = lancer_ingestion(dataset, forcer=forcer, legislature=legislature)
+    response.headers["Location"] = router.url_path_for("retourne_ingestion", id_ingestion=ingestion.id)
+    return IngestionReponse.model_validate(ingestion.model_dump(mode="python"))
@@ -1,9 +1,10 @@
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Query, Response, status
 
 from src.metier.organe.organe import Organe
-from src.metier.organe.enregistrerOrgane import mettre_a_jour_organes
 from src.metier.organe.recupererOrgane import recuperer_organe
 from src.api.routes.organeReponse import OrganeReponse
+from src.api.routes.ingestionReponse import IngestionReponse
+from src.api.routes.routesIngestions import soumettre_ingestion
 
 router = APIRouter(prefix="/v1/organes", tags=["organes"])
 
@@ -21,6 +22,22 @@ def retourne_organe(uid: str) -> OrganeReponse:
     )
 
 
-@router.post("", status_code=status.HTTP_201_CREATED)
-def met_a_jour_organes():
-    return mettre_a_jour_organes()
\ No newline at end of file
+@router.post(
+    "",
+    response_model=IngestionReponse,
+    response_model_exclude_none=True,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def met_a_jour_organes(
+    response: Response,
+    forcer: bool = Query(
+        default=False,
+        description="Retraite l'archive même si elle n'a pas changé depuis la dernière mise à jour.",
+    ),
+    legislature: int | None = Query(
+        default=None,
+        ge=1,
+        description="Législature de l'archive à enregistrer (par défaut : la législature courante).",
+    ),
+) -> IngestionReponse:
+    return soumettre_ingestion("organe", forcer, response, legislature)
\ No newline at end of file
@@ -1,22 +1,61 @@
 import logging
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.orm import Session, sessionmaker
 
 from src.settings import settings
 
 logger = logging.getLogger(__name__)
 
 
-class _BaseConnexionBdd:
-    def __init__(self) -> None:
-        self.engine = create_engine(
-            settings.database_url,
+class ConnexionBdd:
+    """
+    Moteur SQLAlchemy et fabrique de sessions partagés par toute l'application.
+    Le pool de connexions est créé une seule fois (au démarrage) puis réutilisé par chaque requête.
+    """
+    def __init__(self, database_url: str | None = None) -> None:
+        self.engine: Engine = create_engine(
+            database_url or settings.database_url,
             future=True,
             pool_pre_ping=True,
+            pool_size=settings.database_pool_size,
+            max_overflow=settings.database_max_overflow,
+            pool_recycle=settings.database_pool_recycle,
+            pool_timeout=settings.database_pool_timeout,
         )
-        self.SessionLocal = sessionmaker(
+        self.SessionLocal: sessionmaker[Session] = sessionmaker(
             bind=self.engine,
             autoflush=False,
             autocommit=False,
-        )
\ No newline at end of file
+        )
+
+    def fermer(self) -> None:
+        logger.debug("Fermeture du pool de connexions %s", self.engine.url.render_as_string(hide_password=True))
+        self.engine.dispose()
+
+
+_connexion_partagée: ConnexionBdd | None = None
+
+
+def ouvrir_connexion_partagée() -> ConnexionBdd:
+    global _connexion_partagée
+    if _connexion_partagée is None:
+        _connexion_partagée = ConnexionBdd()
+        logger.info("Pool de connexions ouvert (taille=%s, débordement=%s)", settings.database_pool_size, settings.database_max_overflow)
+    return _connexion_partagée
+
+
+def fermer_connexion_partagée() -> None:
+    global _connexion_partagée
+    if _connexion_partagée is not None:
+        _connexion_partagée.fermer()
+        _connexion_partagée = None
+
+
+class _BaseConnexionBdd:
+    def __init__(self, connexion: ConnexionBdd | None = None) -> None:
+        # Sans connexion injectée, on utilise le pool partagé de l'application (ouvert à la demande hors FastAPI)
+        connexion = connexion or ouvrir_connexion_partagée()
+
+        self.engine: Engine = connexion.engine
+        self.SessionLocal: sessionmaker[Session] = connexion.SessionLocal
@@ -1,40 +1,112 @@
+from __future__ import annotations
+
 import shutil
 import zipfile
-import requests
 import logging
 import json
 import tempfile
 import os
+import csv
+import io
+import time
 
+from dataclasses import dataclass
 from pathlib import Path
-from typing import BinaryIO, Iterable, Iterator, Mapping, Type
+from typing import Callable, Iterable, Iterator, Mapping, Type
 from sqlalchemy.orm import DeclarativeMeta, Session as SASession
 from sqlalchemy.dialects.postgresql import insert as pg_insert
-from sqlalchemy import func
+from sqlalchemy import Table, func, literal_column, text
 from sqlalchemy.exc import SQLAlchemyError
 
-from src.infra._baseConnexionBdd import _BaseConnexionBdd
+from src.infra._baseConnexionBdd import ConnexionBdd, _BaseConnexionBdd
+from src.infra._ecrivainsParalleles import ÉcrivainsParallèles
+from src.infra._mesures import MesuresIngestion
+from src.infra._partitions import colonne_de_partition, créer_partition_si_absente
+from src.infra._pipeline import en_arrière_plan
+from src.infra._tableOmbre import (
+    TableOmbre,
+    comparer_à_la_table_d_origine,
+    compter_lignes,
+    conserver_dates_de_mise_à_jour,
+    construire_index,
+    créer_table_ombre,
+    remplacer_par_la_table_ombre,
+    supprimer_table_ombre,
+)
+from src.infra._telechargement import ArchiveTéléchargée, décrire_archive_locale, telecharger_avec_reprise
+from src.infra._decodageJson import FichierDécodé, décoder_fichiers, extraire_uid, préparer_fichier
 from src.infra.infrastructureException import MiseAJourStockException
+from src.infra.models import EtatIngestion
+from src.settings import settings
 
 logger = logging.getLogger(__name__)
 
+@dataclass
+class CompteursEnregistrement:
+    insérés: int = 0
+    mis_à_jour: int = 0
+    inchangés: int = 0
+    # Lignes absentes de la nouvelle archive, retirées lors d'un rafraîchissement par table fantôme
+    supprimés: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.insérés + self.mis_à_jour + self.inchangés
+
+    def __add__(self, autre: CompteursEnregistrement) -> CompteursEnregistrement:
+        return CompteursEnregistrement(
+            insérés=self.insérés + autre.insérés,
+            mis_à_jour=self.mis_à_jour + autre.mis_à_jour,
+            inchangés=self.inchangés + autre.inchangés,
+            supprimés=self.supprimés + autre.supprimés,
+        )
+
+
+SuiviProgression = Callable[[int], None]
+
+
 class _BaseStockage(_BaseConnexionBdd):
+
     def __init__(
             self, 
             nom_dossier_zip: str, 
             nom_dossier: str, 
-            url: str
+            url: str,
+            connexion: ConnexionBdd | None = None,
+            forcer: bool = False,
+            suivi: SuiviProgression | None = None,
+            fichier_local: Path | None = None,
+            legislature: int | None = None,
     ) -> None:
         
-        super().__init__()
+        super().__init__(connexion)
 
         self.nom_dossier: str = nom_dossier
+        # legislature : législature de l'archive (les mises à jour de plusieurs législatures peuvent s'exécuter en parallèle)
+        self.legislature: int = legislature or settings.legislature_courante
         self.chemin_racine: Path = self._initialiser_chemin_racine()
 
-        self.chemin_zip: Path = self.chemin_racine / nom_dossier_zip
-        self.dossier_dezippé: Path = self.chemin_racine / nom_dossier
+        # Un dossier par législature : deux mises à jour simultanées n'écrivent jamais dans la même archive
+        self.chemin_zip: Path = self.chemin_racine / str(self.legislature) / nom_dossier_zip
+        self.dossier_dezippé: Path = self.chemin_racine / str(self.legislature) / nom_dossier
 
         self.url: str = url
+        # fichier_local : archive déjà présente sur disque, lue à la place du téléchargement
+        self.fichier_local: Path | None = fichier_local
+
+        # forcer : ignore l'état de la dernière mise à jour et retraite l'archive même si elle est inchangée
+        self.forcer: bool = forcer
+        self._archive_téléchargée: ArchiveTéléchargée | None = None
+        # suivi : appelé après chaque batch enregistré avec le nombre total de lignes traitées
+        self.suivi: SuiviProgression | None = suivi
+        # validation par batch : chaque batch est validé avec un point de reprise au lieu d'une transaction unique
+        self.validation_par_batch: bool = settings.stockage_validation_par_batch
+        # Le point de reprise suppose un ordre d'écriture unique : pas d'écrivains parallèles dans ce mode
+        self.nombre_écrivains: int = 1 if self.validation_par_batch else settings.stockage_nombre_ecrivains
+        # Tables fantômes en cours de chargement, par nom de table d'origine
+        self._tables_ombre: dict[str, TableOmbre] = {}
+        # Mesures de la dernière mise à jour (durées par étape, volumes, mémoire)
+        self.mesures: MesuresIngestion = MesuresIngestion()
     
     def vider_dossier_racine(self) -> None:
         base = Path(self.chemin_racine).resolve()
@@ -73,11 +145,220 @@ class _BaseStockage(_BaseConnexionBdd):
             return chemin_temporaire
 
 
-    def _mettre_a_jour(self) -> list[Path]:
+    def _mettre_a_jour_stock_des_dossiers(
+        self,
+        models: Mapping[str, Type[DeclarativeMeta]],
+        batch_size: int = 1000,
+    ) -> dict[str, CompteursEnregistrement]:
+        """
+        Télécharge l'archive puis enregistre chaque dossier dans l'ORM correspondant, en une seule transaction
+        (ou une transaction par batch en mode validation par batch).
+        Si l'archive distante n'a pas changé depuis la dernière mise à jour, rien n'est enregistré
+        """
+        self.mesures = MesuresIngestion()
+        try:
+            return self._telecharger_et_enregistrer(models, batch_size)
+        finally:
+            self.mesures.journaliser(self.nom_dossier)
+            self._enregistrer_mesures()
+
+    def _telecharger_et_enregistrer(
+        self,
+        models: Mapping[str, Type[DeclarativeMeta]],
+        batch_size: int = 1000,
+    ) -> dict[str, CompteursEnregistrement]:
+        # Le point de reprise désigne un fichier de l'archive : la validation par batch lit toujours le '.zip'
+        lecture_zip_directe = settings.stockage_lecture_zip_directe or len(models) > 1 or self.validation_par_batch
+
+        if not self._mettre_a_jour(extraire=not lecture_zip_directe):
+            logger.info("Archive %s inchangée depuis la dernière mise à jour de '%s' : rien à enregistrer", self.url, self.nom_dossier)
+            return {nom_dossier: CompteursEnregistrement() for nom_dossier in models}
+
+        # Une table fantôme est recréée vide à chaque mise à jour : une reprise partielle n'aurait pas de sens
+        par_table_ombre = any(self._rafraichissement(nom_dossier) == "ombre" for nom_dossier in models)
+        reprendre_après = self._lire_point_de_reprise() if self.validation_par_batch and not par_table_ombre else None
+
+        with self.SessionLocal() as session:
+            try:
+                self._créer_partitions(session, models)
+                self._créer_tables_ombre(session, models)
+                if self._tables_ombre and self.nombre_écrivains > 1:
+                    # Les écrivains parallèles utilisent leurs propres connexions : les tables fantômes doivent leur être visibles
+                    session.commit()
+                if lecture_zip_directe:
+                    totaux = self._enregistrer_depuis_zip_par_dossier(session, models, batch_size, reprendre_après)
+                else:
+                    totaux = {self.nom_dossier: self._enregistrer_depuis_dossier(session, models[self.nom_dossier], batch_size)}
+                if self._tables_ombre:
+                    with self.mesures.chronométrer("table_ombre"):
+                        totaux.update(self._finaliser_tables_ombre(session, models, totaux))
+                        # Les tables fantômes sont complètes : le remplacement se fait ensuite dans une transaction courte
+                        session.commit()
+                    with self.mesures.chronométrer("substitution"):
+                        self._remplacer_par_les_tables_ombre(session)
+                        # Validée seule : les verrous exclusifs du remplacement ne sont pas tenus pendant
+                        # la mise à jour des tables dérivées, qui relit toute la table
+                        session.commit()
+                # Après un remplacement, dans une transaction distincte : en cas d'échec, les données restent
+                # remplacées mais l'état n'est pas enregistré, et la mise à jour suivante reprendra les tables dérivées
+                with self.mesures.chronométrer("tables_dérivées"):
+                    self._mettre_a_jour_tables_dérivées(session, models)
+                # L'état n'est enregistré qu'avec les données : une mise à jour en échec sera rejouée
+                self._enregistrer_etat_ingestion(session)
+                session.commit()
+            except Exception:
+                session.rollback()
+                logger.exception("Rollback de la transaction en raison d'une erreur lors de la mise à jour de '%s'", ", ".join(models))
+                if self.validation_par_batch and not self._tables_ombre:
+                    logger.info("Les batches déjà validés sont conservés : la prochaine mise à jour de '%s' reprendra au dernier point de reprise", self.nom_dossier)
+                self._supprimer_tables_ombre(session)
+                raise
+            finally:
+                self._tables_ombre.clear()
+
+        return totaux
+
+    def _rafraichissement(self, nom_dossier: str) -> str:
+        return settings.stockage_rafraichissement_par_dataset.get(nom_dossier, "incremental")
+
+    def _ligne(self, nom_dossier: str, uid: str, payload: dict, payload_hash: str | None) -> dict:
+        return {"uid": uid, "payload": payload, "payload_hash": payload_hash, **self._colonnes_dérivées(nom_dossier, payload)}
+
+    def _colonnes_dérivées(self, nom_dossier: str, payload: dict) -> dict[str, object]:
+        """
+        Valeurs des colonnes calculées à partir du payload lors de l'enregistrement (voir '_noms_colonnes_dérivées').
+        Aucune par défaut : les chargeurs concernés redéfinissent cette méthode
+        """
+        return {}
+
+    @staticmethod
+    def _noms_colonnes_dérivées(model: Type[DeclarativeMeta]) -> list[str]:
+        """
+        Colonnes de la table renseignées par '_colonnes_dérivées' : ni colonnes écrites pour toute ligne,
+        ni colonnes générées par PostgreSQL, ni colonne de partitionnement
+        """
+        table = model.__table__
+        exclues = {"uid", "payload", "payload_hash", "updated_at", colonne_de_partition(table)}
+        return [colonne.name for colonne in table.columns if colonne.name not in exclues and colonne.computed is None]
+
+    def _mettre_a_jour_tables_dérivées(self, session: SASession, models: Mapping[str, Type[DeclarativeMeta]]) -> None:
+        """
+        Met à jour, dans la transaction qui enregistre l'état de l'ingestion, les tables construites
+        à partir des tables chargées. Après un remplacement par des tables fantômes, cette transaction suit celle
+        du remplacement, déjà validée. Aucune par défaut : les chargeurs concernés redéfinissent cette méthode
+        """
+
+    def _valeurs_de_partition(self, model: Type[DeclarativeMeta]) -> dict[str, int]:
+        """
+        Colonne de partitionnement de la table et sa valeur pour toutes les lignes de l'archive
+        """
+        colonne = colonne_de_partition(model.__table__)
+        return {colonne: self.legislature} if colonne is not None else {}
+
+    def _créer_partitions(self, session: SASession, models: Mapping[str, Type[DeclarativeMeta]]) -> None:
+        créées = False
+        for model in models.values():
+            if colonne_de_partition(model.__table__) is not None:
+                créer_partition_si_absente(session, model.__table__, self.legislature)
+                créées = True
+        if créées:
+            # Transaction courte : la table partitionnée n'est pas verrouillée pendant toute la mise à jour
+            session.commit()
+
+    def _table_cible(self, model: Type[DeclarativeMeta]) -> Table:
+        """
+        Table dans laquelle les lignes sont écrites : la table fantôme pendant un rafraîchissement complet
+        """
+        ombre = self._tables_ombre.get(model.__table__.name)
+        return ombre.table if ombre is not None else model.__table__
+
+    def _créer_tables_ombre(self, session: SASession, models: Mapping[str, Type[DeclarativeMeta]]) -> None:
+        for nom_dossier, model in models.items():
+            if self._rafraichissement(nom_dossier) != "ombre":
+                continue
+            ombre = créer_table_ombre(session, model.__table__, self.legislature)
+            self._tables_ombre[model.__table__.name] = ombre
+            logger.info("Rafraîchissement complet de '%s' dans la table fantôme %s", nom_dossier, ombre.nom)
+
+    def _finaliser_tables_ombre(
+        self,
+        session: SASession,
+        models: Mapping[str, Type[DeclarativeMeta]],
+        totaux: Mapping[str, CompteursEnregistrement],
+    ) -> dict[str, CompteursEnregistrement]:
+        """
+        Vérifie chaque table fantôme avant le remplacement, construit ses index et retourne
+        les compteurs calculés par comparaison avec la table d'origine
+        """
+        compteurs: dict[str, CompteursEnregistrement] = {}
+
+        for nom_dossier, model in models.items():
+            ombre = self._tables_ombre.get(model.__table__.name)
+            if ombre is None:
+                continue
+
+            # Chaque uid distinct lu dans l'archive a été inséré une fois dans la table fantôme, initialement vide
+            nombre_de_lignes = compter_lignes(session, ombre.nom)
+            if nombre_de_lignes == 0 or nombre_de_lignes != totaux[nom_dossier].insérés:
+                raise MiseAJourStockException(
+                    f"Table fantôme {ombre.nom} incohérente : {nombre_de_lignes} ligne(s) pour {totaux[nom_dossier].insérés} uid lu(s)"
+                )
+
+            comparaison = comparer_à_la_table_d_origine(session, ombre)
+            nombre_de_lignes_actuel = comparaison.mis_à_jour + comparaison.inchangés + comparaison.supprimés
+            if comparaison.supprimés > settings.stockage_ombre_taux_suppression_max * nombre_de_lignes_actuel:
+                # Une archive tronquée en amont ne doit pas vider la table
+                raise MiseAJourStockException(
+                    f"'{nom_dossier}' : {comparaison.supprimés} ligne(s) sur {nombre_de_lignes_actuel} absente(s) de l'archive, "
+                    f"au-delà du taux de suppression autorisé ({settings.stockage_ombre_taux_suppression_max:.0%})"
+                )
+
+            conserver_dates_de_mise_à_jour(session, ombre)
+            construire_index(session, ombre)
+
+            compteurs[nom_dossier] = CompteursEnregistrement(
+                insérés=comparaison.insérés,
+                mis_à_jour=comparaison.mis_à_jour,
+                inchangés=comparaison.inchangés,
+                supprimés=comparaison.supprimés,
+            )
+            logger.info(
+                "'%s' : table fantôme prête (%s ligne(s), %s supprimée(s) par rapport à la table actuelle)",
+                nom_dossier, nombre_de_lignes, comparaison.supprimés,
+            )
+
+        return compteurs
+
+    def _remplacer_par_les_tables_ombre(self, session: SASession) -> None:
+        for ombre in self._tables_ombre.values():
+            remplacer_par_la_table_ombre(session, ombre, settings.stockage_ombre_delai_verrou)
+            logger.info("Table %s remplacée par %s", ombre.nom_table, ombre.nom)
+
+    def _supprimer_tables_ombre(self, session: SASession) -> None:
+        if not self._tables_ombre:
+            return
+        try:
+            for ombre in self._tables_ombre.values():
+                supprimer_table_ombre(session, ombre)
+            session.commit()
+        except SQLAlchemyError:
+            session.rollback()
+            logger.exception("Suppression des tables fantômes de '%s' échouée", self.nom_dossier)
+
+    def _mettre_a_jour(self, extraire: bool = True) -> bool:
+        """
+        Retourne False si l'archive distante est inchangée (aucune donnée à enregistrer)
+        """
         try:
             logger.debug("Mise à jour du dossier %s", self.dossier_dezippé)
-            self._telecharger_dossier_zip()
-            return self._dezipper_fichiers()
+            with self.mesures.chronométrer("téléchargement"):
+                if not self._telecharger_dossier_zip():
+                    return False
+            if extraire and not settings.stockage_lecture_zip_directe:
+                with self.mesures.chronométrer("extraction"):
+                    self._dezipper_fichiers()
+            # Sinon les fichiers seront lus directement depuis l'archive : aucune extraction sur disque
+            return True
         except Exception as e:
             logger.error("Erreur lors de la mise à jour des données : %s", e, exc_info=True)
             raise MiseAJourStockException("Impossible de récupérer les données à jour du dossier %s", self.dossier_dezippé) from e
@@ -87,58 +368,246 @@ class _BaseStockage(_BaseConnexionBdd):
         session: SASession, 
         model: Type[DeclarativeMeta],
         batch_size: int = 1000,
-    ) -> int:
+    ) -> CompteursEnregistrement:
         """
         Lit tous les fichiers .json d'un dossier, extrait (uid:str, payload:dict) et met à jour ou créé en base.
         'model' est l'ORM cible (Document, Acteur, Organe, ...).
         Le traitement est fait en mode batch
         """
-        compteur_total = 0
-        batch = []
+        models = {self.nom_dossier: model}
+        fichiers = self.mesures.chronométrer_itération(self._lire_dans_le_dossier_dezippé(), "lecture_et_décodage")
+        return self._enregistrer_payloads(session, models, fichiers, batch_size)[self.nom_dossier]
 
-        for fichier in self._itérer_dans_le_dossier_dezippé():
-            try:
-                with fichier.open("r", encoding="utf-8") as contenu:
-                    payload: dict = json.load(contenu)
-            except (json.JSONDecodeError, OSError, ValueError):
-                logger.exception("JSON illisible/invalide: %s", fichier)
-                continue
+    def _enregistrer_depuis_zip(
+        self, 
+        session: SASession, 
+        model: Type[DeclarativeMeta],
+        batch_size: int = 1000,
+    ) -> CompteursEnregistrement:
+        """
+        Lit les fichiers .json directement dans l'archive '.zip' (sans extraction sur disque),
+        extrait (uid:str, payload:dict) et met à jour ou créé en base.
+        Le traitement est fait en mode batch
+        """
+        return self._enregistrer_depuis_zip_par_dossier(session, {self.nom_dossier: model}, batch_size)[self.nom_dossier]
+
+    def _enregistrer_depuis_zip_par_dossier(
+        self, 
+        session: SASession, 
+        models: Mapping[str, Type[DeclarativeMeta]],
+        batch_size: int = 1000,
+        reprendre_après: str | None = None,
+    ) -> dict[str, CompteursEnregistrement]:
+        """
+        Parcourt l'archive '.zip' une seule fois et oriente chaque fichier 'json/<nom_dossier>/*.json'
+        vers l'ORM correspondant, ex : {"acteur": Acteur, "organe": Organe}.
+        'reprendre_après' : nom du dernier fichier déjà enregistré lors d'une mise à jour interrompue.
+        Retourne le nombre de fichiers enregistrés par dossier
+        """
+        fichiers = self._lire_dans_le_zip(models, reprendre_après)
+
+        if settings.stockage_taille_file_pipeline > 0:
+            # La lecture et le décodage de l'archive se poursuivent pendant l'écriture des batches en base
+            fichiers = en_arrière_plan(
+                fichiers,
+                taille_file=settings.stockage_taille_file_pipeline,
+                taille_paquet=batch_size,
+                nom=f"stockage-lecture-{self.nom_dossier}",
+            )
+
+        return self._enregistrer_payloads(session, models, fichiers, batch_size)
+
+    def _enregistrer_payloads(
+        self, 
+        session: SASession, 
+        models: Mapping[str, Type[DeclarativeMeta]],
+        fichiers: Iterable[FichierDécodé],
+        batch_size: int = 1000,
+    ) -> dict[str, CompteursEnregistrement]:
+        if self.nombre_écrivains > 1:
+            return self._enregistrer_payloads_en_parallèle(models, fichiers, batch_size)
 
-            uid = self._extraire_uid(payload)
+        compteurs: dict[str, CompteursEnregistrement] = {nom_dossier: CompteursEnregistrement() for nom_dossier in models}
+        batches: dict[str, list[dict]] = {nom_dossier: [] for nom_dossier in models}
 
+        for nom_dossier, nom_fichier, uid, payload, payload_hash in fichiers:
+            self.mesures.ajouter_fichier(sans_uid=not uid)
             if not uid:
-                # FIXME Logger le nom du fichier, etc...
+                logger.debug("Fichier sans uid ignoré : %s", nom_fichier)
                 continue
 
-            batch.append({"uid": uid, "payload": payload.get(self.nom_dossier)})
+            batch = batches[nom_dossier]
+            batch.append(self._ligne(nom_dossier, uid, payload, payload_hash))
 
             if len(batch) >= batch_size:
-                try:
-                    self._creer_ou_mettre_à_jour_en_base(session, batch, model)
-                except SQLAlchemyError:
-                    logger.exception("Erreur SQL lors de l'enregistrement du batch contenant le fichier %s", fichier)
-                    raise
-                batch.clear()
+                if self.validation_par_batch:
+                    # Tous les fichiers lus jusqu'ici sont enregistrés avant la validation :
+                    # le point de reprise délimite exactement la partie de l'archive déjà en base
+                    self._enregistrer_batches(session, models, batches, compteurs)
+                    self._fusionner_tables_de_transit(session, models, compteurs)
+                    self._valider_point_de_reprise(session, nom_fichier)
+                else:
+                    try:
+                        compteurs[nom_dossier] += self._enregistrer_batch(session, batch, models[nom_dossier], nom_dossier)
+                    except SQLAlchemyError:
+                        logger.exception("Erreur SQL lors de l'enregistrement du batch contenant le fichier %s", nom_fichier)
+                        raise
+                    batch.clear()
+                self._signaler_progression(compteurs)
+
+        self._enregistrer_batches(session, models, batches, compteurs)
+        self._fusionner_tables_de_transit(session, models, compteurs)
+
+        self._signaler_progression(compteurs)
+
+        for nom_dossier, compteur in compteurs.items():
+            logger.info(
+                "'%s' : %s créé(s), %s mis à jour, %s inchangé(s)",
+                nom_dossier, compteur.insérés, compteur.mis_à_jour, compteur.inchangés,
+            )
+
+        return compteurs
+
+    def _enregistrer_payloads_en_parallèle(
+        self,
+        models: Mapping[str, Type[DeclarativeMeta]],
+        fichiers: Iterable[FichierDécodé],
+        batch_size: int = 1000,
+    ) -> dict[str, CompteursEnregistrement]:
+        """
+        Variante de '_enregistrer_payloads' où les batches sont écrits par plusieurs connexions en parallèle,
+        chaque uid étant toujours confié à la même connexion. Chaque connexion fusionne ses propres tables de transit
+        """
+        def _fusionner(session: SASession) -> dict[str, CompteursEnregistrement]:
+            compteurs_fusion = {nom_dossier: CompteursEnregistrement() for nom_dossier in models}
+            self._fusionner_tables_de_transit(session, models, compteurs_fusion)
+            return compteurs_fusion
+
+        logger.debug("Enregistrement de '%s' sur %s connexions", ", ".join(models), self.nombre_écrivains)
+
+        with ÉcrivainsParallèles(
+            self.SessionLocal,
+            self.nombre_écrivains,
+            batch_size,
+            écrire=lambda session, nom_dossier, lignes: self._enregistrer_batch(session, lignes, models[nom_dossier], nom_dossier),
+            initial=CompteursEnregistrement,
+            finaliser=_fusionner,
+            politique=settings.stockage_validation_ecrivains,
+            nom=f"stockage-ecrivain-{self.nom_dossier}",
+        ) as écrivains:
+            for nom_dossier, nom_fichier, uid, payload, payload_hash in fichiers:
+                self.mesures.ajouter_fichier(sans_uid=not uid)
+                if not uid:
+                    logger.debug("Fichier sans uid ignoré : %s", nom_fichier)
+                    continue
+                if écrivains.ajouter(nom_dossier, self._ligne(nom_dossier, uid, payload, payload_hash)):
+                    self._signaler_progression(écrivains.résultats())
+
+            résultats = écrivains.terminer()
 
-            compteur_total += 1
+        compteurs = {nom_dossier: résultats.get(nom_dossier, CompteursEnregistrement()) for nom_dossier in models}
+        self._signaler_progression(compteurs)
 
-        if batch:
+        for nom_dossier, compteur in compteurs.items():
+            logger.info(
+                "'%s' : %s créé(s), %s mis à jour, %s inchangé(s)",
+                nom_dossier, compteur.insérés, compteur.mis_à_jour, compteur.inchangés,
+            )
+
+        return compteurs
+
+    def _enregistrer_batches(
+        self,
+        session: SASession,
+        models: Mapping[str, Type[DeclarativeMeta]],
+        batches: Mapping[str, list[dict]],
+        compteurs: dict[str, CompteursEnregistrement],
+    ) -> None:
+        for nom_dossier, batch in batches.items():
+            if not batch:
+                continue
+            try:
+                compteurs[nom_dossier] += self._enregistrer_batch(session, batch, models[nom_dossier], nom_dossier)
+            except SQLAlchemyError:
+                logger.exception("Erreur SQL lors de l'enregistrement du batch '%s'", nom_dossier)
+                raise
+            batch.clear()
+
+    def _fusionner_tables_de_transit(
+        self,
+        session: SASession,
+        models: Mapping[str, Type[DeclarativeMeta]],
+        compteurs: dict[str, CompteursEnregistrement],
+    ) -> None:
+        for nom_dossier, model in models.items():
+            if self._chargeur(nom_dossier) != "copy":
+                continue
             try:
-                self._creer_ou_mettre_à_jour_en_base(session, batch, model)
+                with self.mesures.chronométrer("fusion"):
+                    compteurs[nom_dossier] += self._fusionner_table_de_transit(session, model)
             except SQLAlchemyError:
-                logger.exception("Erreur SQL lors de l'enregistrement du dernier batch")
+                logger.exception("Erreur SQL lors de la fusion de la table de transit '%s'", nom_dossier)
                 raise
 
-        return compteur_total
+    def _signaler_progression(self, compteurs: Mapping[str, CompteursEnregistrement]) -> None:
+        if self.suivi is None:
+            return
+        try:
+            self.suivi(sum(compteur.total for compteur in compteurs.values()))
+        except Exception:
+            # Le suivi ne doit jamais interrompre une mise à jour
+            logger.exception("Erreur lors du signalement de la progression de '%s'", self.nom_dossier)
 
-    def _telecharger_dossier_zip(self):
+    def _telecharger_dossier_zip(self) -> bool:
+        """
+        Télécharge l'archive si elle a changé depuis la dernière mise à jour (ETag / Last-Modified, puis sha256).
+        Retourne False si l'archive distante est inchangée
+        """
         self.chemin_zip.parent.mkdir(parents=True, exist_ok=True)
 
+        état_précédent = None if self.forcer else self._lire_etat_ingestion()
+
+        if self.fichier_local is not None:
+            return self._utiliser_fichier_local(état_précédent)
+
         logger.debug("Téléchargement du dossier '.zip' vers : %s", self.chemin_zip)
 
-        chemin_temporaire = self._telecharger_dans_un_chemin_temporaire(self.chemin_zip)
+        chemin_temporaire, archive = self._telecharger_dans_un_chemin_temporaire(self.chemin_zip, état_précédent)
+
+        if archive is None:
+            logger.info("Archive %s non modifiée (304 Not Modified)", self.url)
+            return False
+
+        self._archive_téléchargée = archive
+        self.mesures.octets_archive = archive.content_length
+
+        if état_précédent is not None and état_précédent.sha256 == archive.sha256:
+            chemin_temporaire.unlink(missing_ok=True)
+            logger.info("Archive %s identique à la précédente (sha256=%s)", self.url, archive.sha256)
+            # Les nouveaux ETag / Last-Modified permettront d'obtenir un 304 la prochaine fois
+            self._enregistrer_etat_ingestion()
+            return False
+
         chemin_temporaire.replace(self.chemin_zip)
+        return True
     
+    def _utiliser_fichier_local(self, état_précédent: EtatIngestion | None) -> bool:
+        """
+        L'archive locale est lue sur place. Comme pour un téléchargement, elle n'est pas retraitée
+        si son sha256 est celui de la dernière archive enregistrée
+        """
+        archive = décrire_archive_locale(self.fichier_local)
+        self.mesures.octets_archive = archive.content_length
+        logger.info("Lecture de l'archive locale %s (%s octets)", self.fichier_local, archive.content_length)
+
+        if état_précédent is not None and état_précédent.sha256 == archive.sha256:
+            logger.info("Archive %s identique à la précédente (sha256=%s)", self.fichier_local, archive.sha256)
+            return False
+
+        self._archive_téléchargée = archive
+        self.chemin_zip = self.fichier_local
+        return True
+
     def _dezipper_fichiers(self) -> list[Path]:
         prefixe = "json/" + self.nom_dossier + "/"
         self.dossier_dezippé.mkdir(parents=True, exist_ok=True)
@@ -166,21 +635,221 @@ class _BaseStockage(_BaseConnexionBdd):
         
         return fichiers_extraits
     
-    def _telecharger_dans_un_chemin_temporaire(self, destination: Path) -> Path:
-        with tempfile.NamedTemporaryFile(dir=destination.parent, delete=False) as tmp:
-            chemin_temporaire = Path(tmp.name)
-            logger.debug("Ecriture du dossier '.zip' %s dans un chemin temporaire : %s", self.nom_dossier, chemin_temporaire)
-            self._executer_requete_telechargement_dossier_zip(tmp)
-        return chemin_temporaire
-
-    def _executer_requete_telechargement_dossier_zip(self, tmp: BinaryIO):
-        with requests.get(self.url, stream=True, timeout=(5, 30)) as reponse:
-            logger.debug("Requête de téléchargement du dossier '.zip' %s : %s %s", self.nom_dossier, reponse.request.method, reponse.url)
-            reponse.raise_for_status()
-            for chunk in reponse.iter_content(chunk_size=256 * 1024):
-                if chunk:
-                    tmp.write(chunk)
+    def _telecharger_dans_un_chemin_temporaire(
+        self,
+        destination: Path,
+        état_précédent: EtatIngestion | None = None,
+    ) -> tuple[Path | None, ArchiveTéléchargée | None]:
+        """
+        Retourne (None, None) si le serveur indique que l'archive n'a pas été modifiée (304).
+        Le fichier partiel est conservé en cas d'échec : la prochaine tentative reprend là où elle s'était arrêtée
+        """
+        logger.debug("Ecriture du dossier '.zip' %s dans un fichier partiel à côté de %s", self.nom_dossier, destination)
+        return telecharger_avec_reprise(
+            self.url,
+            destination,
+            self._entêtes_conditionnelles(état_précédent),
+            nombre_tentatives=settings.telechargement_nombre_tentatives,
+            délai_initial=settings.telechargement_delai_initial,
+        )
+
+    @staticmethod
+    def _entêtes_conditionnelles(état_précédent: EtatIngestion | None) -> dict[str, str]:
+        entêtes: dict[str, str] = {}
+        if état_précédent is not None:
+            if état_précédent.etag:
+                entêtes["If-None-Match"] = état_précédent.etag
+            if état_précédent.last_modified:
+                entêtes["If-Modified-Since"] = état_précédent.last_modified
+        return entêtes
+
+    def _enregistrer_mesures(self) -> None:
+        """
+        Mémorise les mesures de la mise à jour (réussie ou non) dans sa propre transaction
+        """
+        try:
+            with self.SessionLocal() as session:
+                query = pg_insert(EtatIngestion).values(
+                    dataset=self.nom_dossier, legislature=self.legislature, url=self.url, metrics=self.mesures.en_dict(),
+                )
+                query = query.on_conflict_do_update(
+                    index_elements=[EtatIngestion.dataset, EtatIngestion.legislature],
+                    set_={"metrics": query.excluded.metrics},
+                )
+                session.execute(query)
+                session.commit()
+        except Exception:
+            # Les mesures ne doivent jamais faire échouer une mise à jour
+            logger.exception("Enregistrement des mesures de '%s' échoué", self.nom_dossier)
+
+    def _lire_etat_ingestion(self) -> EtatIngestion | None:
+        with self.SessionLocal() as session:
+            return session.get(EtatIngestion, (self.nom_dossier, self.legislature))
+
+    def _lire_point_de_reprise(self) -> str | None:
+        """
+        Retourne le dernier fichier enregistré par une mise à jour interrompue de la même archive, s'il existe
+        """
+        archive = self._archive_téléchargée
+        if self.forcer or archive is None:
+            return None
+
+        état = self._lire_etat_ingestion()
+        if état is None or not état.checkpoint_member or état.checkpoint_sha256 != archive.sha256:
+            return None
+
+        logger.info("Reprise de la mise à jour de '%s' après le fichier %s", self.nom_dossier, état.checkpoint_member)
+        return état.checkpoint_member
+
+    def _valider_point_de_reprise(self, session: SASession, dernier_fichier: str) -> None:
+        """
+        Mémorise le dernier fichier enregistré et valide la transaction en cours avec les données du batch
+        """
+        archive = self._archive_téléchargée
+        if archive is not None:
+            query = pg_insert(EtatIngestion).values(
+                dataset=self.nom_dossier,
+                legislature=self.legislature,
+                url=self.url,
+                checkpoint_sha256=archive.sha256,
+                checkpoint_member=dernier_fichier,
+                checkpoint_at=func.now(),
+            )
+            query = query.on_conflict_do_update(
+                index_elements=[EtatIngestion.dataset, EtatIngestion.legislature],
+                set_={
+                    "checkpoint_sha256": query.excluded.checkpoint_sha256,
+                    "checkpoint_member": query.excluded.checkpoint_member,
+                    "checkpoint_at": query.excluded.checkpoint_at,
+                },
+            )
+            session.execute(query)
+
+        session.commit()
+        logger.debug("Point de reprise de '%s' validé : %s", self.nom_dossier, dernier_fichier)
+
+    def _enregistrer_etat_ingestion(self, session: SASession | None = None) -> None:
+        """
+        Mémorise les métadonnées de la dernière archive téléchargée (et efface le point de reprise).
+        Sans session fournie, l'état est enregistré dans sa propre transaction
+        """
+        archive = self._archive_téléchargée
+        if archive is None:
+            return
+
+        if session is None:
+            with self.SessionLocal() as nouvelle_session:
+                self._enregistrer_etat_ingestion(nouvelle_session)
+                nouvelle_session.commit()
+            return
+
+        query = pg_insert(EtatIngestion).values(
+            dataset=self.nom_dossier,
+            legislature=self.legislature,
+            url=self.url,
+            etag=archive.etag,
+            last_modified=archive.last_modified,
+            content_length=archive.content_length,
+            sha256=archive.sha256,
+            checkpoint_sha256=None,
+            checkpoint_member=None,
+            checkpoint_at=None,
+        )
+        query = query.on_conflict_do_update(
+            index_elements=[EtatIngestion.dataset, EtatIngestion.legislature],
+            set_={
+                "url": query.excluded.url,
+                "etag": query.excluded.etag,
+                "last_modified": query.excluded.last_modified,
+                "content_length": query.excluded.content_length,
+                "sha256": query.excluded.sha256,
+                "checkpoint_sha256": None,
+                "checkpoint_member": None,
+                "checkpoint_at": None,
+                "updated_at": func.now(),
+            }
+        )
+        session.execute(query)
     
+    def _lire_dans_le_dossier_dezippé(self) -> Iterator[FichierDécodé]:
+        for fichier in self._itérer_dans_le_dossier_dezippé():
+            try:
+                with fichier.open("r", encoding="utf-8") as contenu:
+                    payload: dict = json.load(contenu)
+            except (json.JSONDecodeError, OSError, ValueError):
+                logger.exception("JSON illisible/invalide: %s", fichier)
+                continue
+
+            yield préparer_fichier(self.nom_dossier, str(fichier), payload)
+
+    def _lire_dans_le_zip(
+        self,
+        noms_dossiers: Iterable[str] | None = None,
+        reprendre_après: str | None = None,
+    ) -> Iterator[FichierDécodé]:
+        """
+        Décode chaque fichier 'json/<nom_dossier>/*.json' de l'archive, dans l'ordre de l'archive.
+        Avec 'reprendre_après', les fichiers jusqu'à celui-ci inclus sont ignorés sans être lus.
+        Au-delà d'un certain nombre de fichiers, le décodage JSON est réparti sur plusieurs processus
+        """
+        prefixes = {"json/" + nom_dossier + "/": nom_dossier for nom_dossier in (noms_dossiers or [self.nom_dossier])}
+        logger.debug("Lecture des fichiers '%s' directement depuis %s", ", ".join(prefixes), self.chemin_zip)
+
+        with zipfile.ZipFile(self.chemin_zip, "r") as fichier_zip:
+            membres = [
+                (nom_dossier, info)
+                for info in fichier_zip.infolist()
+                if not info.is_dir() and info.filename.endswith(".json")
+                and (nom_dossier := self._nom_dossier_du_fichier(info.filename, prefixes)) is not None
+            ]
+
+            if reprendre_après is not None:
+                membres = self._membres_après(membres, reprendre_après)
+
+            nombre_processus = settings.stockage_processus_decodage
+            if len(membres) < settings.stockage_seuil_decodage_parallele:
+                nombre_processus = 1
+
+            contenus = self.mesures.chronométrer_itération(self._lire_contenus_du_zip(fichier_zip, membres), "lecture")
+            yield from self.mesures.chronométrer_itération(
+                décoder_fichiers(contenus, nombre_processus=nombre_processus, taille_lot=settings.stockage_taille_lot_decodage),
+                "lecture_et_décodage",
+            )
+
+    @staticmethod
+    def _lire_contenus_du_zip(
+        fichier_zip: zipfile.ZipFile,
+        membres: Iterable[tuple[str, zipfile.ZipInfo]],
+    ) -> Iterator[tuple[str, str, bytes]]:
+        for nom_dossier, info in membres:
+            try:
+                contenu = fichier_zip.read(info)
+            except zipfile.BadZipFile:
+                logger.exception("Fichier illisible dans l'archive : %s", info.filename)
+                continue
+
+            yield nom_dossier, info.filename, contenu
+
+    @staticmethod
+    def _membres_après(
+        membres: list[tuple[str, zipfile.ZipInfo]],
+        reprendre_après: str,
+    ) -> list[tuple[str, zipfile.ZipInfo]]:
+        for position, (_, info) in enumerate(membres):
+            if info.filename == reprendre_après:
+                logger.info("%s fichier(s) déjà enregistré(s) ignoré(s)", position + 1)
+                return membres[position + 1:]
+
+        logger.warning("Point de reprise %s absent de l'archive : lecture complète", reprendre_après)
+        return membres
+
+    @staticmethod
+    def _nom_dossier_du_fichier(nom_fichier: str, prefixes: Mapping[str, str]) -> str | None:
+        for prefixe, nom_dossier in prefixes.items():
+            if nom_fichier.startswith(prefixe):
+                return nom_dossier
+        return None
+
     def _itérer_dans_le_dossier_dezippé(self) -> Iterator[Path] :
         if not self.dossier_dezippé.exists():
             # FIXME faire des contrôles en amont ou lever une exception ici si le dossier n'existe pas
@@ -190,43 +859,167 @@ class _BaseStockage(_BaseConnexionBdd):
         # yield : permet de traiter les fichiers en flux continue (méthode utilisée en mode batch)
         yield from (fichier for fichier in self.dossier_dezippé.rglob("*.json") if fichier.is_file())
 
-    def _creer_ou_mettre_à_jour_en_base(
+    def _chargeur(self, nom_dossier: str) -> str:
+        return settings.stockage_chargeur_par_dataset.get(nom_dossier, "insert")
+
+    def _enregistrer_batch(
+        self, 
+        session: SASession, 
+        lignes: list[dict], 
+        model: Type[DeclarativeMeta],
+        nom_dossier: str,
+    ) -> CompteursEnregistrement:
+        début = time.perf_counter()
+        try:
+            if self._chargeur(nom_dossier) == "copy":
+                # Les lignes sont fusionnées avec la table cible en une seule fois, à la fin du parcours de l'archive
+                self._copier_dans_table_de_transit(session, lignes, model)
+                return CompteursEnregistrement()
+            return self._creer_ou_mettre_à_jour_en_base(session, lignes, model)
+        finally:
+            self.mesures.ajouter_batch(len(lignes), time.perf_counter() - début)
+
+    def _copier_dans_table_de_transit(
         self, 
         session: SASession, 
         lignes: Iterable[Mapping[str, object]], 
         model: Type[DeclarativeMeta]
     ) -> None:
+        """
+        Envoie les lignes via 'COPY ... FROM STDIN' dans une table temporaire (non journalisée),
+        sans passer par la compilation SQL d'une énorme clause VALUES
+        """
+        table_de_transit = self._nom_table_de_transit(model)
+        colonnes_dérivées = [model.__table__.c[nom] for nom in self._noms_colonnes_dérivées(model)]
+        définitions_dérivées = "".join(
+            f", {colonne.name} {colonne.type.compile(dialect=session.get_bind().dialect)}" for colonne in colonnes_dérivées
+        )
+
+        # position : conserve l'ordre de lecture pour que le dernier fichier d'un même uid l'emporte lors de la fusion
+        session.execute(text(
+            f"CREATE TEMPORARY TABLE IF NOT EXISTS {table_de_transit} "
+            f"(position bigserial, uid text NOT NULL, payload jsonb NOT NULL, payload_hash text{définitions_dérivées}) "
+            "ON COMMIT DROP"
+        ))
+
+        tampon = io.StringIO()
+        écrivain = csv.writer(tampon)
+        for ligne in lignes:
+            # Une valeur absente est écrite vide, lue comme NULL par COPY
+            écrivain.writerow((
+                ligne["uid"],
+                json.dumps(ligne["payload"], ensure_ascii=False, separators=(",", ":")),
+                ligne["payload_hash"],
+                *(ligne.get(colonne.name) for colonne in colonnes_dérivées),
+            ))
+        tampon.seek(0)
+
+        colonnes = ", ".join(["uid", "payload", "payload_hash", *(colonne.name for colonne in colonnes_dérivées)])
+        connexion_dbapi = session.connection().connection.driver_connection
+        with connexion_dbapi.cursor() as curseur:
+            curseur.copy_expert(
+                f"COPY {table_de_transit} ({colonnes}) FROM STDIN WITH (FORMAT csv)",
+                tampon,
+            )
+
+    def _fusionner_table_de_transit(
+        self, 
+        session: SASession, 
+        model: Type[DeclarativeMeta]
+    ) -> CompteursEnregistrement:
+        """
+        Fusionne la table de transit dans la table cible en un seul 'INSERT ... SELECT ... ON CONFLICT'.
+        Comme pour l'insertion par batch, les lignes dont l'empreinte est inchangée ne sont pas réécrites
+        """
+        table = self._table_cible(model).name
+        table_de_transit = self._nom_table_de_transit(model)
+        # Colonnes de partitionnement : même valeur pour toute l'archive, ajoutées lors de la fusion
+        valeurs_de_partition = self._valeurs_de_partition(model)
+        colonnes_de_partition = "".join(f", {colonne}" for colonne in valeurs_de_partition)
+        paramètres_de_partition = "".join(f", :{colonne}" for colonne in valeurs_de_partition)
+        clé_primaire = ", ".join(colonne.name for colonne in model.__table__.primary_key.columns)
+        noms_colonnes_dérivées = self._noms_colonnes_dérivées(model)
+        colonnes_dérivées = "".join(f", {nom}" for nom in noms_colonnes_dérivées)
+        mises_à_jour_dérivées = "".join(f"{nom} = excluded.{nom},\n                        " for nom in noms_colonnes_dérivées)
+
+        existe = session.execute(text("SELECT to_regclass(:table_de_transit)"), {"table_de_transit": f"pg_temp.{table_de_transit}"}).scalar()
+        if existe is None:
+            return CompteursEnregistrement()
+
+        insérés, mis_à_jour, distincts = session.execute(text(f"""
+            WITH fusion AS (
+                INSERT INTO {table} (uid, payload, payload_hash{colonnes_dérivées}{colonnes_de_partition})
+                SELECT DISTINCT ON (uid) uid, payload, payload_hash{colonnes_dérivées}{paramètres_de_partition}
+                FROM {table_de_transit}
+                ORDER BY uid, position DESC
+                ON CONFLICT ({clé_primaire}) DO UPDATE
+                    SET payload = excluded.payload,
+                        payload_hash = excluded.payload_hash,
+                        {mises_à_jour_dérivées}updated_at = now()
+                    WHERE {table}.payload_hash IS DISTINCT FROM excluded.payload_hash
+                RETURNING xmax = 0 AS inseree
+            )
+            SELECT
+                count(*) FILTER (WHERE inseree),
+                count(*) FILTER (WHERE NOT inseree),
+                (SELECT count(DISTINCT uid) FROM {table_de_transit})
+            FROM fusion
+        """), valeurs_de_partition).one()
+
+        session.execute(text(f"DROP TABLE {table_de_transit}"))
+
+        return CompteursEnregistrement(
+            insérés=insérés,
+            mis_à_jour=mis_à_jour,
+            inchangés=distincts - insérés - mis_à_jour,
+        )
+
+    @staticmethod
+    def _nom_table_de_transit(model: Type[DeclarativeMeta]) -> str:
+        return f"transit_{model.__table__.name}"
+
+    def _creer_ou_mettre_à_jour_en_base(
+        self, 
+        session: SASession, 
+        lignes: Iterable[Mapping[str, object]], 
+        model: Type[DeclarativeMeta]
+    ) -> CompteursEnregistrement:
+        """
+        Les lignes dont l'empreinte du payload est identique à celle en base ne sont pas réécrites
+        """
         lignes = list(lignes)
         if not lignes:
-            return
+            return CompteursEnregistrement()
 
-        query = pg_insert(model).values(lignes)
+        table = self._table_cible(model)
+        valeurs_de_partition = self._valeurs_de_partition(model)
+        if valeurs_de_partition:
+            lignes = [{**ligne, **valeurs_de_partition} for ligne in lignes]
+        query = pg_insert(table).values(lignes)
 
         query = query.on_conflict_do_update(
-            index_elements=[model.uid],
+            index_elements=list(table.primary_key.columns),
             set_={
                 "payload": query.excluded.payload,
+                "payload_hash": query.excluded.payload_hash,
+                **{nom: query.excluded[nom] for nom in self._noms_colonnes_dérivées(model)},
                 "updated_at": func.now(),
-            }
+            },
+            where=table.c.payload_hash.is_distinct_from(query.excluded.payload_hash),
         )
 
-        session.execute(query)
+        # xmax = 0 : la ligne vient d'être insérée, sinon elle a été mise à jour.
+        # Les lignes inchangées (filtrées par le WHERE) ne sont pas retournées
+        query = query.returning(literal_column("xmax = 0").label("inseree"))
 
-    def _extraire_uid(self, payload: dict) -> str | None:
-        donnée = payload.get(self.nom_dossier) or {}
-        uid_brut = donnée.get("uid")
+        insertions = session.execute(query).scalars().all()
+        insérés = sum(1 for inseree in insertions if inseree)
 
-        if isinstance(uid_brut, str):
-            return uid_brut.strip() or None
-
-        if isinstance(uid_brut, dict):
-            for clé in ("#text", "text", "value"):
-                valeur = uid_brut.get(clé)
-                if isinstance(valeur, str) and valeur.strip():
-                    return valeur.strip()
-            
-            logger.warning("Le fichier n'a pas d'uid")
-            return None
+        return CompteursEnregistrement(
+            insérés=insérés,
+            mis_à_jour=len(insertions) - insérés,
+            inchangés=len(lignes) - len(insertions),
+        )
 
-        logger.warning("Le fichier n'a pas d'uid")
-        return None
\ No newline at end of file
+    def _extraire_uid(self, payload: dict, nom_dossier: str | None = None) -> str | None:
+        return extraire_uid(payload, nom_dossier or self.nom_dossier)
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import multiprocessing
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+
+class FichierDécodé(NamedTuple):
+    nom_dossier: str
+    nom_fichier: str
+    uid: str | None
+    payload: dict | None
+    payload_hash: str | None
+
+
+def extraire_uid(payload: dict, nom_dossier: str) -> str | None:
+    donnée = payload.get(nom_dossier) or {}
+    uid_brut = donnée.get("uid")
+
+    if isinstance(uid_brut, str):
+        return uid_brut.strip() or None
+
+    if isinstance(uid_brut, dict):
+        for clé in ("#text", "text", "value"):
+            valeur = uid_brut.get(clé)
+            if isinstance(valeur, str) and valeur.strip():
+                return valeur.strip()
+
+        logger.warning("Le fichier n'a pas d'uid")
+        return None
+
+    logger.warning("Le fichier n'a pas d'uid")
+    return None
+
+
+def calculer_empreinte_payload(payload: object) -> str:
+    """
+    Empreinte sha256 d'un payload JSON, indépendante de l'ordre des clés
+    """
+    contenu = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(contenu.encode("utf-8")).hexdigest()
+
+
+def préparer_fichier(nom_dossier: str, nom_fichier: str, payload: dict) -> FichierDécodé:
+    uid = extraire_uid(payload, nom_dossier)
+    if not uid:
+        return FichierDécodé(nom_dossier, nom_fichier, None, None, None)
+
+    donnée = payload.get(nom_dossier)
+    return FichierDécodé(nom_dossier, nom_fichier, uid, donnée, calculer_empreinte_payload(donnée))
+
+
+def décoder_fichier(nom_dossier: str, nom_fichier: str, contenu: bytes) -> FichierDécodé | None:
+    try:
+        payload: dict = json.loads(contenu)
+    except (json.JSONDecodeError, UnicodeDecodeError, ValueError):
+        logger.exception("JSON illisible/invalide: %s", nom_fichier)
+        return None
+
+    return préparer_fichier(nom_dossier, nom_fichier, payload)
+
+
+def décoder_fichiers(
+    fichiers: Iterable[tuple[str, str, bytes]],
+    nombre_processus: int = 1,
+    taille_lot: int = 200,
+) -> Iterator[FichierDécodé]:
+    """
+    Décode (nom_dossier, nom_fichier, contenu) en FichierDécodé, dans l'ordre de lecture.
+    Avec plusieurs processus, les fichiers sont décodés par lots et au plus 2 lots par processus
+    sont en cours à un instant donné : la mémoire reste bornée même pour une très grosse archive
+    """
+    if nombre_processus <= 1:
+        for nom_dossier, nom_fichier, contenu in fichiers:
+            fichier = décoder_fichier(nom_dossier, nom_fichier, contenu)
+            if fichier is not None:
+                yield fichier
+        return
+
+    logger.debug("Décodage JSON sur %s processus (lots de %s fichiers)", nombre_processus, taille_lot)
+
+    # spawn : évite de dupliquer par fork l'état (threads, connexions) du processus web
+    contexte = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=nombre_processus, mp_context=contexte) as executor:
+        en_cours: deque[Future[list[FichierDécodé]]] = deque()
+
+        for lot in _découper_en_lots(fichiers, taille_lot):
+            en_cours.append(executor.submit(_décoder_lot, lot))
+            if len(en_cours) >= 2 * nombre_processus:
+                yield from en_cours.popleft().result()
+
+        while en_cours:
+            yield from en_cours.popleft().result()
+
+
+def _décoder_lot(lot: list[tuple[str, str, bytes]]) -> list[FichierDécodé]:
+    fichiers = (décoder_fichier(nom_dossier, nom_fichier, contenu) for nom_dossier, nom_fichier, contenu in lot)
+    return [fichier for fichier in fichiers if fichier is not None]
+
+
+def _découper_en_lots(
+    fichiers: Iterable[tuple[str, str, bytes]],
+    taille_lot: int,
+) -> Iterator[list[tuple[str, str, bytes]]]:
+    itérateur = iter(fichiers)
+    while lot := list(islice(itérateur, taille_lot)):
+        yield lot
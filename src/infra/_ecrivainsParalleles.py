@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import zlib
+
+from typing import Callable, Generic, Literal, Mapping, TypeVar
+
+from sqlalchemy.orm import Session as SASession
+
+logger = logging.getLogger(__name__)
+
+R = TypeVar("R")
+
+PolitiqueValidation = Literal["tout_ou_rien", "par_ecrivain"]
+
+_FIN = object()
+
+
+class ÉcrivainsParallèles(Generic[R]):
+    """
+    Répartit les lignes à enregistrer entre plusieurs connexions, chacune dans son propre thread.
+    Une ligne est toujours confiée au même écrivain selon l'empreinte de son uid : deux écrivains
+    ne modifient jamais la même ligne et ne peuvent donc pas se bloquer mutuellement.
+
+    Politiques de validation :
+     - 'tout_ou_rien' : les transactions ne sont validées que si tous les écrivains ont réussi
+     - 'par_ecrivain' : chaque écrivain valide sa transaction dès qu'il a terminé, indépendamment des autres
+       (les lignes d'un écrivain en échec sont perdues, l'erreur est relevée à la fin)
+    """
+    def __init__(
+        self,
+        fabrique_session: Callable[[], SASession],
+        nombre: int,
+        taille_batch: int,
+        écrire: Callable[[SASession, str, list[dict]], R],
+        initial: Callable[[], R],
+        finaliser: Callable[[SASession], Mapping[str, R]] | None = None,
+        politique: PolitiqueValidation = "tout_ou_rien",
+        nom: str = "stockage-ecrivain",
+    ) -> None:
+        self._fabrique_session = fabrique_session
+        self._nombre = nombre
+        self._taille_batch = taille_batch
+        self._écrire = écrire
+        self._initial = initial
+        self._finaliser = finaliser
+        self._politique = politique
+
+        self._verrou = threading.Lock()
+        self._arrêt = threading.Event()
+        self._erreur: BaseException | None = None
+        self._résultats: dict[str, R] = {}
+        self._sessions: list[SASession | None] = [None] * nombre
+        self._tampons: list[dict[str, list[dict]]] = [{} for _ in range(nombre)]
+        # Deux batches en attente par écrivain au plus : la lecture de l'archive attend les écrivains les plus lents
+        self._files: list[queue.Queue] = [queue.Queue(maxsize=2) for _ in range(nombre)]
+        self._threads = [
+            threading.Thread(target=self._travailler, args=(écrivain,), name=f"{nom}-{écrivain}", daemon=True)
+            for écrivain in range(nombre)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def __enter__(self) -> ÉcrivainsParallèles[R]:
+        return self
+
+    def __exit__(self, type_exception, exception, trace) -> None:
+        if exception is not None:
+            self._abandonner()
+
+    def ajouter(self, nom_dossier: str, ligne: dict) -> bool:
+        """
+        Confie la ligne à son écrivain. Retourne True si un batch vient d'être transmis
+        """
+        if self._erreur is not None and self._politique == "tout_ou_rien":
+            # Inutile de poursuivre la lecture : rien ne sera validé
+            raise self._erreur
+
+        écrivain = zlib.crc32(str(ligne["uid"]).encode("utf-8")) % self._nombre
+        tampon = self._tampons[écrivain].setdefault(nom_dossier, [])
+        tampon.append(ligne)
+
+        if len(tampon) < self._taille_batch:
+            return False
+
+        self._transmettre(écrivain, (nom_dossier, tampon))
+        self._tampons[écrivain][nom_dossier] = []
+        return True
+
+    def résultats(self) -> dict[str, R]:
+        with self._verrou:
+            return dict(self._résultats)
+
+    def terminer(self) -> dict[str, R]:
+        """
+        Transmet les derniers batches, attend les écrivains puis valide (ou annule) leurs transactions
+        """
+        for écrivain, tampons in enumerate(self._tampons):
+            for nom_dossier, tampon in tampons.items():
+                if tampon:
+                    self._transmettre(écrivain, (nom_dossier, tampon))
+            self._transmettre(écrivain, _FIN)
+
+        for thread in self._threads:
+            thread.join()
+
+        try:
+            if self._erreur is not None:
+                raise self._erreur
+
+            if self._politique == "tout_ou_rien":
+                for session in self._sessions:
+                    if session is not None:
+                        session.commit()
+        finally:
+            self._fermer_sessions()
+
+        return self.résultats()
+
+    # --- Private functions
+
+    def _travailler(self, écrivain: int) -> None:
+        file = self._files[écrivain]
+        fin_reçue = False
+
+        try:
+            session = self._fabrique_session()
+            self._sessions[écrivain] = session
+
+            while (tâche := file.get()) is not _FIN:
+                if self._arrêt.is_set():
+                    continue
+                nom_dossier, lignes = tâche
+                self._accumuler({nom_dossier: self._écrire(session, nom_dossier, lignes)})
+            fin_reçue = True
+
+            if self._arrêt.is_set():
+                return
+
+            if self._finaliser is not None:
+                self._accumuler(self._finaliser(session))
+
+            if self._politique == "par_ecrivain":
+                session.commit()
+        except BaseException as e:
+            logger.exception("Erreur de l'écrivain %s", écrivain)
+            with self._verrou:
+                if self._erreur is None:
+                    self._erreur = e
+            if self._politique == "tout_ou_rien":
+                self._arrêt.set()
+            # Vide la file pour ne pas bloquer la lecture de l'archive (déjà vide si l'échec suit la fin des tâches)
+            if not fin_reçue:
+                while file.get() is not _FIN:
+                    pass
+
+    def _accumuler(self, résultats: Mapping[str, R]) -> None:
+        with self._verrou:
+            for nom_dossier, résultat in résultats.items():
+                self._résultats[nom_dossier] = self._résultats.get(nom_dossier, self._initial()) + résultat
+
+    def _transmettre(self, écrivain: int, tâche: object) -> None:
+        self._files[écrivain].put(tâche)
+
+    def _abandonner(self) -> None:
+        self._arrêt.set()
+        for écrivain in range(self._nombre):
+            self._transmettre(écrivain, _FIN)
+        for thread in self._threads:
+            thread.join()
+        self._fermer_sessions()
+
+    def _fermer_sessions(self) -> None:
+        for session in self._sessions:
+            if session is None:
+                continue
+            try:
+                # Sans effet sur une transaction déjà validée
+                session.rollback()
+                session.close()
+            except Exception:
+                logger.exception("Fermeture d'une session d'écriture échouée")
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import bisect
+import logging
+import sys
+import threading
+import time
+
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, TypeVar
+
+try:
+    import resource
+except ImportError:  # Module indisponible sous Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Bornes supérieures (en millisecondes) des classes de l'histogramme de latence des batches
+BORNES_LATENCE_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class MesuresIngestion:
+    """
+    Mesures d'une mise à jour : durée cumulée de chaque étape, volumes traités, latence des batches
+    et mémoire maximale. Les étapes pouvant se recouvrir (lecture de l'archive pendant l'écriture en base),
+    chaque durée est le temps passé dans l'étape, et non une portion de la durée totale.
+    Les méthodes peuvent être appelées depuis plusieurs threads
+    """
+    def __init__(self) -> None:
+        self._verrou = threading.Lock()
+        self._début = time.perf_counter()
+        self.démarré_le = datetime.now(timezone.utc)
+        self.durées: dict[str, float] = {}
+        self.octets_archive = 0
+        self.fichiers_lus = 0
+        self.fichiers_sans_uid = 0
+        self.lignes_écrites = 0
+        self.batches = 0
+        self.histogramme_batches = [0] * (len(BORNES_LATENCE_MS) + 1)
+
+    @contextmanager
+    def chronométrer(self, étape: str) -> Iterator[None]:
+        début = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.ajouter_durée(étape, time.perf_counter() - début)
+
+    def chronométrer_itération(self, éléments: Iterable[T], étape: str) -> Iterator[T]:
+        """
+        Cumule le temps passé à produire chaque élément (sans le temps passé par l'appelant à le traiter)
+        """
+        itérateur = iter(éléments)
+        try:
+            while True:
+                début = time.perf_counter()
+                try:
+                    élément = next(itérateur)
+                except StopIteration:
+                    return
+                finally:
+                    self.ajouter_durée(étape, time.perf_counter() - début)
+                yield élément
+        finally:
+            fermer = getattr(itérateur, "close", None)
+            if fermer is not None:
+                fermer()
+
+    def ajouter_durée(self, étape: str, durée: float) -> None:
+        with self._verrou:
+            self.durées[étape] = self.durées.get(étape, 0.0) + durée
+
+    def ajouter_fichier(self, sans_uid: bool = False) -> None:
+        with self._verrou:
+            self.fichiers_lus += 1
+            if sans_uid:
+                self.fichiers_sans_uid += 1
+
+    def ajouter_batch(self, lignes: int, durée: float) -> None:
+        with self._verrou:
+            self.batches += 1
+            self.lignes_écrites += lignes
+            self.histogramme_batches[bisect.bisect_left(BORNES_LATENCE_MS, durée * 1000)] += 1
+            self.durées["écriture"] = self.durées.get("écriture", 0.0) + durée
+
+    def en_dict(self) -> dict:
+        with self._verrou:
+            durée_totale = time.perf_counter() - self._début
+            durée_écriture = self.durées.get("écriture", 0.0)
+            durées = dict(self.durées)
+            # 'lecture_et_décodage' inclut la lecture de l'archive : le décodage seul s'en déduit
+            if "lecture_et_décodage" in durées:
+                durées["décodage"] = max(0.0, durées.pop("lecture_et_décodage") - durées.get("lecture", 0.0))
+            libellés = [f"<={borne}ms" for borne in BORNES_LATENCE_MS] + [f">{BORNES_LATENCE_MS[-1]}ms"]
+
+            return {
+                "started_at": self.démarré_le.isoformat(),
+                "duration_s": round(durée_totale, 3),
+                "stages_s": {étape: round(durée, 3) for étape, durée in durées.items()},
+                "archive_bytes": self.octets_archive,
+                "files_scanned": self.fichiers_lus,
+                "files_without_uid": self.fichiers_sans_uid,
+                "rows_written": self.lignes_écrites,
+                "rows_per_s": round(self.lignes_écrites / durée_totale, 1) if durée_totale else None,
+                "rows_per_s_writing": round(self.lignes_écrites / durée_écriture, 1) if durée_écriture else None,
+                "batches": self.batches,
+                "batch_latency_histogram": dict(zip(libellés, self.histogramme_batches)),
+                "peak_rss_mb": _mémoire_maximale_mo(),
+            }
+
+    def journaliser(self, nom: str) -> None:
+        mesures = self.en_dict()
+        logger.info(
+            "Mesures '%s' : %.1fs, %s fichier(s) lu(s) dont %s sans uid, %s ligne(s) écrite(s) (%s lignes/s), "
+            "étapes %s, mémoire max %s Mo",
+            nom, mesures["duration_s"], mesures["files_scanned"], mesures["files_without_uid"],
+            mesures["rows_written"], mesures["rows_per_s"], mesures["stages_s"], mesures["peak_rss_mb"],
+        )
+
+
+def _mémoire_maximale_mo() -> dict[str, float] | None:
+    """
+    Pic de mémoire résidente du processus et de ses processus enfants terminés (décodage parallèle).
+    Il s'agit du maximum depuis le démarrage du processus, pas seulement pendant la mise à jour
+    """
+    if resource is None:
+        return None
+
+    # ru_maxrss est exprimé en kilo-octets sous Linux, en octets sous macOS
+    diviseur = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return {
+        "process": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / diviseur, 1),
+        "children": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / diviseur, 1),
+    }
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import logging
+
+from sqlalchemy import Table, text
+from sqlalchemy.orm import Session as SASession
+
+logger = logging.getLogger(__name__)
+
+
+def colonne_de_partition(table: Table) -> str | None:
+    """
+    Colonne sur laquelle la table est partitionnée par liste (déclarée dans 'info' du modèle), sinon None
+    """
+    return table.info.get("colonne_de_partition")
+
+
+def nom_partition(table: Table, valeur: int) -> str:
+    return f"{table.name}_l{int(valeur)}"
+
+
+def créer_partition_si_absente(session: SASession, table: Table, valeur: int) -> str:
+    """
+    Crée la partition de 'table' recevant 'valeur' si elle n'existe pas encore.
+    La création verrouille la table partitionnée : elle n'est tentée que si la partition est absente
+    """
+    nom = nom_partition(table, valeur)
+    existe = session.execute(text("SELECT to_regclass(:nom)"), {"nom": nom}).scalar()
+    if existe is None:
+        session.execute(text(f"CREATE TABLE IF NOT EXISTS {nom} PARTITION OF {table.name} FOR VALUES IN ({int(valeur)})"))
+        logger.info("Partition %s créée", nom)
+    return nom
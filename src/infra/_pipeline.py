@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+
+from typing import Iterable, Iterator, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_FIN = object()
+
+
+class _Erreur:
+    def __init__(self, exception: BaseException) -> None:
+        self.exception = exception
+
+
+def en_arrière_plan(
+    éléments: Iterable[T],
+    taille_file: int = 8,
+    taille_paquet: int = 100,
+    nom: str = "stockage-lecture",
+) -> Iterator[T]:
+    """
+    Parcourt 'éléments' dans un thread dédié et restitue les éléments dans le même ordre.
+    Le thread producteur (ex : lecture + décodage de l'archive) avance pendant que l'appelant
+    consomme (ex : écriture en base). La file est bornée à 'taille_file' paquets de 'taille_paquet'
+    éléments : si l'appelant est plus lent, le producteur attend (la mémoire reste constante).
+    Une exception levée par le producteur est relevée chez l'appelant
+    """
+    file: queue.Queue = queue.Queue(maxsize=taille_file)
+    arrêt = threading.Event()
+
+    def _déposer(paquet: object) -> bool:
+        while not arrêt.is_set():
+            try:
+                file.put(paquet, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produire() -> None:
+        itérateur = iter(éléments)
+        try:
+            paquet: list[T] = []
+            for élément in itérateur:
+                paquet.append(élément)
+                if len(paquet) >= taille_paquet:
+                    if not _déposer(paquet):
+                        return
+                    paquet = []
+            if paquet and not _déposer(paquet):
+                return
+            _déposer(_FIN)
+        except BaseException as e:
+            _déposer(_Erreur(e))
+        finally:
+            # Libère les ressources du producteur (archive ouverte, processus de décodage...) dans son propre thread
+            fermer = getattr(itérateur, "close", None)
+            if fermer is not None:
+                fermer()
+
+    producteur = threading.Thread(target=_produire, name=nom, daemon=True)
+    producteur.start()
+
+    try:
+        while True:
+            paquet = file.get()
+            if paquet is _FIN:
+                return
+            if isinstance(paquet, _Erreur):
+                raise paquet.exception
+            yield from paquet
+    finally:
+        arrêt.set()
+        producteur.join()
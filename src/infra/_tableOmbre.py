@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import logging
+import re
+
+from dataclasses import dataclass, field
+from typing import NamedTuple
+
+from sqlalchemy import MetaData, Table, text
+from sqlalchemy.orm import Session as SASession
+
+from src.infra._partitions import colonne_de_partition, nom_partition
+
+logger = logging.getLogger(__name__)
+
+_DÉFINITION_INDEX = re.compile(r"^CREATE (UNIQUE )?INDEX \S+ ON (?:ONLY )?\S+ ")
+_LONGUEUR_MAX_IDENTIFIANT = 63
+
+
+class ComparaisonOmbre(NamedTuple):
+    insérés: int
+    mis_à_jour: int
+    inchangés: int
+    supprimés: int
+
+
+@dataclass
+class TableOmbre:
+    """
+    Copie complète d'une table, chargée à l'écart des lectures puis substituée à la table d'origine
+    """
+    nom_table: str
+    table: Table
+    # Nom de l'index sur la table fantôme -> nom de l'index d'origine, rétabli après le remplacement
+    index: dict[str, str] = field(default_factory=dict)
+    # Table partitionnée dont 'nom_table' est la partition recevant 'valeur_partition' (remplacée seule)
+    table_partitionnée: str | None = None
+    valeur_partition: int | None = None
+
+    @property
+    def nom(self) -> str:
+        return self.table.name
+
+
+def créer_table_ombre(session: SASession, table: Table, valeur_partition: int | None = None) -> TableOmbre:
+    """
+    Crée '<table>_ombre' avec les mêmes colonnes (y compris générées) et la seule clé primaire :
+    les autres index sont construits une fois les données chargées.
+    Pour une table partitionnée, seule la partition recevant 'valeur_partition' est rechargée
+    """
+    colonne = colonne_de_partition(table)
+    if colonne is not None and valeur_partition is None:
+        raise ValueError(f"La table {table.name} est partitionnée : la partition à recharger doit être précisée")
+
+    nom_table = nom_partition(table, valeur_partition) if colonne is not None else table.name
+    ombre = TableOmbre(
+        nom_table=nom_table,
+        table=table.to_metadata(MetaData(), name=_nom_ombre(nom_table)),
+        table_partitionnée=table.name if colonne is not None else None,
+        valeur_partition=valeur_partition if colonne is not None else None,
+    )
+
+    session.execute(text(f"DROP TABLE IF EXISTS {ombre.nom}"))
+    session.execute(text(
+        f"CREATE TABLE {ombre.nom} (LIKE {nom_table} INCLUDING DEFAULTS INCLUDING GENERATED INCLUDING STORAGE)"
+    ))
+    # La clé primaire sert d'arbitre à 'ON CONFLICT' pendant le chargement
+    clé_primaire = ", ".join(colonne_clé.name for colonne_clé in table.primary_key.columns)
+    session.execute(text(f"ALTER TABLE {ombre.nom} ADD PRIMARY KEY ({clé_primaire})"))
+    if colonne is not None:
+        # Prouve à 'ATTACH PARTITION' que les lignes respectent la partition, sans parcourir la table sous verrou
+        session.execute(text(
+            f"ALTER TABLE {ombre.nom} ADD CONSTRAINT {_nom_contrainte_partition(ombre)} CHECK ({colonne} = {int(valeur_partition)})"
+        ))
+
+    logger.debug("Table fantôme %s créée", ombre.nom)
+    return ombre
+
+
+def conserver_dates_de_mise_à_jour(session: SASession, ombre: TableOmbre) -> None:
+    """
+    Les lignes dont le payload n'a pas changé gardent la date de mise à jour de la table d'origine
+    """
+    session.execute(text(f"""
+        UPDATE {ombre.nom} AS ombre
+        SET updated_at = origine.updated_at
+        FROM {ombre.nom_table} AS origine
+        WHERE ombre.uid = origine.uid
+          AND ombre.payload_hash IS NOT DISTINCT FROM origine.payload_hash
+    """))
+
+
+def comparer_à_la_table_d_origine(session: SASession, ombre: TableOmbre) -> ComparaisonOmbre:
+    insérés, mis_à_jour, inchangés, supprimés = session.execute(text(f"""
+        SELECT
+            count(*) FILTER (WHERE origine.uid IS NULL),
+            count(*) FILTER (WHERE ombre.uid IS NOT NULL AND origine.uid IS NOT NULL
+                             AND ombre.payload_hash IS DISTINCT FROM origine.payload_hash),
+            count(*) FILTER (WHERE ombre.uid IS NOT NULL AND origine.uid IS NOT NULL
+                             AND ombre.payload_hash IS NOT DISTINCT FROM origine.payload_hash),
+            count(*) FILTER (WHERE ombre.uid IS NULL)
+        FROM {ombre.nom} AS ombre
+        FULL JOIN {ombre.nom_table} AS origine ON origine.uid = ombre.uid
+    """)).one()
+    return ComparaisonOmbre(insérés, mis_à_jour, inchangés, supprimés)
+
+
+def compter_lignes(session: SASession, nom_table: str) -> int:
+    return session.execute(text(f"SELECT count(*) FROM {nom_table}")).scalar_one()
+
+
+def construire_index(session: SASession, ombre: TableOmbre) -> None:
+    """
+    Reproduit sur la table fantôme les index de la table d'origine (hors clé primaire), tels qu'ils
+    existent en base : les index ajoutés par les migrations sont repris sans être déclarés ici
+    """
+    définitions = session.execute(text("""
+        SELECT index.relname, pg_get_indexdef(index.oid)
+        FROM pg_index
+        JOIN pg_class AS index ON index.oid = pg_index.indexrelid
+        WHERE pg_index.indrelid = CAST(:nom_table AS regclass)
+          AND NOT pg_index.indisprimary
+    """), {"nom_table": ombre.nom_table}).all()
+
+    for nom_index, définition in définitions:
+        nom_index_ombre = _nom_ombre(nom_index)
+        session.execute(text(_DÉFINITION_INDEX.sub(
+            lambda correspondance: f"CREATE {correspondance.group(1) or ''}INDEX {nom_index_ombre} ON {ombre.nom} ",
+            définition,
+        )))
+        ombre.index[nom_index_ombre] = nom_index
+
+    session.execute(text(f"ANALYZE {ombre.nom}"))
+    logger.debug("%s index construit(s) sur %s", len(définitions), ombre.nom)
+
+
+def remplacer_par_la_table_ombre(session: SASession, ombre: TableOmbre, délai_verrou: float) -> None:
+    """
+    Substitue la table fantôme à la table d'origine. Le verrou exclusif n'est tenu que le temps des
+    renommages : les lectures en cours terminent sur l'ancienne table, les suivantes lisent la nouvelle.
+    Doit être suivi d'un commit rapide
+    """
+    # Sans délai, une longue lecture en cours bloquerait toutes les lectures suivantes derrière le renommage
+    session.execute(text(f"SET LOCAL lock_timeout = '{int(délai_verrou * 1000)}ms'"))
+
+    if ombre.table_partitionnée is not None:
+        session.execute(text(f"ALTER TABLE {ombre.table_partitionnée} DETACH PARTITION {ombre.nom_table}"))
+    session.execute(text(f"DROP TABLE {ombre.nom_table}"))
+    session.execute(text(f"ALTER TABLE {ombre.nom} RENAME TO {ombre.nom_table}"))
+    session.execute(text(f"ALTER TABLE {ombre.nom_table} RENAME CONSTRAINT {ombre.nom}_pkey TO {ombre.nom_table}_pkey"))
+    for nom_index_ombre, nom_index in ombre.index.items():
+        session.execute(text(f"ALTER INDEX {nom_index_ombre} RENAME TO {nom_index}"))
+
+    if ombre.table_partitionnée is not None:
+        # Les index identiques à ceux de la table partitionnée lui sont rattachés sans être reconstruits
+        session.execute(text(
+            f"ALTER TABLE {ombre.table_partitionnée} ATTACH PARTITION {ombre.nom_table} FOR VALUES IN ({int(ombre.valeur_partition)})"
+        ))
+        session.execute(text(f"ALTER TABLE {ombre.nom_table} DROP CONSTRAINT {_nom_contrainte_partition(ombre)}"))
+
+
+def supprimer_table_ombre(session: SASession, ombre: TableOmbre) -> None:
+    session.execute(text(f"DROP TABLE IF EXISTS {ombre.nom}"))
+
+
+def _nom_contrainte_partition(ombre: TableOmbre) -> str:
+    return f"{ombre.nom}_partition_check"
+
+
+def _nom_ombre(nom: str) -> str:
+    suffixe = "_ombre"
+    return nom[:_LONGUEUR_MAX_IDENTIFIANT - len(suffixe)] + suffixe
@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import random
+import re
+import time
+import zipfile
+
+from dataclasses import dataclass
+from http import HTTPStatus
+from pathlib import Path
+from typing import Mapping
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+_TAILLE_CHUNK = 256 * 1024
+_DÉLAI_MAXIMAL = 60.0
+_CONTENT_RANGE = re.compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
+_CONTENT_RANGE_NON_SATISFAISABLE = re.compile(r"bytes \*/(\d+)")
+
+
+@dataclass(frozen=True)
+class ArchiveTéléchargée:
+    etag: str | None
+    last_modified: str | None
+    content_length: int
+    sha256: str
+
+
+class TéléchargementIncompletException(Exception):
+    """
+    Le flux s'est interrompu avant la taille annoncée : le téléchargement peut être repris
+    """
+
+
+@dataclass
+class _FichierPartiel:
+    chemin: Path
+    # Validateur envoyé dans 'If-Range' : sans lui, une reprise pourrait mélanger deux versions de l'archive
+    validateur: str | None
+    etag: str | None
+    last_modified: str | None
+    taille_totale: int | None
+
+    @property
+    def taille(self) -> int:
+        return self.chemin.stat().st_size if self.chemin.exists() else 0
+
+    @property
+    def reprenable(self) -> bool:
+        return self.validateur is not None and self.taille > 0
+
+
+def telecharger_avec_reprise(
+    url: str,
+    destination: Path,
+    entêtes_conditionnelles: Mapping[str, str] | None = None,
+    nombre_tentatives: int = 5,
+    délai_initial: float = 1.0,
+    timeout: tuple[float, float] = (5, 30),
+) -> tuple[Path | None, ArchiveTéléchargée | None]:
+    """
+    Télécharge 'url' dans un fichier partiel voisin de 'destination', propre au couple (url, ETag).
+    Après une coupure, le téléchargement reprend à la taille déjà reçue (requête Range + If-Range)
+    après une attente croissante, y compris d'une exécution à l'autre (la version du fichier partiel laissé par une
+    exécution précédente est vérifiée par une requête HEAD). La taille finale est vérifiée
+    et l'empreinte sha256 calculée sur le fichier complet.
+    Retourne (None, None) si le serveur indique que l'archive n'a pas été modifiée (304)
+    """
+    partiel: _FichierPartiel | None = None
+    reprise_précédente_vérifiée = False
+    échecs = 0
+
+    while True:
+        # Sans compression de transport, la taille reçue se compare directement à Content-Length / Content-Range
+        entêtes = {"Accept-Encoding": "identity", **(entêtes_conditionnelles or {})}
+
+        try:
+            if not reprise_précédente_vérifiée:
+                if _fichier_partiel_présent(destination):
+                    # Un fichier partiel subsiste d'une exécution précédente : HEAD indique s'il correspond à la version
+                    # actuelle de l'archive, sans télécharger un corps qui serait ignoré
+                    partiel = _reprise_possible(url, destination, entêtes, timeout)
+                    if partiel is _NON_MODIFIÉE:
+                        return None, None
+                reprise_précédente_vérifiée = True
+
+            if partiel is not None and partiel.reprenable:
+                entêtes["Range"] = f"bytes={partiel.taille}-"
+                entêtes["If-Range"] = partiel.validateur
+
+            with requests.get(url, headers=entêtes, stream=True, timeout=timeout) as reponse:
+                logger.debug("Requête de téléchargement %s %s (Range=%s)", reponse.request.method, reponse.url, entêtes.get("Range"))
+                if reponse.status_code == HTTPStatus.NOT_MODIFIED:
+                    return None, None
+
+                if reponse.status_code == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE and partiel is not None and "Range" in entêtes:
+                    if _fichier_partiel_complet(partiel, reponse):
+                        # Téléchargement terminé lors d'une exécution interrompue avant l'utilisation du fichier
+                        logger.info("Fichier partiel de %s déjà complet (%s octets)", url, partiel.taille)
+                        break
+                    # Reprise impossible : sans suppression, chaque exécution suivante échouerait de la même façon
+                    logger.warning("Reprise du téléchargement de %s refusée (416) : le fichier partiel est supprimé", url)
+                    partiel.chemin.unlink(missing_ok=True)
+                    continue
+                reponse.raise_for_status()
+
+                if reponse.status_code == HTTPStatus.PARTIAL_CONTENT and partiel is not None:
+                    mode = "ab"
+                    try:
+                        partiel.taille_totale = _taille_totale_depuis_content_range(reponse, partiel.taille)
+                    except ValueError as e:
+                        # Réponse impossible à raccorder au fichier partiel : on repart de zéro
+                        partiel.chemin.unlink(missing_ok=True)
+                        raise TéléchargementIncompletException(str(e)) from e
+                else:
+                    # Réponse complète : nouvelle archive, ou serveur ignorant la requête Range
+                    partiel = _préparer_fichier_partiel(url, destination, reponse)
+                    mode = "wb"
+
+                with partiel.chemin.open(mode) as fichier:
+                    for chunk in reponse.iter_content(chunk_size=_TAILLE_CHUNK):
+                        if chunk:
+                            fichier.write(chunk)
+
+            _vérifier_taille(partiel)
+            break
+
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError, TéléchargementIncompletException) as e:
+            erreur: Exception = e
+        except requests.HTTPError as e:
+            if e.response is None or e.response.status_code < 500:
+                raise
+            erreur = e
+
+        échecs += 1
+        if échecs >= nombre_tentatives:
+            logger.error("Téléchargement de %s abandonné après %s tentatives", url, échecs)
+            raise erreur
+
+        délai = min(délai_initial * 2 ** (échecs - 1), _DÉLAI_MAXIMAL) * random.uniform(0.8, 1.2)
+        logger.warning(
+            "Téléchargement de %s interrompu (%s octets reçus) : nouvelle tentative dans %.1fs (%s/%s) : %s",
+            url, partiel.taille if partiel is not None else 0, délai, échecs + 1, nombre_tentatives, erreur,
+        )
+        time.sleep(délai)
+
+    return partiel.chemin, _vérifier_archive(partiel)
+
+
+def décrire_archive_locale(chemin: Path) -> ArchiveTéléchargée:
+    """
+    Vérifie une archive déjà présente sur disque et calcule son empreinte, comme après un téléchargement
+    """
+    if not chemin.is_file():
+        raise FileNotFoundError(f"Archive introuvable : {chemin}")
+
+    return _vérifier_archive(_FichierPartiel(chemin=chemin, validateur=None, etag=None, last_modified=None, taille_totale=None))
+
+
+# --- Private functions
+
+# Réponse de '_reprise_possible' lorsque le serveur indique que l'archive n'a pas été modifiée (304)
+_NON_MODIFIÉE = object()
+
+
+def _fichier_partiel_présent(destination: Path) -> bool:
+    return any(destination.parent.glob(f"{destination.name}.*.partiel"))
+
+
+def _reprise_possible(url: str, destination: Path, entêtes: Mapping[str, str], timeout: tuple[float, float]) -> _FichierPartiel | object | None:
+    """
+    Fichier partiel à compléter pour la version actuelle de l'archive (None s'il n'y en a pas ou si le serveur
+    ne sait pas reprendre), ou _NON_MODIFIÉE.
+    Les fichiers partiels d'une autre version sont supprimés
+    """
+    reponse = requests.head(url, headers=entêtes, timeout=timeout, allow_redirects=True)
+    if reponse.status_code == HTTPStatus.NOT_MODIFIED:
+        return _NON_MODIFIÉE
+    if not reponse.ok:
+        # Le GET qui suit rapportera l'erreur éventuelle
+        return None
+
+    partiel = _préparer_fichier_partiel(url, destination, reponse)
+    if not partiel.reprenable or reponse.headers.get("Accept-Ranges") != "bytes":
+        return None
+
+    logger.info("Reprise du téléchargement de %s à %s octets", url, partiel.taille)
+    return partiel
+
+
+def _fichier_partiel_complet(partiel: _FichierPartiel, reponse: requests.Response) -> bool:
+    correspondance = _CONTENT_RANGE_NON_SATISFAISABLE.fullmatch(reponse.headers.get("Content-Range", "").strip())
+    taille_totale = int(correspondance.group(1)) if correspondance else partiel.taille_totale
+    if taille_totale is not None and partiel.taille != taille_totale:
+        return False
+
+    partiel.taille_totale = taille_totale
+    return zipfile.is_zipfile(partiel.chemin)
+
+
+def _préparer_fichier_partiel(url: str, destination: Path, reponse: requests.Response) -> _FichierPartiel:
+    etag = reponse.headers.get("ETag")
+    last_modified = reponse.headers.get("Last-Modified")
+
+    # Un ETag faible ne peut pas servir de validateur pour 'If-Range'
+    validateur = etag if etag and not etag.startswith("W/") else last_modified
+
+    clé = hashlib.sha256(f"{url}\n{validateur or ''}".encode("utf-8")).hexdigest()[:16]
+    chemin = destination.with_name(f"{destination.name}.{clé}.partiel")
+
+    # Les fichiers partiels d'une version précédente de l'archive ne seront jamais repris
+    for ancien in destination.parent.glob(f"{destination.name}.*.partiel"):
+        if ancien != chemin:
+            ancien.unlink(missing_ok=True)
+
+    taille_totale = reponse.headers.get("Content-Length")
+    return _FichierPartiel(
+        chemin=chemin,
+        validateur=validateur,
+        etag=etag,
+        last_modified=last_modified,
+        taille_totale=int(taille_totale) if taille_totale and taille_totale.isdigit() else None,
+    )
+
+
+def _taille_totale_depuis_content_range(reponse: requests.Response, début_attendu: int) -> int | None:
+    correspondance = _CONTENT_RANGE.fullmatch(reponse.headers.get("Content-Range", "").strip())
+    if correspondance is None or int(correspondance.group(1)) != début_attendu:
+        raise ValueError(f"Content-Range inattendu pour une reprise à {début_attendu} octets : {reponse.headers.get('Content-Range')}")
+
+    total = correspondance.group(3)
+    return int(total) if total != "*" else None
+
+
+def _vérifier_taille(partiel: _FichierPartiel) -> None:
+    if partiel.taille_totale is None:
+        return
+
+    taille = partiel.taille
+    if taille < partiel.taille_totale:
+        raise TéléchargementIncompletException(f"{taille}/{partiel.taille_totale} octets reçus")
+    if taille > partiel.taille_totale:
+        partiel.chemin.unlink(missing_ok=True)
+        raise ValueError(f"Fichier téléchargé plus grand que la taille annoncée ({taille} > {partiel.taille_totale} octets)")
+
+
+def _vérifier_archive(partiel: _FichierPartiel) -> ArchiveTéléchargée:
+    # Le répertoire central en fin d'archive est illisible si des octets ont été perdus ou mal raccordés
+    if not zipfile.is_zipfile(partiel.chemin):
+        partiel.chemin.unlink(missing_ok=True)
+        raise zipfile.BadZipFile(f"Archive téléchargée invalide : {partiel.chemin}")
+
+    empreinte = hashlib.sha256()
+    taille = 0
+    with partiel.chemin.open("rb") as fichier:
+        while chunk := fichier.read(_TAILLE_CHUNK):
+            empreinte.update(chunk)
+            taille += len(chunk)
+
+    return ArchiveTéléchargée(
+        etag=partiel.etag,
+        last_modified=partiel.last_modified,
+        content_length=taille,
+        sha256=empreinte.hexdigest(),
+    )
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session as SASession
+
+logger = logging.getLogger(__name__)
+
+# Verrou de transaction : deux mises à jour d'acteurs (ex: archives AMO de deux législatures) n'extraient pas en même temps
+_CLÉ_DU_VERROU = "bourbontracker:mandat"
+
+# Mandats dont l'acteur a été supprimé ou réécrit depuis leur extraction (updated_at de l'acteur différent)
+_SUPPRIMER_MANDATS_PÉRIMÉS = """
+    DELETE FROM mandat
+    WHERE NOT EXISTS (
+        SELECT 1 FROM acteur
+        WHERE acteur.uid = mandat.acteur_uid AND acteur.updated_at = mandat.acteur_updated_at
+    )
+"""
+
+# 'mandats.mandat' est un objet lorsque l'acteur n'a qu'un mandat.
+# Les valeurs nulles sont parfois des objets ({"@xsi:nil": "true"}) : seules les chaînes sont conservées
+_EXTRAIRE_MANDATS = r"""
+    INSERT INTO mandat (uid, acteur_uid, type_organe, legislature, organe_ref, date_debut, date_fin, acteur_updated_at)
+    SELECT DISTINCT ON (m ->> 'uid')
+        m ->> 'uid',
+        acteur.uid,
+        CASE WHEN jsonb_typeof(m -> 'typeOrgane') = 'string' THEN m ->> 'typeOrgane' END,
+        CASE WHEN jsonb_typeof(m -> 'legislature') = 'string' THEN m ->> 'legislature' END,
+        CASE WHEN jsonb_typeof(m -> 'organes' -> 'organeRef') = 'string' THEN m -> 'organes' ->> 'organeRef' END,
+        CASE WHEN m ->> 'dateDebut' ~ '^\d{4}-\d{2}-\d{2}' THEN left(m ->> 'dateDebut', 10)::date END,
+        CASE WHEN m ->> 'dateFin' ~ '^\d{4}-\d{2}-\d{2}' THEN left(m ->> 'dateFin', 10)::date END,
+        acteur.updated_at
+    FROM acteur
+    CROSS JOIN LATERAL jsonb_array_elements(
+        CASE jsonb_typeof(acteur.payload -> 'mandats' -> 'mandat')
+            WHEN 'array' THEN acteur.payload -> 'mandats' -> 'mandat'
+            WHEN 'object' THEN jsonb_build_array(acteur.payload -> 'mandats' -> 'mandat')
+            ELSE '[]'::jsonb
+        END
+    ) AS m
+    WHERE jsonb_typeof(m -> 'uid') = 'string'
+      AND NOT EXISTS (
+        SELECT 1 FROM mandat
+        WHERE mandat.acteur_uid = acteur.uid AND mandat.acteur_updated_at = acteur.updated_at
+      )
+    ORDER BY m ->> 'uid', acteur.updated_at DESC
+    ON CONFLICT (uid) DO UPDATE
+        SET acteur_uid = excluded.acteur_uid,
+            type_organe = excluded.type_organe,
+            legislature = excluded.legislature,
+            organe_ref = excluded.organe_ref,
+            date_debut = excluded.date_debut,
+            date_fin = excluded.date_fin,
+            acteur_updated_at = excluded.acteur_updated_at
+"""
+
+
+def rafraichir_mandats(session: SASession) -> tuple[int, int]:
+    """
+    Met la table 'mandat' en cohérence avec la table 'acteur', dans la transaction de 'session' :
+    seuls les acteurs insérés ou réécrits depuis la dernière extraction sont relus.
+    Retourne le nombre de mandats (supprimés, extraits)
+    """
+    session.execute(text("SELECT pg_advisory_xact_lock(hashtext(:cle))"), {"cle": _CLÉ_DU_VERROU})
+    supprimés = session.execute(text(_SUPPRIMER_MANDATS_PÉRIMÉS)).rowcount
+    extraits = session.execute(text(_EXTRAIRE_MANDATS)).rowcount
+    logger.info("Table mandat : %s mandat(s) supprimé(s), %s extrait(s)", supprimés, extraits)
+    return supprimés, extraits
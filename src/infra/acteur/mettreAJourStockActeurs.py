@@ -2,32 +2,44 @@ from __future__ import annotations
 
 import logging
 
+from pathlib import Path
+from typing import Mapping, Type
+from sqlalchemy.orm import DeclarativeMeta, Session as SASession
+
 from src.infra.models import Acteur
-from src.infra._baseStockage import _BaseStockage
+from src.infra._baseConnexionBdd import ConnexionBdd
+from src.infra.acteur.extraireMandats import rafraichir_mandats
+from src.infra._baseStockage import CompteursEnregistrement, SuiviProgression, _BaseStockage
+from src.infra.amo.mettreAJourStockAmo import url_archive_amo
+from src.settings import settings
 
 logger = logging.getLogger(__name__)
 
 class MettreAJourStockActeurs(_BaseStockage):
-    def __init__(self):
+    def __init__(
+            self,
+            connexion: ConnexionBdd | None = None,
+            forcer: bool = False,
+            suivi: SuiviProgression | None = None,
+            fichier_local: Path | None = None,
+            legislature: int | None = None,
+    ):
         super().__init__(
+            connexion=connexion,
+            forcer=forcer,
+            suivi=suivi,
+            fichier_local=fichier_local,
             nom_dossier_zip="acteurs.zip",
             nom_dossier="acteur",
-            url= (
-                "http://data.assemblee-nationale.fr/static/openData/repository/17/amo/"
-                "deputes_senateurs_ministres_legislature/AMO20_dep_sen_min_tous_mandats_et_organes.json.zip"
-            )
+            legislature=legislature,
+            url=url_archive_amo(legislature or settings.legislature_courante),
         )
-
-        self._mettre_a_jour_stock()
         
-    def _mettre_a_jour_stock(self) -> int:
-        self._mettre_a_jour()
-        with self.SessionLocal() as session:
-            try:
-                total_acteurs = self._enregistrer_depuis_dossier(session, Acteur, batch_size=1000)
-                session.commit()
-            except Exception:
-                session.rollback()
-                logger.exception("Rollback de la transaction en raison d'une erreur lors de la mise à jour des acteurs")
-                raise
-        return total_acteurs
+    def mettre_a_jour_stock(self) -> dict[str, CompteursEnregistrement]:
+        return self._mettre_a_jour_stock_des_dossiers({"acteur": Acteur}, batch_size=1000)
+
+    # --- Private Functions
+
+    def _mettre_a_jour_tables_dérivées(self, session: SASession, models: Mapping[str, Type[DeclarativeMeta]]) -> None:
+        # La table mandat suit la table acteur : même transaction que l'état de l'ingestion
+        rafraichir_mandats(session)
@@ -2,39 +2,132 @@ from __future__ import annotations
 
 import logging
 
-from sqlalchemy import select
+from typing import Iterable
 
-from src.infra._baseConnexionBdd import _BaseConnexionBdd
-from src.infra.models import Acteur, Organe
+from sqlalchemy import Select, String, and_, any_, bindparam, exists, select
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import aliased
+
+from src.infra._baseConnexionBdd import ConnexionBdd, _BaseConnexionBdd
+from src.infra.models import Acteur, Mandat, Organe
 
 logger = logging.getLogger(__name__)
 
+# Seuls les mandats de groupe politique sont exposés avec l'acteur
+TYPE_ORGANE_GROUPE_POLITIQUE = "GP"
+
 class RechercherActeur(_BaseConnexionBdd):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, connexion: ConnexionBdd | None = None):
+        super().__init__(connexion)
 
-    def recuperer_acteur_par_uid(self, uid: str) -> tuple[dict, list[dict]]:
+    def recuperer_acteur_par_uid(self, uid: str, legislature: str | None = None) -> tuple[dict, list[dict], bool]:
         """
-        Récupère les données d'un Acteur à l'aide de son uid.
-        Récupère également les organes associés s'il y en a
+        Récupère en une requête l'identité d'un Acteur, ses mandats de groupe politique (de la législature
+        si elle est précisée) et les organes de ces mandats.
+        Retourne (payload de l'acteur restreint à ces mandats, payloads des organes, appartenance à un groupe politique
+        quelle que soit la législature)
         """
-        with self.SessionLocal() as session: 
-            données_en_base = session.execute(
-                select(Acteur.payload, Acteur.organe_refs_jsonb).where(Acteur.uid == uid)
-            ).first()
+        with self.SessionLocal() as session:
+            lignes = session.execute(self._requête_acteurs_et_mandats([uid], legislature)).all()
+
+        if not lignes:
+            return {}, [], False
+
+        acteurs_payloads, organes_payloads = self._regrouper_par_acteur(lignes)
+        return acteurs_payloads[0], organes_payloads, lignes[0].membre_d_un_groupe
+
+    def recuperer_acteurs_par_uids(self, uids: Iterable[str], legislature: str | None = None) -> tuple[list[dict], list[dict]]:
+        """
+        Récupère en une seule requête plusieurs Acteurs, leurs mandats de groupe politique et les organes associés.
+        Les acteurs qui n'ont jamais appartenu à un groupe politique ne sont pas retournés
+        """
+        uids = sorted(set(uids))
+        if not uids:
+            return [], []
+
+        with self.SessionLocal() as session:
+            lignes = session.execute(self._requête_acteurs_et_mandats(uids, legislature)).all()
+
+        return self._regrouper_par_acteur([ligne for ligne in lignes if ligne.membre_d_un_groupe])
 
-            if données_en_base is None:
-                return {}, []
 
-            acteur_payload, organes_refs_json = données_en_base[0], (données_en_base[1] or [])
+    # --- Private Functions
+
+    @staticmethod
+    def _requête_acteurs_et_mandats(uids: list[str], legislature: str | None) -> Select:
+        """
+        Une ligne par mandat de groupe politique retenu (ou une seule ligne sans mandat), jointe à son organe.
+        Seuls les champs d'identité du payload de l'acteur sont lus : ses mandats viennent de la table mandat
+        """
+        jointure_mandat = and_(
+            Mandat.acteur_uid == Acteur.uid,
+            Mandat.type_organe == TYPE_ORGANE_GROUPE_POLITIQUE,
+        )
+        if legislature:
+            jointure_mandat = and_(jointure_mandat, Mandat.legislature == legislature)
+
+        # Tous mandats de groupe politique confondus, indépendamment de la législature demandée
+        mandat_de_groupe = aliased(Mandat)
+        membre_d_un_groupe = (
+            exists()
+                .where(mandat_de_groupe.acteur_uid == Acteur.uid)
+                .where(mandat_de_groupe.type_organe == TYPE_ORGANE_GROUPE_POLITIQUE)
+        )
+
+        return (
+            select(
+                Acteur.uid,
+                Acteur.payload["uid"].label("uid_payload"),
+                Acteur.payload["etatCivil"].label("etat_civil"),
+                Acteur.payload["uri_hatvp"].label("uri_hatvp"),
+                membre_d_un_groupe.label("membre_d_un_groupe"),
+                Mandat.uid.label("mandat_uid"),
+                Mandat.legislature,
+                Mandat.type_organe,
+                Mandat.date_debut,
+                Mandat.date_fin,
+                Mandat.organe_ref,
+                Organe.payload.label("organe_payload"),
+            )
+                .select_from(Acteur)
+                .outerjoin(Mandat, jointure_mandat)
+                .outerjoin(Organe, Organe.uid == Mandat.organe_ref)
+                .where(Acteur.uid == any_(bindparam("uids", uids, type_=ARRAY(String))))
+                .order_by(Acteur.uid, Mandat.date_debut, Mandat.uid)
+        )
+
+    @staticmethod
+    def _regrouper_par_acteur(lignes: Iterable) -> tuple[list[dict], list[dict]]:
+        """
+        Reconstitue, pour chaque acteur, un payload au format de l'archive limité à son identité et aux mandats lus,
+        ainsi que la liste des payloads des organes de ces mandats (sans doublon)
+        """
+        acteurs_payloads: dict[str, dict] = {}
+        organes_payloads: dict[str, dict] = {}
 
-            organes_refs: list[str] = [organe_ref for organe_ref in organes_refs_json if isinstance(organe_ref, str)]
+        for ligne in lignes:
+            acteur_payload = acteurs_payloads.get(ligne.uid)
+            if acteur_payload is None:
+                acteur_payload = acteurs_payloads[ligne.uid] = {
+                    "uid": ligne.uid_payload,
+                    "etatCivil": ligne.etat_civil,
+                    "uri_hatvp": ligne.uri_hatvp,
+                    "mandats": {"mandat": []},
+                }
 
-            if not organes_refs:
-                return acteur_payload, []
+            if ligne.mandat_uid is None:
+                continue
 
-            organes_payloads: list[dict] = session.execute(
-                select(Organe.payload).where(Organe.uid.in_(organes_refs))
-            ).scalars().all()
+            acteur_payload["mandats"]["mandat"].append({
+                "uid": ligne.mandat_uid,
+                "acteurRef": ligne.uid,
+                "legislature": ligne.legislature,
+                "typeOrgane": ligne.type_organe,
+                "dateDebut": ligne.date_debut,
+                "dateFin": ligne.date_fin,
+                "organes": {"organeRef": ligne.organe_ref},
+            })
+            if ligne.organe_payload is not None:
+                organes_payloads[ligne.organe_ref] = ligne.organe_payload
 
-            return acteur_payload, organes_payloads
+        return list(acteurs_payloads.values()), list(organes_payloads.values())
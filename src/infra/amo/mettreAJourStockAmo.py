@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import logging
+
+from pathlib import Path
+from typing import Mapping, Type
+from sqlalchemy.orm import DeclarativeMeta, Session as SASession
+
+from src.infra.models import Acteur, Organe
+from src.infra._baseConnexionBdd import ConnexionBdd
+from src.infra.acteur.extraireMandats import rafraichir_mandats
+from src.infra._baseStockage import CompteursEnregistrement, SuiviProgression, _BaseStockage
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+URL_ARCHIVE_AMO = (
+    "http://data.assemblee-nationale.fr/static/openData/repository/{legislature}/amo/"
+    "deputes_senateurs_ministres_legislature/AMO20_dep_sen_min_tous_mandats_et_organes{suffixe}.json.zip"
+)
+# Les archives des législatures closes portent leur numéro en chiffres romains
+_SUFFIXES_ARCHIVE_AMO = {14: "_XIV", 15: "_XV", 16: "_XVI"}
+
+
+def url_archive_amo(legislature: int) -> str:
+    return URL_ARCHIVE_AMO.format(legislature=legislature, suffixe=_SUFFIXES_ARCHIVE_AMO.get(legislature, ""))
+
+
+class MettreAJourStockAmo(_BaseStockage):
+    """
+    Met à jour les acteurs et les organes en un seul téléchargement et un seul parcours de l'archive AMO
+    """
+    def __init__(
+            self,
+            connexion: ConnexionBdd | None = None,
+            forcer: bool = False,
+            suivi: SuiviProgression | None = None,
+            fichier_local: Path | None = None,
+            legislature: int | None = None,
+    ):
+        super().__init__(
+            connexion=connexion,
+            forcer=forcer,
+            suivi=suivi,
+            fichier_local=fichier_local,
+            nom_dossier_zip="amo.zip",
+            nom_dossier="amo",
+            legislature=legislature,
+            url=url_archive_amo(legislature or settings.legislature_courante),
+        )
+
+    def mettre_a_jour_stock(self) -> dict[str, CompteursEnregistrement]:
+        return self._mettre_a_jour_stock_des_dossiers({"acteur": Acteur, "organe": Organe}, batch_size=1000)
+
+    # --- Private Functions
+
+    def _mettre_a_jour_tables_dérivées(self, session: SASession, models: Mapping[str, Type[DeclarativeMeta]]) -> None:
+        # La table mandat suit la table acteur : même transaction que l'état de l'ingestion
+        rafraichir_mandats(session)
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import logging
+
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
+logger = logging.getLogger(__name__)
+
+FUSEAU_HORAIRE = ZoneInfo("Europe/Paris")
+
+# Champ de 'cycleDeVie.chrono' -> colonne de la table document, par ordre de priorité pour la date effective
+COLONNES_PAR_DATE_CHRONO = {
+    "dateCreation": "date_creation",
+    "dateDepot": "date_depot",
+    "datePublication": "date_publication",
+    "datePublicationWeb": "date_publication_web",
+}
+
+
+def extraire_dates_document(document_json: dict) -> dict[str, datetime | date | None]:
+    """
+    Dates de la chronologie du document et date effective : la première date valide
+    (création, dépôt, publication, publication web), exprimée en date de Paris
+    """
+    chrono = (document_json.get("cycleDeVie") or {}).get("chrono") or {}
+
+    dates: dict[str, datetime | date | None] = {
+        colonne: _parse_isoaware(chrono.get(champ))
+        for champ, colonne in COLONNES_PAR_DATE_CHRONO.items()
+    }
+
+    date_effective = next((valeur for valeur in dates.values() if valeur is not None), None)
+    dates["date_effective"] = date_effective.astimezone(FUSEAU_HORAIRE).date() if date_effective is not None else None
+    return dates
+
+
+def _parse_isoaware(s: object) -> None | datetime:
+    if not isinstance(s, str) or not s:
+        return None
+    try:
+        if s.endswith("Z"):
+            s = s[:-1] + "+00:00"
+        date_time = datetime.fromisoformat(s)
+    except ValueError:
+        logger.debug("Chaîne ISO invalide: %s", s)
+        return None
+
+    # Une date sans fuseau est une date de Paris
+    return date_time if date_time.tzinfo is not None else date_time.replace(tzinfo=FUSEAU_HORAIRE)
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session as SASession
+
+logger = logging.getLogger(__name__)
+
+# Auteurs dont le document a été supprimé ou réécrit depuis leur extraction (updated_at du document différent)
+_SUPPRIMER_AUTEURS_PÉRIMÉS = """
+    DELETE FROM document_auteur
+    WHERE legislature = :legislature
+      AND NOT EXISTS (
+        SELECT 1 FROM document
+        WHERE document.uid = document_auteur.document_uid
+          AND document.legislature = document_auteur.legislature
+          AND document.updated_at = document_auteur.document_updated_at
+      )
+"""
+
+# 'auteurs.auteur' est un objet lorsque le document n'a qu'un auteur.
+# Seuls les auteurs acteurs sont retenus (les auteurs organes n'ont pas d''acteurRef')
+_EXTRAIRE_AUTEURS = """
+    INSERT INTO document_auteur (document_uid, legislature, acteur_ref, qualite, date_effective, document_updated_at)
+    SELECT DISTINCT ON (document.uid, a -> 'acteur' ->> 'acteurRef')
+        document.uid,
+        document.legislature,
+        a -> 'acteur' ->> 'acteurRef',
+        CASE WHEN jsonb_typeof(a -> 'acteur' -> 'qualite') = 'string' THEN a -> 'acteur' ->> 'qualite' END,
+        document.date_effective,
+        document.updated_at
+    FROM document
+    CROSS JOIN LATERAL jsonb_array_elements(
+        CASE jsonb_typeof(document.payload -> 'auteurs' -> 'auteur')
+            WHEN 'array' THEN document.payload -> 'auteurs' -> 'auteur'
+            WHEN 'object' THEN jsonb_build_array(document.payload -> 'auteurs' -> 'auteur')
+            ELSE '[]'::jsonb
+        END
+    ) AS a
+    WHERE document.legislature = :legislature
+      AND jsonb_typeof(a -> 'acteur' -> 'acteurRef') = 'string'
+      AND NOT EXISTS (
+        SELECT 1 FROM document_auteur
+        WHERE document_auteur.document_uid = document.uid
+          AND document_auteur.legislature = document.legislature
+          AND document_auteur.document_updated_at = document.updated_at
+      )
+    ORDER BY document.uid, a -> 'acteur' ->> 'acteurRef'
+"""
+
+
+def rafraichir_auteurs_documents(session: SASession, legislature: int) -> tuple[int, int]:
+    """
+    Met la table 'document_auteur' en cohérence avec la partition 'legislature' de la table 'document',
+    dans la transaction de 'session' : seuls les documents insérés ou réécrits depuis la dernière extraction sont relus.
+    Retourne le nombre d'auteurs (supprimés, extraits)
+    """
+    paramètres = {"legislature": legislature}
+    supprimés = session.execute(text(_SUPPRIMER_AUTEURS_PÉRIMÉS), paramètres).rowcount
+    extraits = session.execute(text(_EXTRAIRE_AUTEURS), paramètres).rowcount
+    logger.info("Table document_auteur (législature %s) : %s auteur(s) supprimé(s), %s extrait(s)", legislature, supprimés, extraits)
+    return supprimés, extraits
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import logging
+
+from datetime import date
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from src.infra._baseConnexionBdd import ConnexionBdd, _BaseConnexionBdd
+from src.infra.models import FluxDocumentsSemaine
+
+logger = logging.getLogger(__name__)
+
+
+class StockFluxDocuments(_BaseConnexionBdd):
+    """
+    Lecture et remplacement du flux précalculé des documents de la semaine, une ligne par législature
+    """
+    def __init__(self, connexion: ConnexionBdd | None = None):
+        super().__init__(connexion)
+
+    def lire(self, legislature: int) -> tuple[date, list[dict]] | None:
+        """
+        Retourne (jour du calcul, documents) ou None si le flux de la législature n'a jamais été calculé
+        """
+        with self.SessionLocal() as session:
+            ligne = session.execute(
+                select(FluxDocumentsSemaine.jour, FluxDocumentsSemaine.documents)
+                    .where(FluxDocumentsSemaine.legislature == legislature)
+            ).one_or_none()
+
+        if ligne is None:
+            return None
+        return ligne.jour, ligne.documents
+
+    def enregistrer(self, legislature: int, jour: date, documents: list[dict]) -> None:
+        """
+        Remplace le flux de la législature en une écriture : les lectures concurrentes voient l'ancien flux
+        jusqu'à la validation, jamais un flux partiel
+        """
+        query = pg_insert(FluxDocumentsSemaine).values(legislature=legislature, jour=jour, documents=documents)
+        query = query.on_conflict_do_update(
+            index_elements=[FluxDocumentsSemaine.legislature],
+            set_={
+                "jour": query.excluded.jour,
+                "documents": query.excluded.documents,
+                "updated_at": func.now(),
+            },
+        )
+
+        with self.SessionLocal() as session:
+            session.execute(query)
+            session.commit()
+
+        logger.info("Flux des documents de la semaine (législature %s, %s) : %s document(s)", legislature, jour, len(documents))
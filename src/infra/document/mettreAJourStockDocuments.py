@@ -2,33 +2,53 @@ from __future__ import annotations
 
 import logging
 
+from pathlib import Path
+from typing import Mapping, Type
+from sqlalchemy.orm import DeclarativeMeta, Session as SASession
+
+from src.infra.document.datesDocument import extraire_dates_document
+from src.infra.document.extraireAuteurs import rafraichir_auteurs_documents
 from src.infra.models import Document
-from src.infra._baseStockage import _BaseStockage
+from src.infra._baseConnexionBdd import ConnexionBdd
+from src.infra._baseStockage import CompteursEnregistrement, SuiviProgression, _BaseStockage
+from src.settings import settings
 
 logger = logging.getLogger(__name__)
 
+URL_ARCHIVE_DOCUMENTS = (
+    "http://data.assemblee-nationale.fr/static/openData/repository/{legislature}/loi/dossiers_legislatifs/Dossiers_Legislatifs.json.zip"
+)
+
 class MettreAJourStockDocuments(_BaseStockage):
     
-    def __init__(self):
+    def __init__(
+            self,
+            connexion: ConnexionBdd | None = None,
+            forcer: bool = False,
+            suivi: SuiviProgression | None = None,
+            fichier_local: Path | None = None,
+            legislature: int | None = None,
+    ):
         super().__init__(
+            connexion=connexion,
+            forcer=forcer,
+            suivi=suivi,
+            fichier_local=fichier_local,
             nom_dossier_zip="dossier_legislatifs.zip",
             nom_dossier="document",
-            url= "http://data.assemblee-nationale.fr/static/openData/repository/17/loi/dossiers_legislatifs/Dossiers_Legislatifs.json.zip"
+            legislature=legislature,
+            url=URL_ARCHIVE_DOCUMENTS.format(legislature=legislature or settings.legislature_courante),
         )
-
-        self._mettre_a_jour_stock()
-    
-    def _mettre_a_jour_stock(self) -> int:
-        self._mettre_a_jour()
-        with self.SessionLocal() as session:
-            try:
-                total_documents = self._enregistrer_depuis_dossier(session, Document, batch_size=1000)
-                session.commit()
-            except Exception:
-                session.rollback()
-                logger.exception("Rollback de la transaction en raison d'une erreur lors de la mise à jour des documents")
-                raise
-        return total_documents
-    
     
+    def mettre_a_jour_stock(self) -> dict[str, CompteursEnregistrement]:
+        return self._mettre_a_jour_stock_des_dossiers({"document": Document}, batch_size=1000)
+
+    # --- Private Functions
+
+    def _colonnes_dérivées(self, nom_dossier: str, payload: dict) -> dict[str, object]:
+        # Dates de la chronologie stockées en colonnes, pour filtrer par plage sur un index plutôt que sur le payload
+        return extraire_dates_document(payload)
 
+    def _mettre_a_jour_tables_dérivées(self, session: SASession, models: Mapping[str, Type[DeclarativeMeta]]) -> None:
+        # La table document_auteur suit la partition de la législature : même transaction que l'état de l'ingestion
+        rafraichir_auteurs_documents(session, self.legislature)
@@ -2,93 +2,125 @@ from __future__ import annotations
 
 import logging
 
-from sqlalchemy import select, func, text, cast, DATE
-from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
+from sqlalchemy import REAL, Row, and_, cast, func, literal_column, select, tuple_
+from datetime import date, datetime, timedelta
 
-from src.infra._baseConnexionBdd import _BaseConnexionBdd
-from src.infra.models import Document
+from src.infra._baseConnexionBdd import ConnexionBdd, _BaseConnexionBdd
+from src.infra.document.datesDocument import FUSEAU_HORAIRE
+from src.infra.models import Document, DocumentAuteur
 
 logger = logging.getLogger(__name__)
 
 class RechercherDocuments(_BaseConnexionBdd):
     
-    def __init__(self):
-        super().__init__()
+    def __init__(self, connexion: ConnexionBdd | None = None):
+        super().__init__(connexion)
 
-    def recuperer_documents_semaine_courante(self) -> list[dict]: 
+    def recuperer_documents_semaine_courante(self, legislature: int, date_du_jour: date | None = None) -> list[dict]: 
         """
-        Récupère les documents dont la date (création/dépôt/publication/web) se situe dans les 7 derniers jours
+        Récupère les documents de la législature dont la date effective (première date de création/dépôt/publication/web)
+        se situe dans les 7 jours précédant 'date_du_jour' (par défaut : aujourd'hui à Paris).
+        Le filtre sur la législature limite la lecture à une seule partition de la table,
+        celui sur la date effective est un parcours de plage de l'index ix_document_date_effective
         """
-        fuseau_horaire = ZoneInfo("Europe/Paris")      
-        date_du_jour = datetime.now(fuseau_horaire).date()
+        date_du_jour = date_du_jour or datetime.now(FUSEAU_HORAIRE).date()
         six_jours_avant = date_du_jour - timedelta(days=6)
 
         with self.SessionLocal() as session:
-            # ->       : extrait une valeur de type JSONB (par clé ou index)
-            # ->>      : extrait une valeur de type text (par clé ou index)
-            # ::[type] : notation de cast postgresql (ici en timestamptz)
-            timestamps = [
-                text("(payload -> 'cycleDeVie' -> 'chrono' ->> 'dateCreation')::timestamptz"),
-                text("(payload -> 'cycleDeVie' -> 'chrono' ->> 'dateDepot')::timestamptz"),
-                text("(payload -> 'cycleDeVie' -> 'chrono' ->> 'datePublication')::timestamptz"),
-                text("(payload -> 'cycleDeVie' -> 'chrono' ->> 'datePublicationWeb')::timestamptz")
-            ]
-
-            conditions = []
-
-            for timestamp in timestamps:
-               conditions.append(
-                    cast(timestamp, DATE).between(six_jours_avant, date_du_jour)
-                )
-            
             query = (
                 select(Document.payload)
-                    # coalesce : retourne la première condition non nulle, car une des date peut être absente
-                    # *        : décompile la liste en arguments positionnels, ex (condition1, condition2, condition3,...)
-                    .where(func.coalesce(*conditions))
-                    .order_by(text("payload ->> 'uid'"))
+                    .where(Document.legislature == legislature)
+                    .where(Document.date_effective.between(six_jours_avant, date_du_jour))
+                    .order_by(Document.uid)
             )
 
             documents_dict = session.execute(query).scalars().all()
 
         return documents_dict
-    
-    
-    # --- Private Functions
 
-    @staticmethod
-    def _extraire_date_document(document_json: dict, fuseau_horaire: ZoneInfo) -> None | datetime.date:
-        chrono = (
-            document_json.get("cycleDeVie", {})
-                   .get("chrono", {})
+    def recuperer_documents_par_auteur(
+            self,
+            acteur_uid: str,
+            limite: int,
+            depuis: date | None = None,
+            jusqu_au: date | None = None,
+            legislature: int | None = None,
+            après: tuple[date, str, int] | None = None,
+    ) -> list[Row]:
+        """
+        Récupère au plus 'limite' documents dont l'acteur est auteur, du plus récent au plus ancien (date effective),
+        en parcourant l'index ix_document_auteur_acteur_date.
+        'après' : clé (date_effective, document_uid, legislature) du dernier document de la page précédente.
+        Les documents sans date effective ne sont pas retournés
+        """
+        clé = tuple_(DocumentAuteur.date_effective, DocumentAuteur.document_uid, DocumentAuteur.legislature)
+
+        query = (
+            select(Document.payload, DocumentAuteur.date_effective, DocumentAuteur.document_uid, DocumentAuteur.legislature)
+                .join(Document, and_(
+                    Document.uid == DocumentAuteur.document_uid,
+                    Document.legislature == DocumentAuteur.legislature,
+                ))
+                .where(DocumentAuteur.acteur_ref == acteur_uid)
+                .where(DocumentAuteur.date_effective.is_not(None))
         )
-        document_dates = [
-            chrono.get("dateCreation"),
-            chrono.get("dateDepot"),
-            chrono.get("datePublication"),
-            chrono.get("datePublicationWeb"),
-        ]
-
-        for document_date in document_dates:
-            if not document_date:
-                continue
-            date_time = RechercherDocuments._parse_isoaware(document_date)
-            if date_time is None:
-                continue
-            return date_time.astimezone(fuseau_horaire).date()
-
-        return None
-
-    @staticmethod
-    def _parse_isoaware(s: str) -> None | datetime:
-        try:
-            if s.endswith("Z"):
-                s = s[:-1] + "+00:00"
-            return datetime.fromisoformat(s)
-        except ValueError:
-            logger.debug("Chaîne ISO invalide: %s", s)
-            return None
-    
-    
+        if depuis is not None:
+            query = query.where(DocumentAuteur.date_effective >= depuis)
+        if jusqu_au is not None:
+            query = query.where(DocumentAuteur.date_effective <= jusqu_au)
+        if legislature is not None:
+            query = query.where(DocumentAuteur.legislature == legislature)
+        if après is not None:
+            query = query.where(clé < tuple_(*après))
+
+        query = query.order_by(
+            DocumentAuteur.date_effective.desc(),
+            DocumentAuteur.document_uid.desc(),
+            DocumentAuteur.legislature.desc(),
+        ).limit(limite)
 
+        with self.SessionLocal() as session:
+            return session.execute(query).all()
+
+    def rechercher_documents(
+            self,
+            texte: str,
+            limite: int,
+            depuis: date | None = None,
+            jusqu_au: date | None = None,
+            legislature: int | None = None,
+            après: tuple[float, str, int] | None = None,
+    ) -> list[Row]:
+        """
+        Recherche plein texte (configuration française, syntaxe de 'websearch_to_tsquery' : mots, "expression", -exclu, or)
+        dans les titres et la notice des documents, via l'index GIN ix_document_recherche.
+        Retourne au plus 'limite' documents, du plus pertinent au moins pertinent.
+        'après' : clé (rang, document_uid, legislature) du dernier document de la page précédente
+        """
+        requête = func.websearch_to_tsquery(literal_column("'french'"), texte)
+        rang = func.ts_rank_cd(Document.recherche, requête)
+        clé = tuple_(rang, Document.uid, Document.legislature)
+
+        query = (
+            select(Document.payload, rang.label("rang"), Document.uid.label("document_uid"), Document.legislature)
+                .where(Document.recherche.bool_op("@@")(requête))
+        )
+        if depuis is not None:
+            query = query.where(Document.date_effective >= depuis)
+        if jusqu_au is not None:
+            query = query.where(Document.date_effective <= jusqu_au)
+        if legislature is not None:
+            query = query.where(Document.legislature == legislature)
+        if après is not None:
+            rang_précédent, document_uid, legislature_précédente = après
+            # Comparé en real, type du rang : en double précision, le rang du dernier document ne serait plus égal à lui-même
+            query = query.where(clé < tuple_(cast(rang_précédent, REAL), document_uid, legislature_précédente))
+
+        query = query.order_by(
+            rang.desc(),
+            Document.uid.desc(),
+            Document.legislature.desc(),
+        ).limit(limite)
+
+        with self.SessionLocal() as session:
+            return session.execute(query).all()
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import logging
+import uuid
+
+from datetime import timedelta
+from typing import Any, Mapping
+
+from sqlalchemy import func, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session as SASession
+
+from src.infra._baseConnexionBdd import ConnexionBdd, _BaseConnexionBdd
+from src.infra.models import EtatIngestion, TacheIngestion
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+ETATS_ACTIFS = ("pending", "running")
+
+
+class SuiviIngestion(_BaseConnexionBdd):
+    def __init__(self, connexion: ConnexionBdd | None = None):
+        super().__init__(connexion)
+
+    def creer_ou_rejoindre(self, dataset: str, legislature: int, clé_des_tables: str, forcer: bool = False) -> tuple[dict, bool]:
+        """
+        Crée une tâche d'ingestion pour 'dataset' et 'legislature', ou retourne la tâche déjà active qui écrit
+        les mêmes tables ('clé_des_tables'), quel que soit son jeu de données.
+        Le booléen retourné indique si la tâche vient d'être créée (et doit donc être exécutée par l'appelant)
+        """
+        with self.SessionLocal() as session:
+            self._abandonner_taches_inactives(session, clé_des_tables)
+
+            # L'index unique partiel sur les tâches actives garantit qu'un seul appel crée la tâche,
+            # y compris entre plusieurs processus ou réplicas
+            query = (
+                pg_insert(TacheIngestion)
+                    .values(
+                        id=str(uuid.uuid4()),
+                        dataset=dataset,
+                        legislature=legislature,
+                        lock_key=clé_des_tables,
+                        state="pending",
+                        force=forcer,
+                    )
+                    .on_conflict_do_nothing(
+                        index_elements=[TacheIngestion.lock_key],
+                        index_where=text("state IN ('pending', 'running')"),
+                    )
+                    .returning(TacheIngestion.id)
+            )
+            id_créé = session.execute(query).scalar()
+            session.commit()
+
+            if id_créé is not None:
+                return self._en_dict(session.get(TacheIngestion, id_créé)), True
+
+            tache_active = session.execute(
+                select(TacheIngestion)
+                    .where(
+                        TacheIngestion.lock_key == clé_des_tables,
+                        TacheIngestion.state.in_(ETATS_ACTIFS),
+                    )
+            ).scalar_one_or_none()
+            tache = self._en_dict(tache_active) if tache_active is not None else {}
+
+        if not tache:
+            # La tâche active vient de se terminer entre-temps : on en crée une nouvelle
+            return self.creer_ou_rejoindre(dataset, legislature, clé_des_tables, forcer)
+
+        logger.info(
+            "Une ingestion '%s' (législature %s) écrivant les mêmes tables est déjà en cours (%s) : la demande '%s' (législature %s) la rejoint",
+            tache["dataset"], tache["legislature"], tache["id"], dataset, legislature,
+        )
+        return tache, False
+
+    def recuperer_tache_par_id(self, id_tache: str) -> dict:
+        with self.SessionLocal() as session:
+            tache = session.get(TacheIngestion, id_tache)
+            return self._en_dict(tache) if tache is not None else {}
+
+    def recuperer_etats_des_datasets(self) -> list[dict]:
+        """
+        Dernière archive enregistrée et mesures de la dernière mise à jour, pour chaque jeu de données
+        """
+        with self.SessionLocal() as session:
+            états = session.execute(
+                select(EtatIngestion).order_by(EtatIngestion.dataset, EtatIngestion.legislature)
+            ).scalars().all()
+            return [
+                {colonne.key: getattr(état, colonne.key) for colonne in EtatIngestion.__table__.columns}
+                for état in états
+            ]
+
+    def demarrer(self, id_tache: str) -> bool:
+        """
+        Passe la tâche en cours d'exécution si elle est toujours en attente. Retourne False si elle a été abandonnée
+        ou annulée entre-temps : elle ne doit pas être exécutée, une autre tâche a pu la remplacer
+        """
+        return self._mettre_a_jour(id_tache, TacheIngestion.state == "pending", state="running", started_at=func.now())
+
+    def progresser(self, id_tache: str, lignes_traitées: int) -> None:
+        self._mettre_a_jour(id_tache, rows_processed=lignes_traitées)
+
+    def signaler_activite(self, id_tache: str) -> None:
+        """
+        Repousse l'abandon de la tâche (voir '_abandonner_taches_inactives') sans changer sa progression
+        """
+        self._mettre_a_jour(id_tache)
+
+    def terminer(self, id_tache: str, compteurs: Mapping[str, Any]) -> None:
+        self._mettre_a_jour(id_tache, state="succeeded", counts=dict(compteurs), finished_at=func.now())
+
+    def echouer(self, id_tache: str, erreur: str) -> None:
+        self._mettre_a_jour(id_tache, state="failed", error=erreur, finished_at=func.now())
+
+    # --- Private functions
+
+    def _mettre_a_jour(self, id_tache: str, *conditions: Any, **valeurs: Any) -> bool:
+        with self.SessionLocal() as session:
+            résultat = session.execute(
+                update(TacheIngestion)
+                    .where(TacheIngestion.id == id_tache, *conditions)
+                    .values(updated_at=func.now(), **valeurs)
+            )
+            session.commit()
+        return résultat.rowcount > 0
+
+    @staticmethod
+    def _abandonner_taches_inactives(session: SASession, clé_des_tables: str) -> None:
+        """
+        Une tâche active qui n'a donné aucun signe de vie depuis trop longtemps (processus arrêté en cours
+        d'exécution) ne doit pas bloquer indéfiniment les nouvelles demandes.
+        Une tâche en cours d'exécution, ou en attente d'un thread de l'exécuteur, signale son activité régulièrement
+        (voir 'signaler_activite')
+        """
+        limite = func.now() - timedelta(seconds=settings.ingestion_delai_abandon)
+        résultat = session.execute(
+            update(TacheIngestion)
+                .where(
+                    TacheIngestion.lock_key == clé_des_tables,
+                    TacheIngestion.state.in_(ETATS_ACTIFS),
+                    TacheIngestion.updated_at < limite,
+                )
+                .values(state="failed", error="Tâche abandonnée (aucune progression)", finished_at=func.now(), updated_at=func.now())
+        )
+        if résultat.rowcount:
+            logger.warning("%s tâche(s) d'ingestion '%s' abandonnée(s)", résultat.rowcount, clé_des_tables)
+
+    @staticmethod
+    def _en_dict(tache: TacheIngestion) -> dict:
+        return {colonne.key: getattr(tache, colonne.key) for colonne in TacheIngestion.__table__.columns}
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+
+from contextlib import contextmanager
+from typing import Iterator
+
+from sqlalchemy import text
+
+from src.infra._baseConnexionBdd import ConnexionBdd, _BaseConnexionBdd
+
+logger = logging.getLogger(__name__)
+
+
+class VerrouIngestion(_BaseConnexionBdd):
+    """
+    Verrou consultatif (advisory lock) PostgreSQL par clé (tables écrites par une ingestion, ex : 'document:17') :
+    un seul processus, toutes réplicas confondues, peut le détenir à un instant donné
+    """
+    def __init__(self, connexion: ConnexionBdd | None = None):
+        super().__init__(connexion)
+
+    @contextmanager
+    def essayer_de_verrouiller(self, clé: str, attendre: bool = False) -> Iterator[bool]:
+        """
+        Tente d'acquérir le verrou, sans attendre sauf si 'attendre'. Produit True si le verrou est détenu.
+        Le verrou est lié à la connexion : elle reste réservée jusqu'à la sortie du bloc 'with'
+        """
+        clé_du_verrou = self._clé_du_verrou(clé)
+
+        with self.engine.connect() as connexion:
+            if attendre:
+                connexion.execute(text("SELECT pg_advisory_lock(:cle)"), {"cle": clé_du_verrou})
+                acquis = True
+            else:
+                acquis = bool(connexion.execute(text("SELECT pg_try_advisory_lock(:cle)"), {"cle": clé_du_verrou}).scalar())
+            # Valide la transaction implicite : le verrou de session survit, la connexion ne reste pas 'idle in transaction'
+            connexion.commit()
+
+            if not acquis:
+                logger.debug("Verrou d'ingestion '%s' détenu par un autre processus", clé)
+
+            try:
+                yield acquis
+            finally:
+                if acquis:
+                    connexion.execute(text("SELECT pg_advisory_unlock(:cle)"), {"cle": clé_du_verrou})
+                    connexion.commit()
+
+    @staticmethod
+    def _clé_du_verrou(clé: str) -> int:
+        empreinte = hashlib.sha256(f"bourbontracker:ingestion:{clé}".encode("utf-8")).digest()
+        return int.from_bytes(empreinte[:8], "big", signed=True)
@@ -1,11 +1,11 @@
 from __future__ import annotations
 
 from typing import Any
-from datetime import datetime
-from sqlalchemy import text, Computed, Index
+from datetime import date, datetime
+from sqlalchemy import Computed, text, Index
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
-from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.types import String, DateTime
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.types import BigInteger, Boolean, Date, Integer, String, Text, DateTime
 
 class Models(DeclarativeBase):
     pass
@@ -15,19 +15,34 @@ class Acteur(Models):
 
     uid: Mapped[str] = mapped_column(primary_key=True)
     payload: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    # Empreinte sha256 du payload calculée à l'enregistrement : évite de réécrire les lignes inchangées
+    payload_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
 
-    organe_refs_jsonb: Mapped[dict] = mapped_column(
-        JSONB,
-        Computed("jsonb_path_query_array(payload, '$.**.organeRef')", persisted=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=text("now()"), nullable=False
     )
 
-    __table_args__ = (
-        Index("ix_acteur_payload_gin", "payload", postgresql_using="gin"),
-        Index("ix_acteur_organe_refs_gin", "organe_refs_jsonb", postgresql_using="gin"),
-    )
 
-    updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=text("now()"), nullable=False
+class Mandat(Models):
+    """
+    Mandats des acteurs, extraits de leur payload à chaque mise à jour des acteurs (voir 'rafraichir_mandats').
+    Pas de clé étrangère vers acteur : la table acteur peut être remplacée par une table fantôme
+    """
+    __tablename__ = "mandat"
+
+    uid: Mapped[str] = mapped_column(String, primary_key=True)
+    acteur_uid: Mapped[str] = mapped_column(String, nullable=False)
+    type_organe: Mapped[str | None] = mapped_column(String, nullable=True)
+    legislature: Mapped[str | None] = mapped_column(String, nullable=True)
+    organe_ref: Mapped[str | None] = mapped_column(String, nullable=True)
+    date_debut: Mapped[date | None] = mapped_column(Date, nullable=True)
+    date_fin: Mapped[date | None] = mapped_column(Date, nullable=True)
+    # updated_at de l'acteur lors de l'extraction : les mandats d'un acteur réécrit depuis sont extraits à nouveau
+    acteur_updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_mandat_acteur_type_organe_legislature", "acteur_uid", "type_organe", "legislature"),
+        Index("ix_mandat_organe_type_organe", "organe_ref", "type_organe"),
     )
 
 
@@ -35,21 +50,148 @@ class Organe(Models):
     __tablename__ = "organe"
     uid: Mapped[str] = mapped_column(String, primary_key=True)
     payload: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+    payload_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=text("now()"), nullable=False
     )
-    __table_args__ = (
-        Index("ix_organe_payload_gin", "payload", postgresql_using="gin"),
+
+def _texte_pondéré(chemin: str, poids: str) -> str:
+    # Les valeurs nulles de l'archive sont des objets ({"@xsi:nil": "true"}) : seules les chaînes sont indexées
+    return (
+        f"setweight(to_tsvector('french', CASE WHEN jsonb_typeof(payload #> '{{{chemin}}}') = 'string' "
+        f"THEN payload #>> '{{{chemin}}}' ELSE '' END), '{poids}')"
     )
 
+# Titre (A), titre court (B) et formule de la notice (C), en configuration française
+RECHERCHE_DOCUMENT = " || ".join((
+    _texte_pondéré("titres,titrePrincipal", "A"),
+    _texte_pondéré("titres,titrePrincipalCourt", "B"),
+    _texte_pondéré("notice,formule", "C"),
+))
+
 class Document(Models):
     __tablename__ = "document"
     uid: Mapped[str] = mapped_column(String, primary_key=True)
+    # Législature de l'archive dont provient le document : la table est partitionnée sur cette colonne
+    legislature: Mapped[int] = mapped_column(Integer, primary_key=True)
     payload: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
+    payload_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    # Dates de 'cycleDeVie.chrono', extraites du payload à l'enregistrement
+    date_creation: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    date_depot: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    date_publication: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    date_publication_web: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Première de ces dates (dans cet ordre), en date de Paris : critère des recherches par période
+    date_effective: Mapped[date | None] = mapped_column(Date, nullable=True)
+    # Texte intégral des titres et de la notice, calculé par PostgreSQL à chaque écriture du payload
+    recherche: Mapped[str] = mapped_column(TSVECTOR, Computed(RECHERCHE_DOCUMENT, persisted=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=text("now()"), nullable=False
+    )
+
+    __table_args__ = (
+        Index("ix_document_date_effective", "date_effective"),
+        Index("ix_document_recherche", "recherche", postgresql_using="gin"),
+        {
+            "postgresql_partition_by": "LIST (legislature)",
+            # Lu par les chargeurs : une partition par valeur, créée à la demande
+            "info": {"colonne_de_partition": "legislature"},
+        },
+    )
+
+class DocumentAuteur(Models):
+    """
+    Acteurs auteurs des documents, extraits de 'auteurs.auteur' à chaque mise à jour des documents
+    (voir 'rafraichir_auteurs_documents'). Pas de clé étrangère vers document : ses partitions peuvent
+    être remplacées par une table fantôme
+    """
+    __tablename__ = "document_auteur"
+
+    document_uid: Mapped[str] = mapped_column(String, primary_key=True)
+    legislature: Mapped[int] = mapped_column(Integer, primary_key=True)
+    acteur_ref: Mapped[str] = mapped_column(String, primary_key=True)
+    qualite: Mapped[str | None] = mapped_column(String, nullable=True)
+    # Copie de document.date_effective : les documents d'un acteur sont parcourus par date sans lire la table document
+    date_effective: Mapped[date | None] = mapped_column(Date, nullable=True)
+    # updated_at du document lors de l'extraction : les auteurs d'un document réécrit depuis sont extraits à nouveau
+    document_updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        # Pagination par clé : (date_effective, document_uid, legislature) décroissants pour un acteur
+        Index("ix_document_auteur_acteur_date", "acteur_ref", "date_effective", "document_uid", "legislature"),
+    )
+
+class FluxDocumentsSemaine(Models):
+    """
+    Flux des documents des sept derniers jours d'une législature, précalculé (auteurs et groupes politiques joints)
+    après chaque mise à jour des documents ou des acteurs et à chaque changement de jour à Paris
+    (voir 'rafraichir_flux_documents'). Pas de vue matérialisée : elle dépendrait des tables acteur, organe et document,
+    que le remplacement par une table fantôme supprime
+    """
+    __tablename__ = "flux_documents_semaine"
+
+    legislature: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # Jour (Europe/Paris) dont le flux couvre les sept derniers jours
+    jour: Mapped[date] = mapped_column(Date, nullable=False)
+    # Documents enrichis, sérialisés tels que retournés par l'API
+    documents: Mapped[list[dict[str, Any]]] = mapped_column(JSONB, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=text("now()"), nullable=False
+    )
+
+class EtatIngestion(Models):
+    __tablename__ = "ingest_state"
+
+    # Nom du jeu de données mis à jour (acteur, organe, document, amo...)
+    dataset: Mapped[str] = mapped_column(String, primary_key=True)
+    legislature: Mapped[int] = mapped_column(Integer, primary_key=True)
+    url: Mapped[str] = mapped_column(String, nullable=False)
+    etag: Mapped[str | None] = mapped_column(String, nullable=True)
+    last_modified: Mapped[str | None] = mapped_column(String, nullable=True)
+    content_length: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    sha256: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    # Point de reprise d'une mise à jour validée batch par batch et pas encore terminée :
+    # dernier fichier de l'archive (identifiée par son sha256) dont les données sont en base
+    checkpoint_sha256: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    checkpoint_member: Mapped[str | None] = mapped_column(Text, nullable=True)
+    checkpoint_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Mesures de la dernière mise à jour : durées par étape, volumes, latence des batches, mémoire
+    metrics: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=text("now()"), nullable=False
+    )
+
+
+class TacheIngestion(Models):
+    __tablename__ = "ingest_job"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    dataset: Mapped[str] = mapped_column(String, nullable=False)
+    legislature: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Tables écrites par la tâche (ex : 'document:17', ou 'amo' pour les jeux de données acteur, organe et amo) :
+    # deux tâches de même clé ne s'exécutent jamais simultanément
+    lock_key: Mapped[str] = mapped_column(String, nullable=False)
+    # pending -> running -> succeeded | failed
+    state: Mapped[str] = mapped_column(String, nullable=False)
+    force: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default=text("false"))
+    rows_processed: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    counts: Mapped[dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=text("now()"), nullable=False
+    )
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=text("now()"), nullable=False
     )
 
     __table_args__ = (
-        Index("ix_document_payload_gin", "payload", postgresql_using="gin"),
-    )
\ No newline at end of file
+        # Une seule tâche active par ensemble de tables écrites : les soumissions concurrentes rejoignent la tâche existante
+        Index(
+            "ux_ingest_job_lock_key_active",
+            "lock_key",
+            unique=True,
+            postgresql_where=text("state IN ('pending', 'running')"),
+        ),
+    )
@@ -1,32 +1,34 @@
-import json
 import logging
 
+from pathlib import Path
+
 from src.infra.models import Organe
-from src.infra._baseStockage import _BaseStockage
+from src.infra._baseConnexionBdd import ConnexionBdd
+from src.infra._baseStockage import CompteursEnregistrement, SuiviProgression, _BaseStockage
+from src.infra.amo.mettreAJourStockAmo import url_archive_amo
+from src.settings import settings
 
 logger = logging.getLogger(__name__)
 
 class MettreAJourStockOrganes(_BaseStockage):
-    def __init__(self):
+    def __init__(
+            self,
+            connexion: ConnexionBdd | None = None,
+            forcer: bool = False,
+            suivi: SuiviProgression | None = None,
+            fichier_local: Path | None = None,
+            legislature: int | None = None,
+    ):
         super().__init__(
-            nom_dossier_zip="acteurs.zip",
+            connexion=connexion,
+            forcer=forcer,
+            suivi=suivi,
+            fichier_local=fichier_local,
+            nom_dossier_zip="organes.zip",
             nom_dossier="organe",
-            url= (
-                "http://data.assemblee-nationale.fr/static/openData/repository/17/amo/"
-                "deputes_senateurs_ministres_legislature/AMO20_dep_sen_min_tous_mandats_et_organes.json.zip"
-            )
+            legislature=legislature,
+            url=url_archive_amo(legislature or settings.legislature_courante),
         )
 
-        self._mettre_a_jour_stock()
-
-    def _mettre_a_jour_stock(self) -> int:
-        self._mettre_a_jour()
-        with self.SessionLocal() as session:
-            try:
-                total_organes = self._enregistrer_depuis_dossier(session, Organe, batch_size=1000)
-                session.commit()
-            except Exception:
-                session.rollback()
-                logger.exception("Rollback de la transaction en raison d'une erreur lors de la mise à jour des organes")
-                raise
-        return total_organes
+    def mettre_a_jour_stock(self) -> dict[str, CompteursEnregistrement]:
+        return self._mettre_a_jour_stock_des_dossiers({"organe": Organe}, batch_size=1000)
@@ -4,14 +4,14 @@ import logging
 
 from sqlalchemy import select
 
-from src.infra._baseConnexionBdd import _BaseConnexionBdd
+from src.infra._baseConnexionBdd import ConnexionBdd, _BaseConnexionBdd
 from src.infra.models import Organe
 
 logger = logging.getLogger(__name__)
 
 class RechercherOrgane(_BaseConnexionBdd):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, connexion: ConnexionBdd | None = None):
+        super().__init__(connexion)
 
     def recuperer_organe_par_uid(self, uid: str) -> dict | None:
         with self.SessionLocal() as session: 
@@ -1,11 +1,15 @@
-from collections.abc import Sequence
+from collections.abc import AsyncIterator, Sequence
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import ORJSONResponse, RedirectResponse
 
 from src.api import gestionnaireDesExceptions
-from src.api.routes import routesActeurs, routesDocuments, routesOrganes
+from src.api.routes import routesActeurs, routesAmo, routesDocuments, routesIngestions, routesOrganes
+from src.infra._baseConnexionBdd import fermer_connexion_partagée, ouvrir_connexion_partagée
+from src.metier.ingestion.lancerIngestion import arreter_ingestions
+from src.metier.ingestion.planifierIngestions import arreter_planificateur, demarrer_planificateur
 from src.settings import settings
 
 
@@ -23,12 +27,28 @@ def _enregistrer_les_routes(app: FastAPI) -> None:
     app.include_router(routesActeurs.router)
     app.include_router(routesDocuments.router)
     app.include_router(routesOrganes.router)
+    app.include_router(routesAmo.router)
+    app.include_router(routesIngestions.router)
+
+
+@asynccontextmanager
+async def _cycle_de_vie(app: FastAPI) -> AsyncIterator[None]:
+    # Un seul pool de connexions pour toute la durée de vie du processus
+    app.state.connexion_bdd = ouvrir_connexion_partagée()
+    if settings.planificateur_actif:
+        demarrer_planificateur()
+    try:
+        yield
+    finally:
+        arreter_planificateur()
+        arreter_ingestions()
+        fermer_connexion_partagée()
 
 
 # ---
 
 def creer_application(cors_origins_autorisées: Sequence[str] | None = None) -> FastAPI:
-    app = FastAPI(default_response_class=ORJSONResponse)
+    app = FastAPI(default_response_class=ORJSONResponse, lifespan=_cycle_de_vie)
 
     _configurer_cors(app, cors_origins_autorisées or settings.effective_cors_allowed_origins)
     _enregistrer_les_routes(app)
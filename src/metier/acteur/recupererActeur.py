@@ -1,8 +1,9 @@
 import logging
 
 from pydantic import ValidationError
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 
+from src.metier import _utilitaire
 from src.metier.organe.organe import Organe, parser_organe_depuis_payload
 from src.infra.acteur.rechercherActeur import RechercherActeur
 from src.metier.applicationExceptions import ActeurIntrouvableException
@@ -16,28 +17,64 @@ def recuperer_acteur(
 ) -> Acteur:
     rechercher_acteur = RechercherActeur()
 
-    acteur_payload, organes_payload = rechercher_acteur.recuperer_acteur_par_uid(uid)
+    acteur_payload, organes_payload, membre_d_un_groupe = rechercher_acteur.recuperer_acteur_par_uid(uid, legislature)
 
     if not acteur_payload:
         raise ActeurIntrouvableException(f"Acteur introuvable pour uid='{uid}'")
 
-    try:
-        acteur: Acteur = parser_acteur_depuis_payload(acteur_payload)
-        mandats = _extraire_mandats_type_groupe_politique(acteur)
+    if not membre_d_un_groupe:
+        logger.warning("Acteur %s non représenté par un groupe politique", uid)
+        raise ActeurIntrouvableException(
+            f"l'Acteur avec uid='{uid}' n'est pas dans un groupe politique"
+        )
+
+    return _construire_acteur(uid, acteur_payload, _indexer_organes(organes_payload))
+
+
+def recuperer_acteurs(
+        uids: Iterable[str],
+        legislature: Optional[str] = None
+) -> Dict[str, Acteur]:
+    """
+    Récupère plusieurs acteurs, avec leurs mandats de groupe politique et les organes associés, en une requête.
+    Les acteurs introuvables, invalides ou sans groupe politique sont ignorés.
+    """
+    rechercher_acteur = RechercherActeur()
+
+    acteurs_payload, organes_payload = rechercher_acteur.recuperer_acteurs_par_uids(uids, legislature)
+    organes_uids = _indexer_organes(organes_payload)
 
-        if not mandats:
-            logger.warning("Acteur %s non représenté par un groupe politique", uid)
-            raise ActeurIntrouvableException(
-                f"l'Acteur avec uid='{uid}' n'est pas dans un groupe politique"
-            )
+    acteurs: Dict[str, Acteur] = {}
 
-        mandats = _filtrer_mandats_par_legislature(mandats, legislature)
+    for acteur_payload in acteurs_payload:
+        uid = _utilitaire.nil_ou_text(acteur_payload.get("uid"))
+        if not uid:
+            continue
+        try:
+            acteurs[uid] = _construire_acteur(uid, acteur_payload, organes_uids)
+        except ActeurIntrouvableException:
+            continue
 
-        if not organes_payload:
+    return acteurs
+
+
+def _construire_acteur(
+        uid: str,
+        acteur_payload: dict,
+        organes_uids: Dict[str, Organe]
+) -> Acteur:
+    """
+    'acteur_payload' ne contient que les mandats de groupe politique retenus (voir RechercherActeur)
+    """
+    try:
+        acteur: Acteur = parser_acteur_depuis_payload(acteur_payload)
+        mandats = acteur.mandats.mandat if acteur.mandats else []
+
+        if not organes_uids:
             logger.warning("Aucun organe associé à l'acteur %s", uid)
             return _mettre_a_jour_mandats(acteur, mandats)
 
-        mandats_enrichis = _enrichir_mandats_avec_détail_des_organes(mandats, organes_payload)
+        mandats_enrichis = _enrichir_mandats_avec_détail_des_organes(mandats, organes_uids)
 
         return _mettre_a_jour_mandats(acteur, mandats_enrichis)
 
@@ -48,24 +85,24 @@ def recuperer_acteur(
         ) from e
 
 
-def _extraire_mandats_type_groupe_politique(acteur: Acteur) -> List[Mandat]:
-    mandats = acteur.mandats.mandat if (acteur.mandats and acteur.mandats.mandat) else []
-    return [mandat for mandat in mandats if mandat.typeOrgane == "GP"]
+def _indexer_organes(organes_payload: Iterable[dict]) -> Dict[str, Organe]:
+    organes_uids: Dict[str, Organe] = {}
 
-def _filtrer_mandats_par_legislature(
-        mandats: List[Mandat], 
-        legislature: Optional[str]
-) -> List[Mandat]:
-    if not legislature:
-        return mandats
-    return [mandat for mandat in mandats if mandat.legislature == legislature]
+    for organe_payload in organes_payload:
+        try:
+            organe: Organe = parser_organe_depuis_payload(organe_payload)
+        except ValidationError as e:
+            logger.error("Erreur de validation d'un Organe associé à un acteur : %s", e)
+            continue
+        if organe and organe.uid:
+            organes_uids[organe.uid] = organe
+
+    return organes_uids
 
 def _enrichir_mandats_avec_détail_des_organes(
         mandats: List[Mandat], 
-        organes_payload
+        organes_uids: Dict[str, Organe]
 ) -> List[Mandat]:
-    organes: List[Organe] = [parser_organe_depuis_payload(organe_payload) for organe_payload in organes_payload]
-    organes_uids: Dict[str, Organe] = {organe.uid: organe for organe in organes if organe and organe.uid}
     mandats_enrichis: List[Mandat] = []
     
     for mandat in mandats:
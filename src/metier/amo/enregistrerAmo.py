@@ -0,0 +1,16 @@
+import logging
+
+from pathlib import Path
+
+from src.infra.amo.mettreAJourStockAmo import MettreAJourStockAmo
+from src.infra._baseStockage import CompteursEnregistrement, SuiviProgression
+
+logger = logging.getLogger(__name__)
+
+def mettre_a_jour_acteurs_et_organes(
+        forcer: bool = False,
+        suivi: SuiviProgression | None = None,
+        fichier_local: Path | None = None,
+        legislature: int | None = None,
+) -> dict[str, CompteursEnregistrement]:
+    return MettreAJourStockAmo(forcer=forcer, suivi=suivi, fichier_local=fichier_local, legislature=legislature).mettre_a_jour_stock()
@@ -8,4 +8,12 @@ class ActeurIntrouvableException(Exception):
 
 class OrganeIntrouvableException(Exception):
     def __init__(self, message, *args, **kwargs):
-        super().__init__(message, *args, **kwargs)
\ No newline at end of file
+        super().__init__(message, *args, **kwargs)
+
+class IngestionIntrouvableException(Exception):
+    def __init__(self, message, *args, **kwargs):
+        super().__init__(message, *args, **kwargs)
+
+class ParametreInvalideException(Exception):
+    def __init__(self, message, *args, **kwargs):
+        super().__init__(message, *args, **kwargs)
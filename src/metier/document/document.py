@@ -97,4 +97,10 @@ class Document(BaseModel):
     indexation: Optional[Any] = None
 
 def parse_document_depuis_payload(data: Dict[str, Any]) -> Document:
-    return _utilitaire.parser_depuis_payload(data, Document, "document")
\ No newline at end of file
+    return _utilitaire.parser_depuis_payload(data, Document, "document")
+
+class PageDocuments(BaseModel):
+    documents: List[Document] = Field(default_factory=list)
+    # Curseur à transmettre pour obtenir la page suivante, absent sur la dernière page
+    suivant: Optional[str] = None
+
@@ -1,4 +1,12 @@
+from pathlib import Path
+
 from src.infra.document.mettreAJourStockDocuments import MettreAJourStockDocuments
+from src.infra._baseStockage import CompteursEnregistrement, SuiviProgression
 
-def mettre_a_jour_documents():  
-        MettreAJourStockDocuments()      
\ No newline at end of file
+def mettre_a_jour_documents(
+        forcer: bool = False,
+        suivi: SuiviProgression | None = None,
+        fichier_local: Path | None = None,
+        legislature: int | None = None,
+) -> dict[str, CompteursEnregistrement]:  
+        return MettreAJourStockDocuments(forcer=forcer, suivi=suivi, fichier_local=fichier_local, legislature=legislature).mettre_a_jour_stock()      
\ No newline at end of file
@@ -1,25 +1,202 @@
-from typing import Dict, Iterable, List, Sequence, Set
+import base64
+import binascii
+import json
+import logging
 
-from src.metier.acteur.recupererActeur import recuperer_acteur
-from src.metier.applicationExceptions import DocumentIntrouvableException
-from src.metier.document.document import Auteur, Auteurs, Document
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Set
+
+from src.metier.acteur.recupererActeur import recuperer_acteurs
+from src.metier.applicationExceptions import DocumentIntrouvableException, ParametreInvalideException
+from src.metier.document.document import Auteur, Auteurs, Document, PageDocuments
 from src.metier.document.document import parse_document_depuis_payload
+from src.infra.document.datesDocument import FUSEAU_HORAIRE
+from src.infra.document.fluxDocumentsSemaine import StockFluxDocuments
 from src.infra.document.rechercherDocuments import RechercherDocuments
+from src.infra.ingestion.verrouIngestion import VerrouIngestion
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+def recuperer_documents_semaine_courante(legislature: int | None = None) -> list[dict]:
+    """
+    Documents de la semaine, enrichis et sérialisés. Pour une législature suivie, ils sont lus dans le flux précalculé,
+    recalculé s'il n'existe pas encore ou s'il date d'un jour précédent (changement de jour sans planificateur).
+    Pour les autres législatures, ils sont calculés à chaque appel sans être enregistrés
+    """
+    legislature = legislature or settings.legislature_courante
+    jour = _date_du_jour()
+
+    if legislature in legislatures_du_flux_documents():
+        documents = _lire_flux_du_jour(legislature, jour)
+    else:
+        documents = _sérialiser(_calculer_documents_semaine(legislature, jour))
+
+    if not documents:
+        raise DocumentIntrouvableException("Aucun document trouvé")
+
+    return documents
+
+
+def legislatures_du_flux_documents() -> set[int]:
+    """
+    Législatures dont le flux des documents de la semaine est précalculé : législatures suivies et législature courante
+    """
+    return {*settings.legislatures_suivies, settings.legislature_courante}
+
+
+def rafraichir_flux_documents(legislature: int, jour: date | None = None) -> list[dict]:
+    """
+    Recalcule et enregistre le flux des documents de la semaine de la législature.
+    Un flux vide est enregistré tel quel : la lecture n'a pas à le recalculer avant le prochain rafraîchissement
+    """
+    jour = jour or _date_du_jour()
+    documents = _sérialiser(_calculer_documents_semaine(legislature, jour))
+    StockFluxDocuments().enregistrer(legislature, jour, documents)
+    return documents
+
+
+def rafraichir_flux_documents_suivis() -> None:
+    """
+    Recalcule le flux de chaque législature précalculée : après une mise à jour des acteurs ou des organes,
+    et au changement de jour
+    """
+    jour = _date_du_jour()
+    for legislature in sorted(legislatures_du_flux_documents()):
+        try:
+            rafraichir_flux_documents(legislature, jour)
+        except Exception:
+            # Le flux sera recalculé à la prochaine lecture s'il n'est plus du jour
+            logger.exception("Échec du rafraîchissement du flux des documents (législature %s)", legislature)
+
+
+def recuperer_documents_acteur(
+        acteur_uid: str,
+        limite: int,
+        depuis: date | None = None,
+        jusqu_au: date | None = None,
+        legislature: int | None = None,
+        curseur: str | None = None,
+) -> PageDocuments:
+    """
+    Documents dont l'acteur est auteur, du plus récent au plus ancien, page par page :
+    'curseur' est la valeur 'suivant' de la page précédente
+    """
+    _verifier_periode(depuis, jusqu_au)
+
+    rechercher_documents = RechercherDocuments()
+    # Une ligne de plus que la page : sa présence indique qu'une page suivante existe
+    lignes = rechercher_documents.recuperer_documents_par_auteur(
+        acteur_uid,
+        limite + 1,
+        depuis=depuis,
+        jusqu_au=jusqu_au,
+        legislature=legislature,
+        après=_décoder_curseur(curseur, date.fromisoformat, str, int) if curseur else None,
+    )
+
+    page, suivantes = lignes[:limite], lignes[limite:]
+    return _construire_page(
+        page,
+        _encoder_curseur(page[-1].date_effective.isoformat(), page[-1].document_uid, page[-1].legislature) if suivantes else None,
+    )
+
+
+def rechercher_documents(
+        texte: str,
+        limite: int,
+        depuis: date | None = None,
+        jusqu_au: date | None = None,
+        legislature: int | None = None,
+        curseur: str | None = None,
+) -> PageDocuments:
+    """
+    Documents dont les titres ou la notice correspondent à 'texte', du plus pertinent au moins pertinent, page par page :
+    'curseur' est la valeur 'suivant' de la page précédente
+    """
+    if not texte.strip():
+        raise ParametreInvalideException("Le texte recherché ne peut pas être vide")
+    _verifier_periode(depuis, jusqu_au)
 
-def recuperer_documents_semaine_courante() -> list[Document]:
-    documents = _recuperer_documents_semaine_courante()
+    rechercher_documents = RechercherDocuments()
+    lignes = rechercher_documents.rechercher_documents(
+        texte,
+        limite + 1,
+        depuis=depuis,
+        jusqu_au=jusqu_au,
+        legislature=legislature,
+        après=_décoder_curseur(curseur, float, str, int) if curseur else None,
+    )
+
+    page, suivantes = lignes[:limite], lignes[limite:]
+    return _construire_page(
+        page,
+        _encoder_curseur(page[-1].rang, page[-1].document_uid, page[-1].legislature) if suivantes else None,
+    )
+
+
+def _verifier_periode(depuis: date | None, jusqu_au: date | None) -> None:
+    if depuis and jusqu_au and depuis > jusqu_au:
+        raise ParametreInvalideException("'depuis' doit précéder 'jusqu_au'")
+
+def _construire_page(lignes: Sequence, suivant: str | None) -> PageDocuments:
+    documents = [parse_document_depuis_payload(ligne.payload) for ligne in lignes]
     acteurs = _charger_acteurs(_collecter_acteurs_uids(documents))
-    return _enrichir_documents(documents, acteurs)
 
+    return PageDocuments(
+        documents=_enrichir_documents(documents, acteurs, conserver_sans_auteur=True),
+        suivant=suivant,
+    )
+
+def _encoder_curseur(*clé) -> str:
+    texte = json.dumps(list(clé), separators=(",", ":"))
+    return base64.urlsafe_b64encode(texte.encode("utf-8")).decode("ascii")
+
+def _décoder_curseur(curseur: str, *types: Callable[[Any], Any]) -> tuple:
+    """
+    Clé de pagination encodée dans 'curseur', chaque valeur convertie par le type correspondant
+    """
+    try:
+        clé = json.loads(base64.urlsafe_b64decode(curseur.encode("ascii")))
+        if not isinstance(clé, list) or len(clé) != len(types):
+            raise ValueError(clé)
+        return tuple(convertir(valeur) for convertir, valeur in zip(types, clé))
+    except (binascii.Error, UnicodeError, ValueError, TypeError) as e:
+        raise ParametreInvalideException(f"Curseur de pagination invalide : '{curseur}'") from e
+
+def _lire_flux_du_jour(legislature: int, jour: date) -> list[dict]:
+    """
+    Un seul processus recalcule un flux périmé : pendant ce temps, les autres lectures servent le flux précédent.
+    Faute de flux précédent, elles attendent la fin du calcul et lisent son résultat
+    """
+    stock_flux = StockFluxDocuments()
+    flux = stock_flux.lire(legislature)
+    if flux is not None and flux[0] == jour:
+        return flux[1]
+
+    with VerrouIngestion().essayer_de_verrouiller(f"flux_documents:{legislature}", attendre=flux is None) as verrou_acquis:
+        if not verrou_acquis:
+            return flux[1]
+
+        # Le flux a pu être recalculé pendant l'attente du verrou
+        flux = stock_flux.lire(legislature)
+        if flux is not None and flux[0] == jour:
+            return flux[1]
+        return rafraichir_flux_documents(legislature, jour)
 
-def _recuperer_documents_semaine_courante() -> Sequence[dict]:
+def _sérialiser(documents: Iterable[Document]) -> list[dict]:
+    return [document.model_dump(mode="json", by_alias=True, exclude_none=True) for document in documents]
+
+def _date_du_jour() -> date:
+    return datetime.now(FUSEAU_HORAIRE).date()
+
+def _calculer_documents_semaine(legislature: int, jour: date) -> list[Document]:
     rechercher_documents = RechercherDocuments()
-    payloads = rechercher_documents.recuperer_documents_semaine_courante()
+    payloads = rechercher_documents.recuperer_documents_semaine_courante(legislature, jour)
 
-    if not payloads:
-        raise DocumentIntrouvableException("Aucun document trouvé")
-    
-    return [parse_document_depuis_payload(payload) for payload in payloads]    
+    documents = [parse_document_depuis_payload(payload) for payload in payloads]
+    acteurs = _charger_acteurs(_collecter_acteurs_uids(documents))
+    return _enrichir_documents(documents, acteurs)
 
 def _collecter_acteurs_uids(documents: Iterable[Document]) -> Set[str]:
     acteur_uids: Set[str] = set()
@@ -38,26 +215,25 @@ def _extraire_auteurs(document: Document) -> List[Auteur]:
     return []
 
 def _charger_acteurs(acteur_uids: Iterable[str]) -> Dict[str, object]:
-    cache: Dict[str, object] = {}
-
-    for acteur_uid in acteur_uids:
-        try:
-            cache[acteur_uid] = recuperer_acteur(acteur_uid)
-        except Exception:
-            continue
-
-    return cache
+    # Chargement groupé : une requête pour les acteurs et une pour leurs organes, quel que soit le nombre d'auteurs
+    return recuperer_acteurs(acteur_uids)
 
 def _enrichir_documents(
         documents: Iterable[Document], 
-        acteurs: Dict[str, object]
+        acteurs: Dict[str, object],
+        conserver_sans_auteur: bool = False,
 ) -> list[Document]:
+    """
+    'conserver_sans_auteur' : conserve tels quels les documents dont aucun auteur n'a pu être détaillé
+    """
     documents_enrichis: list[Document] = []
 
     for document in documents:
         auteurs_enrichis = _enrichir_auteurs(document, acteurs)
 
         if not auteurs_enrichis:
+            if conserver_sans_auteur:
+                documents_enrichis.append(document)
             continue
         auteurs_wrapped = (
             document.auteurs.model_copy(update={"auteur": auteurs_enrichis})
@@ -0,0 +1,285 @@
+import logging
+import threading
+
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import asdict
+from pathlib import Path
+from typing import Callable, Dict, Iterator
+
+from src.infra._baseStockage import CompteursEnregistrement
+from src.infra.ingestion.suiviIngestion import SuiviIngestion
+from src.metier.acteur.enregistrerActeurs import mettre_a_jour_acteurs
+from src.metier.amo.enregistrerAmo import mettre_a_jour_acteurs_et_organes
+from src.metier.document.enregistrerDocuments import mettre_a_jour_documents
+from src.metier.document.recupererDocuments import legislatures_du_flux_documents, rafraichir_flux_documents, rafraichir_flux_documents_suivis
+from src.metier.ingestion.ingestion import Ingestion, parser_ingestion_depuis_payload
+from src.metier.organe.enregistrerOrgane import mettre_a_jour_organes
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+MISES_A_JOUR_PAR_DATASET: Dict[str, Callable[..., Dict[str, CompteursEnregistrement]]] = {
+    "acteur": mettre_a_jour_acteurs,
+    "organe": mettre_a_jour_organes,
+    "document": mettre_a_jour_documents,
+    "amo": mettre_a_jour_acteurs_et_organes,
+}
+
+# Tables écrites par chaque jeu de données : acteur, organe et amo écrivent les tables acteur, mandat et organe.
+# Les ingestions de même clé ne s'exécutent jamais simultanément, même pour des jeux de données différents
+TABLES_PAR_DATASET: Dict[str, str] = {
+    "acteur": "amo",
+    "organe": "amo",
+    "amo": "amo",
+    "document": "document",
+}
+# Tables partitionnées par législature : chaque législature n'écrit que sa partition.
+# Les autres tables sont communes à toutes les législatures
+TABLES_PARTITIONNÉES = frozenset({"document"})
+
+# Jeux de données dont dépend le flux des documents de la semaine (documents, auteurs et leurs groupes politiques)
+DATASETS_DU_FLUX_DOCUMENTS = ("document", "acteur", "organe", "amo")
+
+_executeur: ThreadPoolExecutor | None = None
+# Tâches soumises à l'exécuteur et pas encore terminées -> identifiant de la tâche d'ingestion
+_taches_soumises: Dict[Future, str] = {}
+_verrou_taches_soumises = threading.Lock()
+# Arrêt du thread qui signale l'activité des tâches soumises encore en attente d'un thread de l'exécuteur
+_arrêt_signaleur_en_attente: threading.Event | None = None
+
+
+def lancer_ingestion(dataset: str, forcer: bool = False, legislature: int | None = None) -> Ingestion:
+    """
+    Enregistre une tâche d'ingestion et l'exécute en arrière-plan.
+    Si une ingestion écrivant les mêmes tables est déjà en cours (jeux de données acteur, organe et amo confondus,
+    quelle que soit la législature pour ces tables non partitionnées), c'est cette tâche qui est retournée.
+    Les ingestions des documents de législatures différentes s'exécutent en parallèle
+    """
+    legislature = legislature or settings.legislature_courante
+    tache, créée = SuiviIngestion().creer_ou_rejoindre(dataset, legislature, clé_des_tables(dataset, legislature), forcer)
+
+    if créée:
+        _soumettre(tache["id"], dataset, forcer, legislature)
+
+    return parser_ingestion_depuis_payload(tache)
+
+
+def executer_ingestion(
+        dataset: str,
+        forcer: bool = False,
+        fichier_local: Path | None = None,
+        legislature: int | None = None,
+) -> Ingestion | None:
+    """
+    Enregistre une tâche d'ingestion et l'exécute dans le thread appelant (ligne de commande).
+    Retourne None si une ingestion écrivant les mêmes tables est déjà en cours ailleurs
+    """
+    legislature = legislature or settings.legislature_courante
+    suivi_ingestion = SuiviIngestion()
+    tache, créée = suivi_ingestion.creer_ou_rejoindre(dataset, legislature, clé_des_tables(dataset, legislature), forcer)
+
+    if not créée:
+        return None
+
+    _executer_ingestion(tache["id"], dataset, forcer, fichier_local, legislature)
+    return parser_ingestion_depuis_payload(suivi_ingestion.recuperer_tache_par_id(tache["id"]))
+
+
+def executer_ingestion_planifiee(dataset: str, legislature: int) -> Ingestion | None:
+    """
+    Enregistre une tâche d'ingestion, la soumet à l'exécuteur des ingestions et attend sa fin (planificateur).
+    À l'arrêt du service, elle est attendue puis marquée en échec comme les ingestions lancées par l'API
+    (voir 'arreter_ingestions'). Retourne None si une ingestion écrivant les mêmes tables est déjà en cours ailleurs
+    """
+    suivi_ingestion = SuiviIngestion()
+    tache, créée = suivi_ingestion.creer_ou_rejoindre(dataset, legislature, clé_des_tables(dataset, legislature))
+
+    if not créée:
+        return None
+
+    _soumettre(tache["id"], dataset, False, legislature).result()
+    return parser_ingestion_depuis_payload(suivi_ingestion.recuperer_tache_par_id(tache["id"]))
+
+
+def clé_des_tables(dataset: str, legislature: int) -> str:
+    """
+    Identifie les tables écrites par une ingestion : deux ingestions de même clé ne doivent pas s'exécuter en même temps.
+    Les ingestions des tables non partitionnées (acteurs, organes) sont sérialisées toutes législatures confondues :
+    la dernière archive enregistrée l'emporte entièrement
+    """
+    tables = TABLES_PAR_DATASET[dataset]
+    return f"{tables}:{legislature}" if tables in TABLES_PARTITIONNÉES else tables
+
+
+def arreter_ingestions() -> None:
+    """
+    Arrête l'exécuteur avant la fermeture du pool de connexions : les ingestions en attente sont annulées,
+    celles en cours ont 'ingestion_delai_arret' secondes pour se terminer.
+    Les tâches annulées ou encore en cours au-delà de ce délai sont marquées en échec
+    """
+    global _executeur, _arrêt_signaleur_en_attente
+    if _executeur is None:
+        return
+
+    executeur, _executeur = _executeur, None
+    if _arrêt_signaleur_en_attente is not None:
+        _arrêt_signaleur_en_attente.set()
+        _arrêt_signaleur_en_attente = None
+    with _verrou_taches_soumises:
+        soumises = dict(_taches_soumises)
+
+    executeur.shutdown(wait=False, cancel_futures=True)
+    en_cours = [future for future in soumises if not future.cancelled()]
+    _, non_terminées = wait(en_cours, timeout=settings.ingestion_delai_arret)
+
+    suivi_ingestion = SuiviIngestion()
+    for future, id_tache in soumises.items():
+        if future.cancelled():
+            erreur = "Ingestion annulée par l'arrêt du service avant son démarrage"
+        elif future in non_terminées:
+            erreur = "Ingestion interrompue par l'arrêt du service"
+        else:
+            continue
+
+        logger.warning("%s (%s)", erreur, id_tache)
+        try:
+            suivi_ingestion.echouer(id_tache, erreur)
+        except Exception:
+            # La tâche sera abandonnée faute de signe de vie (voir 'ingestion_delai_abandon')
+            logger.exception("Impossible de marquer l'ingestion %s en échec", id_tache)
+
+
+def _soumettre(id_tache: str, dataset: str, forcer: bool, legislature: int) -> Future:
+    future = _obtenir_executeur().submit(_executer_ingestion, id_tache, dataset, forcer, legislature=legislature)
+    with _verrou_taches_soumises:
+        _taches_soumises[future] = id_tache
+    future.add_done_callback(_oublier_tache)
+    return future
+
+
+def _oublier_tache(future: Future) -> None:
+    with _verrou_taches_soumises:
+        _taches_soumises.pop(future, None)
+
+
+def _obtenir_executeur() -> ThreadPoolExecutor:
+    global _executeur, _arrêt_signaleur_en_attente
+    if _executeur is None:
+        _executeur = ThreadPoolExecutor(
+            max_workers=settings.ingestion_nombre_max_simultanees,
+            thread_name_prefix="ingestion",
+        )
+        _arrêt_signaleur_en_attente = threading.Event()
+        threading.Thread(
+            target=_signaler_activite_en_attente,
+            args=(_arrêt_signaleur_en_attente,),
+            name="activite-en-attente",
+            daemon=True,
+        ).start()
+    return _executeur
+
+
+def _signaler_activite_en_attente(arrêt: threading.Event) -> None:
+    """
+    Signale l'activité des tâches soumises qui attendent un thread libre de l'exécuteur : elles ne doivent pas
+    être abandonnées (puis remplacées par une nouvelle tâche) parce que d'autres ingestions occupent l'exécuteur.
+    Les tâches démarrées signalent elles-mêmes leur activité (voir '_signaler_activite')
+    """
+    suivi_ingestion = SuiviIngestion()
+    while not arrêt.wait(_intervalle_de_signalement()):
+        with _verrou_taches_soumises:
+            en_attente = [id_tache for future, id_tache in _taches_soumises.items() if not future.running() and not future.done()]
+
+        for id_tache in en_attente:
+            try:
+                suivi_ingestion.signaler_activite(id_tache)
+            except Exception:
+                logger.warning("Impossible de signaler l'activité de l'ingestion en attente %s", id_tache, exc_info=True)
+
+
+def _intervalle_de_signalement() -> float:
+    return max(settings.ingestion_delai_abandon / 4, 1)
+
+
+def _executer_ingestion(
+        id_tache: str,
+        dataset: str,
+        forcer: bool,
+        fichier_local: Path | None = None,
+        legislature: int | None = None,
+) -> None:
+    suivi_ingestion = SuiviIngestion()
+    if not suivi_ingestion.demarrer(id_tache):
+        logger.warning(
+            "Ingestion '%s' de la législature %s (%s) abandonnée ou annulée avant son démarrage : elle n'est pas exécutée",
+            dataset, legislature, id_tache,
+        )
+        return
+
+    try:
+        with _signaler_activite(suivi_ingestion, id_tache):
+            compteurs = MISES_A_JOUR_PAR_DATASET[dataset](
+                forcer=forcer,
+                fichier_local=fichier_local,
+                legislature=legislature,
+                suivi=lambda lignes_traitées: suivi_ingestion.progresser(id_tache, lignes_traitées),
+            )
+    except Exception as e:
+        logger.exception("Échec de l'ingestion '%s' de la législature %s (%s)", dataset, legislature, id_tache)
+        suivi_ingestion.echouer(id_tache, str(e))
+        return
+
+    suivi_ingestion.terminer(id_tache, {nom_dossier: asdict(compteur) for nom_dossier, compteur in compteurs.items()})
+    logger.info("Ingestion '%s' de la législature %s (%s) terminée : %s", dataset, legislature, id_tache, compteurs)
+
+    _rafraichir_flux_documents(dataset, legislature, compteurs)
+
+
+@contextmanager
+def _signaler_activite(suivi_ingestion: SuiviIngestion, id_tache: str) -> Iterator[None]:
+    """
+    Signale régulièrement que la tâche est en vie pendant toute son exécution : le téléchargement, la finalisation
+    des tables fantômes ou la mise à jour des tables dérivées peuvent durer plus que le délai d'abandon sans
+    qu'aucun batch ne soit enregistré
+    """
+    arrêt = threading.Event()
+    intervalle = _intervalle_de_signalement()
+
+    def signaler() -> None:
+        while not arrêt.wait(intervalle):
+            try:
+                suivi_ingestion.signaler_activite(id_tache)
+            except Exception:
+                logger.warning("Impossible de signaler l'activité de l'ingestion %s", id_tache, exc_info=True)
+
+    signaleur = threading.Thread(target=signaler, name=f"activite-{id_tache[:8]}", daemon=True)
+    signaleur.start()
+    try:
+        yield
+    finally:
+        arrêt.set()
+        signaleur.join()
+
+
+def _rafraichir_flux_documents(dataset: str, legislature: int, compteurs: Dict[str, CompteursEnregistrement]) -> None:
+    """
+    Recalcule le flux des documents de la semaine si l'ingestion a modifié des données dont il dépend.
+    Un échec n'invalide pas l'ingestion : le flux sera recalculé au prochain rafraîchissement
+    """
+    if dataset not in DATASETS_DU_FLUX_DOCUMENTS:
+        return
+    if not any(compteur.insérés or compteur.mis_à_jour or compteur.supprimés for compteur in compteurs.values()):
+        return
+
+    try:
+        if dataset == "document":
+            legislature = legislature or settings.legislature_courante
+            # Le flux des autres législatures n'est pas précalculé
+            if legislature in legislatures_du_flux_documents():
+                rafraichir_flux_documents(legislature)
+        else:
+            # Les acteurs et les organes ne sont pas partitionnés : tous les flux peuvent les citer
+            rafraichir_flux_documents_suivis()
+    except Exception:
+        logger.exception("Échec du rafraîchissement du flux des documents après l'ingestion '%s' (législature %s)", dataset, legislature)
@@ -0,0 +1,145 @@
+import logging
+import random
+import threading
+import time
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Tuple
+
+from src.infra.document.datesDocument import FUSEAU_HORAIRE
+from src.infra.ingestion.verrouIngestion import VerrouIngestion
+from src.metier.document.recupererDocuments import rafraichir_flux_documents_suivis
+from src.metier.ingestion.lancerIngestion import MISES_A_JOUR_PAR_DATASET, clé_des_tables, executer_ingestion_planifiee
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_planificateur: threading.Thread | None = None
+_arrêt = threading.Event()
+
+
+def demarrer_planificateur() -> None:
+    """
+    Rafraîchit périodiquement chaque jeu de données configuré, pour chaque législature suivie, dans un thread dédié.
+    Chaque rafraîchissement est protégé par un verrou consultatif PostgreSQL : avec plusieurs
+    workers ou réplicas, un seul processus télécharge et enregistre un jeu de données à la fois.
+    Le flux des documents de la semaine est aussi recalculé à chaque changement de jour à Paris
+    """
+    global _planificateur
+    if _planificateur is not None:
+        return
+
+    intervalles = _intervalles_par_dataset()
+    if not intervalles:
+        logger.warning("Planificateur actif mais aucun jeu de données à rafraîchir")
+        return
+
+    _arrêt.clear()
+    _planificateur = threading.Thread(target=_boucler, args=(intervalles,), name="planificateur", daemon=True)
+    _planificateur.start()
+    logger.info("Planificateur démarré : %s", intervalles)
+
+
+def arreter_planificateur() -> None:
+    global _planificateur
+    if _planificateur is None:
+        return
+
+    _arrêt.set()
+    # Une ingestion planifiée en cours s'exécute dans l'exécuteur des ingestions : 'arreter_ingestions' l'attend
+    # puis la marque en échec si elle n'est pas terminée
+    _planificateur.join(timeout=5)
+    _planificateur = None
+
+
+def _intervalles_par_dataset() -> Dict[str, int]:
+    intervalles: Dict[str, int] = {}
+    for dataset, intervalle in settings.planificateur_intervalle_par_dataset.items():
+        if dataset not in MISES_A_JOUR_PAR_DATASET:
+            logger.warning("Jeu de données inconnu ignoré par le planificateur : '%s'", dataset)
+            continue
+        if intervalle <= 0:
+            logger.warning("Intervalle invalide ignoré pour '%s' : %s", dataset, intervalle)
+            continue
+        intervalles[dataset] = intervalle
+    return intervalles
+
+
+def _boucler(intervalles: Dict[str, int]) -> None:
+    # Premier passage décalé aléatoirement : les réplicas redémarrées ensemble ne se présentent pas en même temps
+    maintenant = time.monotonic()
+    échéances: Dict[Tuple[str, int], float] = {
+        (dataset, legislature): maintenant + _gigue()
+        for dataset in intervalles
+        for legislature in settings.legislatures_suivies
+    }
+    if not échéances:
+        logger.warning("Planificateur actif mais aucune législature suivie")
+        return
+
+    changement_de_jour = _prochain_changement_de_jour()
+
+    while not _arrêt.is_set():
+        (dataset, legislature), échéance = min(échéances.items(), key=lambda élément: élément[1])
+
+        if changement_de_jour <= échéance:
+            attente = changement_de_jour - time.monotonic()
+            if attente > 0:
+                _arrêt.wait(attente)
+                continue
+
+            _rafraichir_flux_documents()
+            changement_de_jour = _prochain_changement_de_jour()
+            continue
+
+        attente = échéance - time.monotonic()
+        if attente > 0:
+            _arrêt.wait(attente)
+            continue
+
+        _rafraichir(dataset, legislature)
+        échéances[(dataset, legislature)] = time.monotonic() + intervalles[dataset] + _gigue()
+
+
+def _rafraichir(dataset: str, legislature: int) -> None:
+    try:
+        # Verrou des tables écrites, comme la déduplication des tâches : 'amo' et 'acteur' ne s'exécutent pas en même temps
+        with VerrouIngestion().essayer_de_verrouiller(clé_des_tables(dataset, legislature)) as verrou_acquis:
+            if not verrou_acquis:
+                logger.info("Rafraîchissement '%s' (législature %s) ignoré : déjà en cours dans un autre processus", dataset, legislature)
+                return
+
+            ingestion = executer_ingestion_planifiee(dataset, legislature)
+            if ingestion is None:
+                logger.info("Rafraîchissement '%s' (législature %s) ignoré : une ingestion est déjà en cours", dataset, legislature)
+    except Exception:
+        # Le planificateur doit survivre à une indisponibilité passagère de la base ou de la source
+        logger.exception("Échec du rafraîchissement planifié '%s' (législature %s)", dataset, legislature)
+
+
+def _rafraichir_flux_documents() -> None:
+    try:
+        with VerrouIngestion().essayer_de_verrouiller("flux_documents") as verrou_acquis:
+            if not verrou_acquis:
+                logger.info("Rafraîchissement du flux des documents ignoré : déjà en cours dans un autre processus")
+                return
+
+            rafraichir_flux_documents_suivis()
+    except Exception:
+        # Sans ce rafraîchissement, le flux est recalculé à sa première lecture du jour
+        logger.exception("Échec du rafraîchissement du flux des documents au changement de jour")
+
+
+def _prochain_changement_de_jour() -> float:
+    """
+    Instant (horloge monotone) du prochain minuit à Paris, plus une seconde de marge
+    """
+    maintenant = datetime.now(FUSEAU_HORAIRE)
+    minuit = datetime.combine(maintenant.date() + timedelta(days=1), datetime.min.time(), tzinfo=FUSEAU_HORAIRE)
+    # Différence calculée en UTC : entre deux dates du même fuseau, Python ignore les changements d'heure
+    secondes = (minuit.astimezone(timezone.utc) - maintenant.astimezone(timezone.utc)).total_seconds()
+    return time.monotonic() + secondes + 1
+
+
+def _gigue() -> float:
+    return random.uniform(0, settings.planificateur_gigue)
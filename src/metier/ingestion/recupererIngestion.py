@@ -0,0 +1,21 @@
+import logging
+
+from typing import List
+
+from src.infra.ingestion.suiviIngestion import SuiviIngestion
+from src.metier.applicationExceptions import IngestionIntrouvableException
+from src.metier.ingestion.ingestion import EtatDataset, Ingestion, parser_etat_dataset_depuis_payload, parser_ingestion_depuis_payload
+
+logger = logging.getLogger(__name__)
+
+def recuperer_ingestion(id_ingestion: str) -> Ingestion:
+    tache = SuiviIngestion().recuperer_tache_par_id(id_ingestion)
+
+    if not tache:
+        raise IngestionIntrouvableException(f"Ingestion introuvable pour id='{id_ingestion}'")
+
+    return parser_ingestion_depuis_payload(tache)
+
+
+def recuperer_etats_datasets() -> List[EtatDataset]:
+    return [parser_etat_dataset_depuis_payload(état) for état in SuiviIngestion().recuperer_etats_des_datasets()]
@@ -1,8 +1,16 @@
 import logging
 
+from pathlib import Path
+
 from src.infra.organe.mettreAJourStockOrganes import MettreAJourStockOrganes
+from src.infra._baseStockage import CompteursEnregistrement, SuiviProgression
 
 logger = logging.getLogger(__name__)
 
-def mettre_a_jour_organes():
-    MettreAJourStockOrganes()
+def mettre_a_jour_organes(
+        forcer: bool = False,
+        suivi: SuiviProgression | None = None,
+        fichier_local: Path | None = None,
+        legislature: int | None = None,
+) -> dict[str, CompteursEnregistrement]:
+    return MettreAJourStockOrganes(forcer=forcer, suivi=suivi, fichier_local=fichier_local, legislature=legislature).mettre_a_jour_stock()
@@ -24,6 +24,179 @@ class Settings(BaseSettings):
         description="URL de connexion SQLAlchemy (sync) vers PostgreSQL.",
         validation_alias="DATABASE_URL",
     )
+    database_pool_size: int = Field(
+        default=5,
+        ge=1,
+        description="Nombre de connexions maintenues ouvertes dans le pool partagé.",
+        validation_alias="DATABASE_POOL_SIZE",
+    )
+    database_max_overflow: int = Field(
+        default=10,
+        ge=0,
+        description="Nombre de connexions supplémentaires autorisées au-delà de la taille du pool.",
+        validation_alias="DATABASE_MAX_OVERFLOW",
+    )
+    database_pool_recycle: int = Field(
+        default=1800,
+        description="Durée de vie maximale (en secondes) d'une connexion avant son renouvellement (-1 pour désactiver).",
+        validation_alias="DATABASE_POOL_RECYCLE",
+    )
+    database_pool_timeout: float = Field(
+        default=30,
+        gt=0,
+        description="Délai d'attente maximal (en secondes) pour obtenir une connexion du pool.",
+        validation_alias="DATABASE_POOL_TIMEOUT",
+    )
+    legislature_courante: int = Field(
+        default=17,
+        ge=1,
+        description="Législature mise à jour et consultée par défaut.",
+        validation_alias="LEGISLATURE_COURANTE",
+    )
+    legislatures_suivies: list[int] = Field(
+        default_factory=lambda: [17],
+        description="Législatures rafraîchies par le planificateur, au format JSON (ex: '[16, 17]').",
+        validation_alias="LEGISLATURES_SUIVIES",
+    )
+    telechargement_nombre_tentatives: int = Field(
+        default=5,
+        ge=1,
+        description="Nombre maximal de tentatives pour télécharger une archive (chaque nouvelle tentative reprend le fichier partiel).",
+        validation_alias="TELECHARGEMENT_NOMBRE_TENTATIVES",
+    )
+    telechargement_delai_initial: float = Field(
+        default=1.0,
+        ge=0,
+        description="Attente (en secondes) avant la deuxième tentative de téléchargement, doublée à chaque nouvel échec.",
+        validation_alias="TELECHARGEMENT_DELAI_INITIAL",
+    )
+    stockage_lecture_zip_directe: bool = Field(
+        default=True,
+        description="Lit les fichiers JSON directement dans l'archive '.zip' au lieu de les extraire sur disque.",
+        validation_alias="STOCKAGE_LECTURE_ZIP_DIRECTE",
+    )
+    stockage_processus_decodage: int = Field(
+        default=1,
+        ge=1,
+        description="Nombre de processus utilisés pour décoder les fichiers JSON d'une archive (1 : décodage en série).",
+        validation_alias="STOCKAGE_PROCESSUS_DECODAGE",
+    )
+    stockage_seuil_decodage_parallele: int = Field(
+        default=2000,
+        ge=0,
+        description="Nombre minimal de fichiers dans l'archive pour décoder en parallèle (en dessous : décodage en série).",
+        validation_alias="STOCKAGE_SEUIL_DECODAGE_PARALLELE",
+    )
+    stockage_taille_lot_decodage: int = Field(
+        default=200,
+        ge=1,
+        description="Nombre de fichiers JSON envoyés à la fois à un processus de décodage.",
+        validation_alias="STOCKAGE_TAILLE_LOT_DECODAGE",
+    )
+    stockage_taille_file_pipeline: int = Field(
+        default=4,
+        ge=0,
+        description=(
+            "Nombre de batches décodés pouvant attendre leur écriture en base pendant que la lecture de l'archive continue "
+            "(0 : lecture et écriture en séquence)."
+        ),
+        validation_alias="STOCKAGE_TAILLE_FILE_PIPELINE",
+    )
+    stockage_chargeur_par_dataset: dict[str, Literal["insert", "copy"]] = Field(
+        default_factory=dict,
+        description=(
+            "Méthode d'enregistrement par jeu de données, au format JSON (ex: '{\"acteur\": \"copy\"}'). "
+            "'insert' : INSERT multi-lignes par batch (défaut), 'copy' : COPY vers une table de transit puis fusion."
+        ),
+        validation_alias="STOCKAGE_CHARGEUR_PAR_DATASET",
+    )
+    stockage_nombre_ecrivains: int = Field(
+        default=1,
+        ge=1,
+        description=(
+            "Nombre de connexions écrivant en parallèle pendant une mise à jour, les lignes étant réparties selon leur uid "
+            "(1 : écriture sur une seule connexion). Le pool doit pouvoir fournir ces connexions."
+        ),
+        validation_alias="STOCKAGE_NOMBRE_ECRIVAINS",
+    )
+    stockage_validation_ecrivains: Literal["tout_ou_rien", "par_ecrivain"] = Field(
+        default="tout_ou_rien",
+        description=(
+            "Validation des écritures parallèles. 'tout_ou_rien' : les transactions ne sont validées que si tous les "
+            "écrivains ont réussi, 'par_ecrivain' : chaque écrivain valide sa transaction indépendamment des autres."
+        ),
+        validation_alias="STOCKAGE_VALIDATION_ECRIVAINS",
+    )
+    stockage_rafraichissement_par_dataset: dict[str, Literal["incremental", "ombre"]] = Field(
+        default_factory=dict,
+        description=(
+            "Stratégie de rafraîchissement par jeu de données, au format JSON (ex: '{\"document\": \"ombre\"}'). "
+            "'incremental' : mise à jour de la table en place (défaut), 'ombre' : chargement complet dans une table "
+            "fantôme indexée après coup, puis substitution à la table d'origine."
+        ),
+        validation_alias="STOCKAGE_RAFRAICHISSEMENT_PAR_DATASET",
+    )
+    stockage_ombre_taux_suppression_max: float = Field(
+        default=0.2,
+        ge=0,
+        le=1,
+        description="Part maximale des lignes actuelles pouvant disparaître lors d'un rafraîchissement par table fantôme.",
+        validation_alias="STOCKAGE_OMBRE_TAUX_SUPPRESSION_MAX",
+    )
+    stockage_ombre_delai_verrou: float = Field(
+        default=5,
+        gt=0,
+        description="Attente maximale (en secondes) du verrou exclusif nécessaire à la substitution d'une table fantôme.",
+        validation_alias="STOCKAGE_OMBRE_DELAI_VERROU",
+    )
+    stockage_validation_par_batch: bool = Field(
+        default=False,
+        description=(
+            "Valide chaque batch dans sa propre transaction et mémorise le dernier fichier enregistré : "
+            "une mise à jour interrompue reprend à ce fichier lors de l'exécution suivante sur la même archive."
+        ),
+        validation_alias="STOCKAGE_VALIDATION_PAR_BATCH",
+    )
+    ingestion_nombre_max_simultanees: int = Field(
+        default=2,
+        ge=1,
+        description="Nombre maximal d'ingestions exécutées simultanément en arrière-plan par processus.",
+        validation_alias="INGESTION_NOMBRE_MAX_SIMULTANEES",
+    )
+    ingestion_delai_abandon: int = Field(
+        default=1800,
+        gt=0,
+        description="Délai (en secondes) sans signe de vie au-delà duquel une ingestion active est considérée abandonnée.",
+        validation_alias="INGESTION_DELAI_ABANDON",
+    )
+    ingestion_delai_arret: float = Field(
+        default=30,
+        ge=0,
+        description=(
+            "Attente maximale (en secondes) des ingestions en cours à l'arrêt du service, avant la fermeture du pool de "
+            "connexions. Au-delà, elles sont marquées en échec."
+        ),
+        validation_alias="INGESTION_DELAI_ARRET",
+    )
+    planificateur_actif: bool = Field(
+        default=False,
+        description="Active le rafraîchissement périodique des jeux de données par le processus web.",
+        validation_alias="PLANIFICATEUR_ACTIF",
+    )
+    planificateur_intervalle_par_dataset: dict[str, int] = Field(
+        default_factory=lambda: {"amo": 6 * 3600, "document": 3600},
+        description=(
+            "Intervalle (en secondes) entre deux rafraîchissements, par jeu de données, au format JSON "
+            "(ex: '{\"amo\": 21600, \"document\": 3600}'). Seuls les jeux de données listés sont rafraîchis."
+        ),
+        validation_alias="PLANIFICATEUR_INTERVALLE_PAR_DATASET",
+    )
+    planificateur_gigue: int = Field(
+        default=300,
+        ge=0,
+        description="Décalage aléatoire maximal (en secondes) ajouté à chaque échéance, pour désynchroniser les réplicas.",
+        validation_alias="PLANIFICATEUR_GIGUE",
+    )
     cors_allowed_origins: list[str] = Field(
         default_factory=list,
         description="Origines autorisées pour le CORS.",